@@ -0,0 +1,115 @@
+"""Benchmark job recommendation scoring: legacy full argsort vs JobIndex.
+
+Builds a synthetic corpus of job titles, fits a TF-IDF vectorizer the same
+way build_and_save_artifacts does, then times the pre-JobIndex path
+(cosine_similarity + argsort + per-row iloc) against JobIndex.recommend.
+
+Usage (from backend/):
+    python bench_job_index.py [--jobs N] [--queries N] [--top-n N]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from job_index import IVFIndex, JobIndex
+
+WORDS = [
+    "senior", "junior", "lead", "principal", "associate", "intern", "software", "data", "java", "python",
+    "frontend", "backend", "fullstack", "cloud", "devops", "security", "mobile", "android", "ios", "react",
+    "engineer", "developer", "analyst", "scientist", "manager", "architect", "consultant", "designer",
+    "machine", "learning", "sales", "marketing", "finance", "operations", "support", "qa", "test", "product",
+]
+CITIES = ["Bangalore", "Mumbai", "Pune", "Hyderabad", "Chennai", "Delhi", "India", "Remote"]
+
+
+def make_corpus(n_jobs: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n_jobs):
+        city = rng.choice(CITIES)
+        rows.append({
+            "Job Title": " ".join(rng.sample(WORDS, rng.randint(2, 4))),
+            "City": city,
+            "State": "India" if city in ("India", "Remote") else rng.choice(["Karnataka", "Maharashtra", "Telangana"]),
+            "Salary": f"{rng.randint(3, 40)} LPA",
+        })
+    return pd.DataFrame(rows)
+
+
+def legacy_recommend(vectorizer, job_matrix, jobs_df, text, top_n):
+    """The scoring path used before JobIndex (full argsort, per-row iloc)."""
+    cand_vec = vectorizer.transform([text])
+    scores = cosine_similarity(cand_vec, job_matrix).flatten()
+    top_indices = scores.argsort()[-top_n:][::-1]
+    recs = jobs_df.iloc[top_indices][["Job Title", "City", "State", "Salary"]].copy().fillna("")
+    matches = []
+    for idx, score in zip(top_indices, scores[top_indices]):
+        row = jobs_df.iloc[idx]
+        city = str(row.get("City", "")).strip()
+        state = str(row.get("State", "")).strip()
+        if city == state and city in ["India", "Remote"]:
+            city, state = "Remote", "India"
+        matches.append((str(row.get("Job Title", "")), city, state, str(row.get("Salary", "")), float(score)))
+    return matches
+
+
+def time_per_query(func, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark job recommendation scoring")
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--ann", action="store_true", help="Also report IVF recall/latency per nprobe")
+    args = parser.parse_args()
+
+    jobs_df = make_corpus(args.jobs)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    job_matrix = vectorizer.fit_transform(jobs_df["Job Title"])
+
+    rng = random.Random(11)
+    queries = [" ".join(rng.sample(WORDS, 6)) for _ in range(args.queries)]
+
+    index = JobIndex(vectorizer, job_matrix, jobs_df)
+    legacy_ms = time_per_query(lambda q: legacy_recommend(vectorizer, job_matrix, jobs_df, q, args.top_n), queries)
+    index_ms = time_per_query(lambda q: index.recommend(q, args.top_n), queries)
+    # Same texts again with a smaller top_n: served from the ranked-result cache
+    repeat_ms = time_per_query(lambda q: index.recommend(q, max(1, args.top_n // 2)), queries)
+
+    # Both paths must agree on the best scores
+    for query in queries[:10]:
+        legacy_scores = [round(m[-1], 4) for m in legacy_recommend(vectorizer, job_matrix, jobs_df, query, args.top_n)]
+        index_scores = [round(m["match_score"], 4) for m in index.recommend(query, args.top_n)]
+        assert legacy_scores == index_scores, (legacy_scores, index_scores)
+
+    print(f"jobs={args.jobs} queries={args.queries} top_n={args.top_n}")
+    print(f"legacy   : {legacy_ms:8.2f} ms/query")
+    print(f"JobIndex : {index_ms:8.2f} ms/query  ({legacy_ms / index_ms:.1f}x faster)")
+    print(f"repeat   : {repeat_ms:8.2f} ms/query  (cached, different top_n)")
+
+    if args.ann:
+        ann = IVFIndex.build(index.job_matrix)
+        ann_index = JobIndex(vectorizer, job_matrix, jobs_df, ann=ann)
+        query_vecs = [index.transform([q]) for q in queries]
+        exact = [set(index.exact_search(v, args.top_n)[0].tolist()) for v in query_vecs]
+        print(f"IVF with {ann.n_lists} lists:")
+        for nprobe in (1, 4, 8, 16, 32):
+            start = time.perf_counter()
+            found = [set(ann_index.search(v, args.top_n, nprobe=nprobe)[0].tolist()) for v in query_vecs]
+            ms = (time.perf_counter() - start) / len(query_vecs) * 1000
+            # Ties at the cut-off make id-based recall a lower bound
+            recall = sum(len(f & e) for f, e in zip(found, exact)) / sum(len(e) for e in exact)
+            print(f"  nprobe={nprobe:<3} {ms:8.2f} ms/query  recall@{args.top_n}={recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
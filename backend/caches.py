@@ -0,0 +1,350 @@
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+
+# -----------------------------
+# Generic LRU + TTL Cache
+# -----------------------------
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        # TTLCache evicts least-recently-used entries once maxsize is reached
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl if ttl else float("inf"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def values(self) -> List[Any]:
+        """Snapshot of live values, without touching LRU order or counters."""
+        with self._lock:
+            self._data.expire()
+            return list(self._data.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._data.expire()
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": int(self._data.maxsize),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# -----------------------------
+# Career Advice Response Cache
+# -----------------------------
+ADVICE_CACHE_SIZE = int(os.environ.get("ADVICE_CACHE_SIZE", "1024"))
+ADVICE_CACHE_TTL_SECONDS = float(os.environ.get("ADVICE_CACHE_TTL_SECONDS", str(24 * 3600)))
+ADVICE_CACHE_NEAR_DUPLICATES = os.environ.get("ADVICE_CACHE_NEAR_DUPLICATES", "false").lower() in ("1", "true", "yes")
+ADVICE_CACHE_SIMILARITY = float(os.environ.get("ADVICE_CACHE_SIMILARITY", "0.92"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def canonicalize(value: Any) -> Any:
+    """Normalize a request payload so trivially different profiles compare equal.
+
+    Strings are lower-cased with whitespace collapsed, lists are sorted and
+    empty optional values are dropped.
+    """
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {
+            canonicalize(k): canonicalize(v)
+            for k, v in sorted(value.items())
+            if v not in (None, "", [], {})
+        }
+    if isinstance(value, (list, tuple, set)):
+        return sorted((canonicalize(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+
+def _profile_tokens(profile: Dict[str, Any]) -> Counter:
+    """Turn a canonical profile into field-scoped term counts."""
+    tokens: Counter = Counter()
+    for field, value in profile.items():
+        if isinstance(value, dict):
+            text = " ".join(f"{k} {v}" for k, v in value.items())
+        elif isinstance(value, list):
+            text = " ".join(str(v) for v in value)
+        else:
+            text = str(value)
+        for token in _TOKEN_RE.findall(text.lower()):
+            tokens[f"{field}:{token}"] += 1
+    return tokens
+
+
+class AdviceCache:
+    """Response cache for career-advice prompts.
+
+    Exact hits are keyed on a hash of the canonicalized request. When
+    near-duplicate mode is on, a miss falls back to TF-IDF cosine similarity
+    over the profile fields of cached entries of the same kind, and a
+    sufficiently similar profile reuses that entry's advice.
+    """
+
+    def __init__(self, maxsize: int = ADVICE_CACHE_SIZE, ttl: Optional[float] = ADVICE_CACHE_TTL_SECONDS,
+                 near_duplicates: bool = ADVICE_CACHE_NEAR_DUPLICATES,
+                 similarity_threshold: float = ADVICE_CACHE_SIMILARITY):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        self.near_hits = 0
+
+    @staticmethod
+    def make_key(kind: str, request: Any) -> Tuple[str, str, Dict[str, Any]]:
+        payload = request.model_dump() if hasattr(request, "model_dump") else dict(request)
+        profile = canonicalize(payload)
+        digest = hashlib.sha256(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{kind}:{digest}", kind, profile
+
+    def get(self, kind: str, request: Any) -> Optional[str]:
+        key, kind, profile = self.make_key(kind, request)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry["advice"]
+        if not self.near_duplicates:
+            return None
+        advice = self._find_near_duplicate(kind, _profile_tokens(profile))
+        if advice is not None:
+            self.near_hits += 1
+        return advice
+
+    def put(self, kind: str, request: Any, advice: str) -> None:
+        key, kind, profile = self.make_key(kind, request)
+        self._entries.put(key, {"kind": kind, "tokens": _profile_tokens(profile), "advice": advice})
+
+    def _find_near_duplicate(self, kind: str, query: Counter) -> Optional[str]:
+        candidates = [entry for entry in self._entries.values() if entry["kind"] == kind]
+        if not candidates or not query:
+            return None
+
+        # Smoothed IDF over the cached profiles of this kind plus the query
+        n_docs = len(candidates) + 1
+        df: Counter = Counter(query.keys())
+        for entry in candidates:
+            df.update(entry["tokens"].keys())
+        idf = {term: math.log((1 + n_docs) / (1 + count)) + 1.0 for term, count in df.items()}
+
+        def weigh(tokens: Counter) -> Dict[str, float]:
+            vec = {term: tf * idf[term] for term, tf in tokens.items()}
+            norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+            return {term: w / norm for term, w in vec.items()}
+
+        query_vec = weigh(query)
+        best_score, best_advice = 0.0, None
+        for entry in candidates:
+            entry_vec = weigh(entry["tokens"])
+            score = sum(w * entry_vec.get(term, 0.0) for term, w in query_vec.items())
+            if score > best_score:
+                best_score, best_advice = score, entry["advice"]
+        return best_advice if best_score >= self.similarity_threshold else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.near_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        stats["near_duplicate_mode"] = self.near_duplicates
+        stats["near_hits"] = self.near_hits
+        return stats
+
+
+advice_cache = AdviceCache()
+
+
+# -----------------------------
+# Persistent Job Details Cache
+# -----------------------------
+def _default_job_details_cache_path() -> str:
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(backend_dir, "artifacts", "job_details.sqlite3")
+
+
+JOB_DETAILS_CACHE_PATH = os.environ.get("JOB_DETAILS_CACHE_PATH") or _default_job_details_cache_path()
+
+
+def normalize_job_title(title: str) -> str:
+    """Normalize a job title for cache lookups ("Sr. Java  Developer " -> "sr java developer")."""
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", title.lower()).split())
+
+
+class JobDetailsStore:
+    """SQLite-backed cache of job title -> description and day-in-life points.
+
+    Job titles come from a finite, heavily repeated corpus, so cards are
+    generated once (on demand or by prewarm_job_details.py) and then
+    served from disk across restarts and workers.
+    """
+
+    def __init__(self, path: str = JOB_DETAILS_CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS job_details (
+                title_key TEXT PRIMARY KEY,
+                job_title TEXT NOT NULL,
+                job_description TEXT NOT NULL,
+                day_in_life TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_title: str) -> Optional[Dict[str, Any]]:
+        key = normalize_job_title(job_title)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_description, day_in_life FROM job_details WHERE title_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {"job_description": row[0], "day_in_life": json.loads(row[1])}
+
+    def put(self, job_title: str, job_description: str, day_in_life: List[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_details VALUES (?, ?, ?, ?, ?)",
+                (normalize_job_title(job_title), job_title, job_description, json.dumps(day_in_life), time.time()),
+            )
+            self._conn.commit()
+
+    def missing(self, job_titles: List[str]) -> List[str]:
+        """Return the titles (first spelling per normalized key) that are not cached yet."""
+        by_key: Dict[str, str] = {}
+        for title in job_titles:
+            key = normalize_job_title(title)
+            if key:
+                by_key.setdefault(key, title)
+        with self._lock:
+            cached = {row[0] for row in self._conn.execute("SELECT title_key FROM job_details")}
+        return [title for key, title in by_key.items() if key not in cached]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM job_details").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_job_details_store: Optional[JobDetailsStore] = None
+_job_details_store_lock = threading.Lock()
+
+
+def get_job_details_store() -> JobDetailsStore:
+    """Open the shared job details store on first use."""
+    global _job_details_store
+    if _job_details_store is None:
+        with _job_details_store_lock:
+            if _job_details_store is None:
+                _job_details_store = JobDetailsStore()
+    return _job_details_store
+
+
+# -----------------------------
+# CV Review Cache
+# -----------------------------
+CV_TEXT_CACHE_SIZE = int(os.environ.get("CV_TEXT_CACHE_SIZE", "1024"))
+CV_REVIEW_CACHE_SIZE = int(os.environ.get("CV_REVIEW_CACHE_SIZE", "512"))
+CV_REVIEW_CACHE_TTL_SECONDS = float(os.environ.get("CV_REVIEW_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def content_digest(content: Any) -> str:
+    """sha256 of raw bytes, or of a string's UTF-8 encoding."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class CVReviewCache:
+    """Content-addressed cache for CV reviews.
+
+    Extracted text is keyed by the hash of the uploaded PDF bytes, so a
+    re-upload skips parsing. Reviews are keyed by the hash of the extracted
+    text, so the same CV exported to a different PDF still reuses its review.
+    Both levels are LRU-bounded.
+    """
+
+    def __init__(self, text_size: int = CV_TEXT_CACHE_SIZE, review_size: int = CV_REVIEW_CACHE_SIZE,
+                 ttl: Optional[float] = CV_REVIEW_CACHE_TTL_SECONDS):
+        self._texts = LRUCache(maxsize=text_size, ttl=ttl)
+        self._reviews = LRUCache(maxsize=review_size, ttl=ttl)
+
+    def get_text(self, pdf_digest: str) -> Optional[str]:
+        return self._texts.get(pdf_digest)
+
+    def put_text(self, pdf_digest: str, text: str) -> None:
+        self._texts.put(pdf_digest, text)
+
+    def get_review(self, text_digest: str) -> Optional[Dict[str, Any]]:
+        return self._reviews.get(text_digest)
+
+    def put_review(self, text_digest: str, review: Dict[str, Any]) -> None:
+        self._reviews.put(text_digest, review)
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self._reviews.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"texts": self._texts.stats(), "reviews": self._reviews.stats()}
+
+
+cv_review_cache = CVReviewCache()
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from llm_client import ainvoke, get_chat_model
+from session_store import Session, SessionStore
+
+
+# -----------------------------
+# Token-Budgeted Conversation Context
+# -----------------------------
+# Chat and interview prompts carry a rolling summary of older turns plus as
+# many recent turns verbatim as fit in a token budget, instead of the last N
+# raw exchanges. The summary is stored in the session metadata ("summary",
+# plus "summarized_turns" = how many turns it covers) and is refreshed in the
+# background every few turns, so summarization never delays a reply.
+# Tokens are estimated from character counts; Gemini averages about four
+# characters per token for English text.
+CONTEXT_CHARS_PER_TOKEN = float(os.environ.get("CONTEXT_CHARS_PER_TOKEN", "4"))
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("CHAT_CONTEXT_TOKEN_BUDGET", "1500"))
+INTERVIEW_CONTEXT_TOKEN_BUDGET = int(os.environ.get("INTERVIEW_CONTEXT_TOKEN_BUDGET", "2500"))
+# Newest turns that are never folded into the summary
+CONTEXT_RECENT_TURNS = int(os.environ.get("CONTEXT_RECENT_TURNS", "4"))
+# Fold older turns into the summary once this many have accumulated outside the recent window
+CONTEXT_SUMMARIZE_EVERY_TURNS = int(os.environ.get("CONTEXT_SUMMARIZE_EVERY_TURNS", "4"))
+CONTEXT_SUMMARY_MAX_TOKENS = int(os.environ.get("CONTEXT_SUMMARY_MAX_TOKENS", "300"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (no tokenizer round trip)."""
+    return int(len(text) / CONTEXT_CHARS_PER_TOKEN) + 1 if text else 0
+
+
+class ConversationContext:
+    """Builds the history part of a prompt for one kind of session within a token budget."""
+
+    def __init__(self, kind: str, format_turn: Callable[[Dict[str, Any]], str], token_budget: int,
+                 summary_focus: str):
+        self.kind = kind
+        self.format_turn = format_turn
+        self.token_budget = token_budget
+        self.summary_focus = summary_focus
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.summaries = 0
+        self.summary_errors = 0
+
+    def _unsummarized(self, session: Session) -> List[Tuple[int, Dict[str, Any]]]:
+        summarized = session.meta.get("summarized_turns", 0)
+        first = session.first_turn_index
+        return [(first + i, turn) for i, turn in enumerate(session.turns) if first + i >= summarized]
+
+    def render(self, session: Session) -> str:
+        """Summary of older turns followed by the newest turns that fit in the budget."""
+        summary = session.meta.get("summary", "")
+        remaining = self.token_budget - estimate_tokens(summary)
+        recent: List[str] = []
+        for _, turn in reversed(self._unsummarized(session)):
+            text = self.format_turn(turn)
+            cost = estimate_tokens(text)
+            if cost > remaining:
+                if not recent:
+                    # Always keep the latest turn, trimmed to its most recent part
+                    recent.append(text[-int(max(remaining, 0) * CONTEXT_CHARS_PER_TOKEN):] if remaining > 0 else "")
+                break
+            recent.append(text)
+            remaining -= cost
+
+        parts = []
+        if summary:
+            parts.append(f"Summary of the earlier conversation:\n{summary}\n")
+        parts.extend(reversed(recent))
+        return "\n".join(part for part in parts if part)
+
+    def _turns_to_fold(self, session: Session) -> List[Tuple[int, Dict[str, Any]]]:
+        """Older unsummarized turns that should go into the summary now (empty when not due yet)."""
+        pending = self._unsummarized(session)
+        older = pending[:-CONTEXT_RECENT_TURNS] if CONTEXT_RECENT_TURNS else pending
+        over_budget = sum(estimate_tokens(self.format_turn(turn)) for _, turn in pending) > (
+            self.token_budget - estimate_tokens(session.meta.get("summary", ""))
+        )
+        if len(older) < CONTEXT_SUMMARIZE_EVERY_TURNS and not (older and over_budget):
+            return []
+        # Keep the recent window within half the budget so the next refresh is a few turns away
+        kept = pending[len(older):]
+        while len(kept) > 1 and sum(estimate_tokens(self.format_turn(t)) for _, t in kept) > self.token_budget // 2:
+            older.append(kept.pop(0))
+        return older
+
+    def schedule_summary(self, store: SessionStore, session: Session) -> None:
+        """Refresh the session's summary in the background if enough old turns have piled up.
+
+        session should already include the turn just appended.
+        """
+        if session.id in self._inflight or not self._turns_to_fold(session):
+            return
+        session_id = session.id
+        task = asyncio.ensure_future(self._update_summary(store, session_id))
+        self._inflight[session_id] = task
+        task.add_done_callback(lambda _: self._inflight.pop(session_id, None))
+
+    async def _update_summary(self, store: SessionStore, session_id: str) -> None:
+        session = await run_in_threadpool(store.load, self.kind, session_id)
+        if session is None:
+            return
+        fold = self._turns_to_fold(session)
+        if not fold:
+            return
+        previous = session.meta.get("summary", "")
+        prompt = (
+            f"You maintain a running summary of a conversation. {self.summary_focus}\n"
+            f"Update the summary with the new turns below. Keep it under {int(CONTEXT_SUMMARY_MAX_TOKENS * 0.75)} words, "
+            f"written as plain notes; do not add anything that was not said.\n\n"
+            f"Current summary:\n{previous or '(none yet)'}\n\n"
+            f"New turns:\n" + "\n".join(self.format_turn(turn) for _, turn in fold) + "\n\nUpdated summary:"
+        )
+        try:
+            llm = get_chat_model(temperature=0.2, max_tokens=CONTEXT_SUMMARY_MAX_TOKENS * 2)
+            response = await ainvoke(llm, prompt)
+            summary = (response.content if hasattr(response, "content") else str(response)).strip()
+        except Exception as e:
+            # The turns stay verbatim (within budget) and are retried after the next turn
+            self.summary_errors += 1
+            print(f"⚠️ Conversation summary failed for {self.kind} session {session_id[:8]}: {e}")
+            return
+        if summary:
+            changes = {"summary": summary, "summarized_turns": fold[-1][0] + 1}
+            await run_in_threadpool(store.update_meta, self.kind, session_id, changes)
+            self.summaries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "token_budget": self.token_budget,
+            "summaries": self.summaries,
+            "summary_errors": self.summary_errors,
+            "in_progress": len(self._inflight),
+        }
+
+
+def _format_chat_turn(turn: Dict[str, Any]) -> str:
+    return f"User: {turn.get('user', '')}\nBot: {turn.get('bot', '')}"
+
+
+def _format_interview_turn(turn: Dict[str, Any]) -> str:
+    text = f"Interviewer: {turn.get('interviewer', '')}"
+    if turn.get("candidate"):
+        text += f"\nCandidate: {turn['candidate']}"
+    return text
+
+
+chat_context = ConversationContext(
+    "chat", _format_chat_turn, CHAT_CONTEXT_TOKEN_BUDGET,
+    "Keep the user's background, goals, constraints and the advice already given.",
+)
+interview_context = ConversationContext(
+    "interview", _format_interview_turn, INTERVIEW_CONTEXT_TOKEN_BUDGET,
+    "Keep which questions were asked (with their numbers), a short gist of each answer "
+    "and how strong it was, so final feedback can refer to every answer.",
+)
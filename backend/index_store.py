@@ -0,0 +1,574 @@
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+# -----------------------------
+# Versioned Job Index Format
+# -----------------------------
+# artifacts/job_index/
+#   CURRENT                   name of the active generation directory
+#   vocab/v-000001/           vocab.npy (fixed-width terms, sorted within each field), idf.npy
+#   segments/seg-000001/      one immutable slice of the corpus:
+#     matrix_*.npy            L2-normalized CSR rows (jobs x terms)
+#     postings_*.npy          CSR transpose (terms x jobs)
+#     col_<name>.npy          UTF-8 bytes of a string column
+#     col_<name>_offsets.npy
+#     num_<name>.npy          float32 attribute column (NaN when unknown)
+#     attr_<name>_*.npy       pre-filter indexes (see AttributeIndex)
+#   gen-000003/
+#     manifest.json           format version, tokenizer, vocab and segment list
+#     deleted_<segment>.npy   tombstones for removed jobs (when any)
+#
+# Every array is a plain .npy file opened with mmap_mode="r", so workers on
+# the same host share pages through the OS page cache and start without
+# unpickling. Vocabularies and segments are never modified; each change
+# (export, ingest, removal, IDF refresh) writes new files plus a new
+# generation manifest, and is published by atomically replacing CURRENT.
+#
+# The term space is split into one block per text field (title, description,
+# skills); the manifest tokenizer lists each field's weight and term count.
+# Document rows hold each field's L2-normalized block scaled by its weight.
+#
+# Format 1 kept vocabulary, matrix and columns directly in the generation
+# directory; it is still readable as a single-segment generation. Formats 1
+# and 2 have a single "title" field and no numeric columns.
+FORMAT_VERSION = 3
+SUPPORTED_FORMATS = (1, 2, 3)
+JOB_INDEX_DIRNAME = "job_index"
+KEEP_GENERATIONS = 2
+
+STRING_COLUMNS = ("job_title", "city", "state", "salary", "job_key")
+OPTIONAL_COLUMNS = ("city", "state", "salary")
+NUMERIC_COLUMNS = ("salary_min", "salary_max")
+CATEGORICAL_ATTRIBUTES = ("city", "state")
+
+_TOKENIZER_PARAMS = ("lowercase", "strip_accents", "stop_words", "token_pattern", "ngram_range",
+                     "binary", "norm", "use_idf", "smooth_idf", "sublinear_tf")
+_NORMS = ("l1", "l2", None)
+
+
+class StringColumn:
+    """Read-only string column stored as one UTF-8 blob plus row offsets."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, optional: bool = False):
+        self._blob = blob
+        self._offsets = offsets
+        self._optional = optional
+
+    def __len__(self) -> int:
+        return self._offsets.shape[0] - 1
+
+    def __getitem__(self, idx: int) -> Optional[str]:
+        start, end = self._offsets[idx], self._offsets[idx + 1]
+        value = self._blob[start:end].tobytes().decode("utf-8")
+        if self._optional and value == "":
+            return None
+        return value
+
+    def tolist(self) -> List[Optional[str]]:
+        return [self[i] for i in range(len(self))]
+
+
+class VocabularyEncoder:
+    """Pickle-free TF-IDF encoder for the stored term space.
+
+    Reproduces TfidfVectorizer.transform for each field block from the
+    tokenizer settings in the manifest, the vocabulary array and the idf
+    weights. Term ids are found with a binary search over the memory-mapped
+    vocabulary, so no per-worker vocabulary dict is built. binary, use_idf
+    and sublinear_tf are applied as TfidfVectorizer applies them; the
+    vectorizer's norm does not change results because every field block is
+    L2-normalized afterwards, as it is for pickled vectorizers. Manifests
+    written before these settings were stored get sklearn's defaults.
+    """
+
+    def __init__(self, vocab: np.ndarray, idf: np.ndarray, config: Dict[str, Any]):
+        self.vocab = vocab
+        self.idf = idf
+        self.binary = bool(config.get("binary", False))
+        self.use_idf = bool(config.get("use_idf", True))
+        self.smooth_idf = bool(config.get("smooth_idf", True))
+        self.sublinear_tf = bool(config.get("sublinear_tf", False))
+        self._analyzer = TfidfVectorizer(
+            lowercase=config.get("lowercase", True),
+            strip_accents=config.get("strip_accents"),
+            stop_words=config.get("stop_words"),
+            token_pattern=config.get("token_pattern", r"(?u)\b\w\w+\b"),
+            ngram_range=tuple(config.get("ngram_range", (1, 1))),
+        ).build_analyzer()
+
+        # (name, weight, start, end) of each field's block of term ids
+        self.fields: List[Tuple[str, float, int, int]] = []
+        start = 0
+        for field in config.get("fields") or [{"name": "title", "weight": 1.0, "n_terms": vocab.shape[0]}]:
+            self.fields.append((field["name"], float(field["weight"]), start, start + field["n_terms"]))
+            start += field["n_terms"]
+
+    def _encode_block(self, texts: List[str], start: int, end: int) -> sp.csr_matrix:
+        vocab = self.vocab[start:end]
+        indptr = [0]
+        indices: List[np.ndarray] = []
+        data: List[np.ndarray] = []
+        for text in texts:
+            terms = self._analyzer(text) if vocab.shape[0] else []
+            if terms:
+                terms = np.asarray(terms)
+                positions = np.searchsorted(vocab, terms)
+                positions = np.minimum(positions, vocab.shape[0] - 1)
+                positions = positions[vocab[positions] == terms]
+                term_ids, counts = np.unique(positions, return_counts=True)
+                tf = np.ones(len(term_ids), dtype=np.float32) if self.binary else counts.astype(np.float32)
+                if self.sublinear_tf:
+                    tf = 1.0 + np.log(tf)
+                indices.append(term_ids)
+                data.append(tf * self.idf[start + term_ids] if self.use_idf else tf)
+                indptr.append(indptr[-1] + len(term_ids))
+            else:
+                indptr.append(indptr[-1])
+        return sp.csr_matrix(
+            (
+                np.concatenate(data) if data else np.empty(0, dtype=np.float32),
+                np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+                np.asarray(indptr),
+            ),
+            shape=(len(texts), end - start),
+        )
+
+    def transform_queries(self, texts: List[str]) -> sp.csr_matrix:
+        """Query rows: the same text encoded into every field block, each block L2-normalized."""
+        blocks = [normalize(self._encode_block(texts, start, end)) for _, _, start, end in self.fields]
+        return sp.hstack(blocks, format="csr", dtype=np.float32)
+
+    def transform_documents(self, field_texts: Dict[str, List[str]]) -> sp.csr_matrix:
+        """Document rows from per-field texts (missing fields are left empty)."""
+        n_rows = len(next(iter(field_texts.values())))
+        blocks = [
+            self._encode_block(field_texts.get(name, [""] * n_rows), start, end)
+            for name, _, start, end in self.fields
+        ]
+        return self.normalize_documents(sp.hstack(blocks, format="csr", dtype=np.float32))
+
+    def normalize_documents(self, matrix: sp.csr_matrix) -> sp.csr_matrix:
+        """L2-normalize each field block of the rows and scale it by the field weight."""
+        return normalize_field_blocks(matrix, [(weight, start, end) for _, weight, start, end in self.fields])
+
+
+def normalize_field_blocks(matrix: sp.csr_matrix, blocks: List[Tuple[float, int, int]]) -> sp.csr_matrix:
+    """Normalize the (weight, start, end) column blocks of a matrix independently and weight them."""
+    matrix = sp.csr_matrix(matrix, dtype=np.float32)
+    if len(blocks) == 1:
+        weight = blocks[0][0]
+        matrix = normalize(matrix, norm="l2", copy=False)
+        return matrix * weight if weight != 1.0 else matrix
+    parts = [normalize(matrix[:, start:end], norm="l2") * weight for weight, start, end in blocks]
+    return sp.hstack(parts, format="csr", dtype=np.float32)
+
+
+def normalize_attribute(value: Optional[str]) -> str:
+    """Canonical form of a city/state value for filtering ("  New  Delhi" -> "new delhi")."""
+    return " ".join(str(value).lower().split()) if value else ""
+
+
+class AttributeIndex:
+    """Pre-filter indexes over one segment's job attributes.
+
+    Categorical attributes (normalized city and state) are inverted lists:
+    sorted distinct values, and for each value the sorted row ids holding it.
+    Numeric attributes (salary_min, salary_max) are row ids ordered by value,
+    so a range constraint is two binary searches and a slice. Filters resolve
+    to a sorted array of candidate rows without touching the other rows.
+    """
+
+    def __init__(self, categorical: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                 numeric: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        self.categorical = categorical
+        self.numeric = numeric
+
+    @classmethod
+    def build(cls, attributes: Dict[str, np.ndarray]) -> "AttributeIndex":
+        """Build from normalized categorical arrays and float numeric arrays, by name."""
+        categorical = {}
+        for name in CATEGORICAL_ATTRIBUTES:
+            values = np.asarray(attributes[name], dtype=str)
+            order = np.argsort(values, kind="stable")
+            distinct, starts = np.unique(values[order], return_index=True)
+            offsets = np.append(starts, len(values)).astype(np.int64)
+            categorical[name] = (distinct, offsets, order.astype(np.int32))
+        numeric = {}
+        for name in NUMERIC_COLUMNS:
+            values = np.asarray(attributes[name], dtype=np.float32)
+            known = np.flatnonzero(~np.isnan(values))
+            order = known[np.argsort(values[known], kind="stable")].astype(np.int32)
+            numeric[name] = (values[order], order)
+        return cls(categorical, numeric)
+
+    def save(self, directory: str) -> None:
+        for name, (distinct, offsets, rows) in self.categorical.items():
+            np.save(os.path.join(directory, f"attr_{name}_values.npy"), distinct)
+            np.save(os.path.join(directory, f"attr_{name}_offsets.npy"), offsets)
+            np.save(os.path.join(directory, f"attr_{name}_rows.npy"), rows)
+        for name, (sorted_values, order) in self.numeric.items():
+            np.save(os.path.join(directory, f"attr_{name}_sorted.npy"), sorted_values)
+            np.save(os.path.join(directory, f"attr_{name}_order.npy"), order)
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["AttributeIndex"]:
+        """Memory-map a segment's attribute indexes, or None for segments written without them."""
+        def array(filename: str) -> np.ndarray:
+            return np.load(os.path.join(directory, filename), mmap_mode="r")
+
+        try:
+            categorical = {
+                name: (array(f"attr_{name}_values.npy"), array(f"attr_{name}_offsets.npy"),
+                       array(f"attr_{name}_rows.npy"))
+                for name in CATEGORICAL_ATTRIBUTES
+            }
+            numeric = {
+                name: (array(f"attr_{name}_sorted.npy"), array(f"attr_{name}_order.npy"))
+                for name in NUMERIC_COLUMNS
+            }
+        except FileNotFoundError:
+            return None
+        return cls(categorical, numeric)
+
+    def rows_with(self, name: str, wanted) -> np.ndarray:
+        """Sorted row ids whose normalized `name` is one of `wanted`."""
+        distinct, offsets, rows = self.categorical[name]
+        parts = []
+        for value in wanted:
+            position = int(np.searchsorted(distinct, value))
+            if position < len(distinct) and distinct[position] == value:
+                parts.append(rows[offsets[position]:offsets[position + 1]])
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate(parts))
+
+    def rows_between(self, name: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Sorted row ids with low <= value <= high (rows with unknown values never match)."""
+        sorted_values, order = self.numeric[name]
+        start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        end = len(order) if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        return np.sort(order[start:end])
+
+
+def attribute_arrays(columns: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Normalized categorical and numeric attribute arrays from segment columns."""
+    arrays: Dict[str, np.ndarray] = {}
+    for name in CATEGORICAL_ATTRIBUTES:
+        column = columns[name]
+        values = column.tolist() if hasattr(column, "tolist") else list(column)
+        arrays[name] = np.array([normalize_attribute(value) for value in values], dtype=object)
+    for name in NUMERIC_COLUMNS:
+        arrays[name] = np.asarray(columns[name], dtype=np.float32)
+    return arrays
+
+
+def _save_csr(directory: str, prefix: str, matrix: sp.csr_matrix) -> None:
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    np.save(os.path.join(directory, f"{prefix}_data.npy"), matrix.data.astype(np.float32))
+    np.save(os.path.join(directory, f"{prefix}_indices.npy"), matrix.indices.astype(np.int32))
+    np.save(os.path.join(directory, f"{prefix}_indptr.npy"), matrix.indptr.astype(np.int64))
+
+
+def _load_csr(directory: str, prefix: str, shape) -> sp.csr_matrix:
+    arrays = [np.load(os.path.join(directory, f"{prefix}_{part}.npy"), mmap_mode="r")
+              for part in ("data", "indices", "indptr")]
+    matrix = sp.csr_matrix(tuple(arrays), shape=tuple(shape), copy=False)
+    matrix.has_sorted_indices = True
+    return matrix
+
+
+def _save_string_column(directory: str, name: str, values) -> None:
+    encoded = [b"" if value is None else str(value).encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(item) for item in encoded])
+    # Trailing pad byte keeps the file non-empty so it can always be mmapped
+    blob = np.frombuffer(b"".join(encoded) + b"\0", dtype=np.uint8)
+    np.save(os.path.join(directory, f"col_{name}.npy"), blob)
+    np.save(os.path.join(directory, f"col_{name}_offsets.npy"), offsets)
+
+
+def _load_string_column(directory: str, name: str) -> StringColumn:
+    blob = np.load(os.path.join(directory, f"col_{name}.npy"), mmap_mode="r")
+    offsets = np.load(os.path.join(directory, f"col_{name}_offsets.npy"), mmap_mode="r")
+    return StringColumn(blob, offsets, optional=name in OPTIONAL_COLUMNS)
+
+
+def vectorizer_fields(vectorizer) -> List[Tuple[str, float, TfidfVectorizer]]:
+    """(name, weight, TfidfVectorizer) per field; a plain vectorizer is a single title field."""
+    if hasattr(vectorizer, "fields"):
+        return list(vectorizer.fields)
+    return [("title", 1.0, vectorizer)]
+
+
+def tokenizer_config(vectorizer: TfidfVectorizer) -> Dict[str, Any]:
+    """Extract the tokenizer settings VocabularyEncoder needs from a fitted vectorizer.
+
+    Raises:
+        ValueError: If the vectorizer uses settings VocabularyEncoder cannot reproduce
+    """
+    params = vectorizer.get_params()
+    if params.get("analyzer") != "word" or params.get("tokenizer") or params.get("preprocessor"):
+        raise ValueError("Only word-analyzer TfidfVectorizers without custom callables can be exported")
+    if params.get("norm") not in _NORMS:
+        raise ValueError(f"Unsupported TF-IDF norm {params.get('norm')!r}")
+    config = {name: params.get(name) for name in _TOKENIZER_PARAMS}
+    if config["stop_words"] is not None and not isinstance(config["stop_words"], str):
+        config["stop_words"] = sorted(config["stop_words"])
+    config["ngram_range"] = list(config["ngram_range"])
+    return config
+
+
+def _next_name(directory: str, prefix: str) -> str:
+    existing = [d for d in os.listdir(directory) if d.startswith(prefix + "-")] if os.path.isdir(directory) else []
+    numbers = [int(d.split("-")[1].split(".")[0]) for d in existing if d.split("-")[1].split(".")[0].isdigit()]
+    return f"{prefix}-{max(numbers, default=0) + 1:06d}"
+
+
+def _write_staged(parent: str, prefix: str, write, name: Optional[str] = None) -> str:
+    """Write into a staging directory, then rename it into place under a fresh name."""
+    os.makedirs(parent, exist_ok=True)
+    name = name or _next_name(parent, prefix)
+    staging = os.path.join(parent, f".{name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    write(staging)
+    os.replace(staging, os.path.join(parent, name))
+    return name
+
+
+def write_vocab(root: str, vocab: np.ndarray, idf: np.ndarray) -> str:
+    """Store a sorted vocabulary and its idf weights; returns the vocab name."""
+    def write(directory: str) -> None:
+        np.save(os.path.join(directory, "vocab.npy"), np.asarray(vocab, dtype=str))
+        np.save(os.path.join(directory, "idf.npy"), np.asarray(idf, dtype=np.float32))
+
+    return _write_staged(os.path.join(root, "vocab"), "v", write)
+
+
+def write_segment(root: str, job_matrix: sp.csr_matrix, columns: Dict[str, Any]) -> str:
+    """Store an immutable segment of normalized job rows; returns the segment name."""
+    def write(directory: str) -> None:
+        matrix = sp.csr_matrix(job_matrix, dtype=np.float32)
+        _save_csr(directory, "matrix", matrix)
+        _save_csr(directory, "postings", matrix.T.tocsr())
+        for column in STRING_COLUMNS:
+            _save_string_column(directory, column, columns[column])
+        for column in NUMERIC_COLUMNS:
+            np.save(os.path.join(directory, f"num_{column}.npy"), np.asarray(columns[column], dtype=np.float32))
+        AttributeIndex.build(attribute_arrays(columns)).save(directory)
+
+    return _write_staged(os.path.join(root, "segments"), "seg", write)
+
+
+def publish_generation(root: str, manifest: Dict[str, Any], deleted: Optional[Dict[str, np.ndarray]] = None) -> str:
+    """Write a generation manifest (plus tombstones) and make it CURRENT.
+
+    Args:
+        root: The job_index/ directory
+        manifest: tokenizer, vocab, n_terms, columns and segments
+            ([{"name": ..., "n_jobs": ...}]); format and generation are filled in
+        deleted: Tombstone arrays by segment name, for segments with removals
+
+    Returns:
+        str: Path of the published generation directory
+    """
+    deleted = {name: mask for name, mask in (deleted or {}).items() if mask is not None and mask.any()}
+    manifest = dict(manifest)
+
+    def write(directory: str) -> None:
+        for segment in manifest["segments"]:
+            mask = deleted.get(segment["name"])
+            segment["n_deleted"] = int(mask.sum()) if mask is not None else 0
+            if mask is not None:
+                np.save(os.path.join(directory, f"deleted_{segment['name']}.npy"), mask.astype(bool))
+        manifest["n_jobs"] = sum(seg["n_jobs"] - seg["n_deleted"] for seg in manifest["segments"])
+        with open(os.path.join(directory, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    manifest["format_version"] = FORMAT_VERSION
+    manifest["created_at"] = time.time()
+    name = _next_name(root, "gen")
+    manifest["generation"] = int(name.split("-")[1])
+    _write_staged(root, "gen", write, name=name)
+    _publish(root, name)
+    _prune(root, keep=KEEP_GENERATIONS)
+    return os.path.join(root, name)
+
+
+def write_generation(artifacts_dir: str, vectorizer, job_matrix: sp.csr_matrix,
+                     columns: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> str:
+    """Write a fresh single-segment generation from a fitted vectorizer and publish it.
+
+    Args:
+        artifacts_dir: Directory that holds (or will hold) job_index/
+        vectorizer: Fitted TfidfVectorizer or MultiFieldVectorizer
+        job_matrix: Normalized document rows from that vectorizer
+        columns: Display columns by name (sequences of str/None), plus optional numeric columns
+        extra: Additional manifest fields
+
+    Returns:
+        str: Path of the published generation directory
+    """
+    root = os.path.join(artifacts_dir, JOB_INDEX_DIRNAME)
+    os.makedirs(root, exist_ok=True)
+    job_matrix = sp.csr_matrix(job_matrix, dtype=np.float32)
+
+    # Vocabulary sorted by term within each field block so lookups are a binary search
+    fields = vectorizer_fields(vectorizer)
+    terms, idf, order, field_meta = [], [], [], []
+    start = 0
+    for name, weight, field_vectorizer in fields:
+        field_terms = np.asarray(field_vectorizer.get_feature_names_out(), dtype=str)
+        field_order = np.argsort(field_terms, kind="stable")
+        terms.append(field_terms[field_order])
+        # Without use_idf the vectorizer has no idf_; unit weights keep the stored layout the same
+        field_idf = field_vectorizer.idf_ if field_vectorizer.use_idf else np.ones(len(field_terms))
+        idf.append(field_idf[field_order])
+        order.append(start + field_order)
+        field_meta.append({"name": name, "weight": float(weight), "n_terms": int(len(field_terms))})
+        start += len(field_terms)
+    order = np.concatenate(order)
+    if not np.array_equal(order, np.arange(len(order))):
+        job_matrix = job_matrix[:, order].tocsr()
+
+    config = tokenizer_config(fields[0][2])
+    if any(tokenizer_config(field_vectorizer) != config for _, _, field_vectorizer in fields[1:]):
+        raise ValueError("All field vectorizers must share the same tokenizer settings to be exported")
+    config["fields"] = field_meta
+    vocab_name = write_vocab(root, np.concatenate(terms), np.concatenate(idf))
+    segment_name = write_segment(root, job_matrix, columns)
+    manifest = {
+        "tokenizer": config,
+        "vocab": vocab_name,
+        "n_terms": int(job_matrix.shape[1]),
+        "columns": list(STRING_COLUMNS),
+        "numeric_columns": list(NUMERIC_COLUMNS),
+        "segments": [{"name": segment_name, "n_jobs": int(job_matrix.shape[0])}],
+        "docs_since_idf_refresh": 0,
+    }
+    manifest.update(extra or {})
+    return publish_generation(root, manifest)
+
+
+def read_current(root: str) -> Optional[str]:
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _publish(root: str, name: str) -> None:
+    tmp = os.path.join(root, f"CURRENT.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(root, "CURRENT"))
+
+
+def _prune(root: str, keep: int) -> None:
+    """Drop old generations, then any vocab/segment no remaining generation uses.
+
+    Older generations may still be mapped by running workers; unlinking is
+    safe on POSIX because open mappings keep the data alive.
+    """
+    generations = sorted(d for d in os.listdir(root) if d.startswith("gen-") and not d.endswith(".tmp"))
+    for name in generations[:-keep]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+    used = {"vocab": set(), "segments": set()}
+    for name in generations[-keep:]:
+        try:
+            with open(os.path.join(root, name, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get("vocab"):
+            used["vocab"].add(manifest["vocab"])
+        used["segments"].update(seg["name"] for seg in manifest.get("segments", []))
+    for kind, names in used.items():
+        directory = os.path.join(root, kind)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if name not in names and not name.startswith("."):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def read_manifest(root: str) -> Dict[str, Any]:
+    """Manifest of the CURRENT generation."""
+    name = read_current(root)
+    if not name:
+        raise FileNotFoundError(f"No published generation in {root}")
+    with open(os.path.join(root, name, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported job index format {manifest.get('format_version')} (expected one of {SUPPORTED_FORMATS})"
+        )
+    manifest["_path"] = os.path.join(root, name)
+    return manifest
+
+
+def _load_columns(segment_dir: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    columns: Dict[str, Any] = {column: _load_string_column(segment_dir, column) for column in manifest["columns"]}
+    for column in manifest.get("numeric_columns", []):
+        path = os.path.join(segment_dir, f"num_{column}.npy")
+        if os.path.exists(path):
+            columns[column] = np.load(path, mmap_mode="r")
+    return columns
+
+
+def load_generation(root: str) -> Dict[str, Any]:
+    """Memory-map the CURRENT generation under root.
+
+    Returns:
+        dict: manifest, path, encoder, and segments (each with name,
+        job_matrix, postings, columns, an optional deleted mask and the
+        AttributeIndex when the segment has one)
+    """
+    manifest = read_manifest(root)
+    directory = manifest["_path"]
+    n_terms = manifest["n_terms"]
+
+    if manifest["format_version"] == 1:
+        vocab_dir = directory
+        segment_dirs = [(os.path.basename(directory), directory, manifest["n_jobs"])]
+    else:
+        vocab_dir = os.path.join(root, "vocab", manifest["vocab"])
+        segment_dirs = [
+            (seg["name"], os.path.join(root, "segments", seg["name"]), seg["n_jobs"])
+            for seg in manifest["segments"]
+        ]
+
+    segments = []
+    for name, segment_dir, n_jobs in segment_dirs:
+        deleted_path = os.path.join(directory, f"deleted_{name}.npy")
+        segments.append({
+            "name": name,
+            "job_matrix": _load_csr(segment_dir, "matrix", (n_jobs, n_terms)),
+            "postings": _load_csr(segment_dir, "postings", (n_terms, n_jobs)),
+            "columns": _load_columns(segment_dir, manifest),
+            "deleted": np.load(deleted_path) if os.path.exists(deleted_path) else None,
+            "attributes": AttributeIndex.load(segment_dir),
+        })
+
+    vocab = np.load(os.path.join(vocab_dir, "vocab.npy"), mmap_mode="r")
+    idf = np.load(os.path.join(vocab_dir, "idf.npy"), mmap_mode="r")
+    return {
+        "manifest": manifest,
+        "path": directory,
+        "encoder": VocabularyEncoder(vocab, idf, manifest["tokenizer"]),
+        "segments": segments,
+    }
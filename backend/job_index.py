@@ -0,0 +1,1313 @@
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from caches import LRUCache
+from index_store import (
+    CATEGORICAL_ATTRIBUTES,
+    JOB_INDEX_DIRNAME,
+    NUMERIC_COLUMNS,
+    AttributeIndex,
+    load_generation,
+    normalize_attribute,
+    normalize_field_blocks,
+    publish_generation,
+    read_current,
+    read_manifest,
+    write_generation,
+    write_segment,
+    write_vocab,
+)
+
+
+# -----------------------------
+# Artifact Helpers
+# -----------------------------
+def resolve_artifact_path(filename: str) -> Optional[str]:
+    """Try common locations for artifacts and return first existing path.
+
+    Order of precedence:
+    - JOB_ARTIFACTS_DIR env var (if set)
+    - backend/artifacts/
+    - project_root/artifacts/ (parent of backend)
+    - backend/
+    - project_root/
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(backend_dir, os.pardir))
+    env_dir = os.environ.get("JOB_ARTIFACTS_DIR")
+
+    candidates = []
+    if env_dir:
+        candidates.append(os.path.join(env_dir, filename))
+    candidates.extend([
+        os.path.join(backend_dir, "artifacts", filename),
+        os.path.join(project_root, "artifacts", filename),
+        os.path.join(backend_dir, filename),
+        os.path.join(project_root, filename),
+        os.path.join(os.getcwd(), "artifacts", filename),
+        os.path.join(os.getcwd(), filename),
+    ])
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# -----------------------------
+# Multi-field Text Index
+# -----------------------------
+# CSV columns indexed per text field; the first one present is used
+TEXT_FIELD_COLUMNS = {
+    "title": ("Job Title",),
+    "description": ("Job Description", "Description", "job_description"),
+    "skills": ("Skills", "Key Skills", "skills"),
+}
+DEFAULT_FIELD_WEIGHTS = {"title": 0.5, "skills": 0.3, "description": 0.2}
+
+
+def _parse_field_weights(raw: str) -> Dict[str, float]:
+    """Parse "title=0.5,skills=0.3,description=0.2" (unknown fields are ignored)."""
+    weights = dict(DEFAULT_FIELD_WEIGHTS)
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        name, _, value = item.partition("=")
+        if name.strip() in TEXT_FIELD_COLUMNS:
+            weights[name.strip()] = float(value)
+    return weights
+
+
+JOB_INDEX_FIELD_WEIGHTS = _parse_field_weights(os.environ.get("JOB_INDEX_FIELD_WEIGHTS", ""))
+
+
+def job_field_texts(jobs_df: pd.DataFrame) -> Dict[str, List[str]]:
+    """Texts of each indexed field present in the jobs DataFrame."""
+    texts = {}
+    for field, candidates in TEXT_FIELD_COLUMNS.items():
+        column = next((name for name in candidates if name in jobs_df.columns), None)
+        if column is not None:
+            texts[field] = jobs_df[column].fillna("").astype(str).tolist()
+    return texts
+
+
+class MultiFieldVectorizer:
+    """TF-IDF over several text fields of a job, combined into one weighted term space.
+
+    Each field gets its own vocabulary and idf, laid out as consecutive column
+    blocks. Document rows hold each field's L2-normalized vector scaled by the
+    field weight (weights sum to 1 over the fields present), and a query is
+    the same text L2-normalized within every block. The dot product is then
+    the weighted sum of per-field cosine similarities, so a resume is scored
+    against descriptions and skills, not just a handful of title words.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = dict(weights or JOB_INDEX_FIELD_WEIGHTS)
+        self.fields: List[Tuple[str, float, TfidfVectorizer]] = []
+
+    def fit(self, field_texts: Dict[str, List[str]]) -> "MultiFieldVectorizer":
+        fitted = []
+        for name in TEXT_FIELD_COLUMNS:
+            if name not in field_texts or self.weights.get(name, 0) <= 0:
+                continue
+            vectorizer = TfidfVectorizer(stop_words="english")
+            try:
+                vectorizer.fit(field_texts[name])
+            except ValueError:
+                # Empty vocabulary, e.g. an all-blank column
+                continue
+            fitted.append((name, self.weights[name], vectorizer))
+        if not fitted:
+            raise ValueError("None of the job text fields produced a vocabulary")
+        total = sum(weight for _, weight, _ in fitted)
+        self.fields = [(name, weight / total, vectorizer) for name, weight, vectorizer in fitted]
+        return self
+
+    def _blocks(self) -> List[Tuple[float, int, int]]:
+        blocks, start = [], 0
+        for _, weight, vectorizer in self.fields:
+            end = start + len(vectorizer.vocabulary_)
+            blocks.append((weight, start, end))
+            start = end
+        return blocks
+
+    def transform_documents(self, field_texts: Dict[str, List[str]]) -> sp.csr_matrix:
+        n_rows = len(next(iter(field_texts.values())))
+        blocks = [vectorizer.transform(field_texts.get(name, [""] * n_rows)) for name, _, vectorizer in self.fields]
+        return self.normalize_documents(sp.hstack(blocks, format="csr"))
+
+    def normalize_documents(self, matrix: sp.csr_matrix) -> sp.csr_matrix:
+        return normalize_field_blocks(matrix, self._blocks())
+
+    def transform_queries(self, texts: List[str]) -> sp.csr_matrix:
+        blocks = [normalize(vectorizer.transform(texts)) for _, _, vectorizer in self.fields]
+        return sp.hstack(blocks, format="csr", dtype=np.float32)
+
+    def transform(self, texts: List[str]) -> sp.csr_matrix:
+        return self.transform_queries(texts)
+
+    def get_feature_names_out(self) -> np.ndarray:
+        return np.concatenate([
+            np.asarray([f"{name}:{term}" for term in vectorizer.get_feature_names_out()], dtype=object)
+            for name, _, vectorizer in self.fields
+        ])
+
+
+def _prepare_documents(vectorizer, job_matrix) -> sp.csr_matrix:
+    """Normalize stored job rows the way the vectorizer's query side expects."""
+    if hasattr(vectorizer, "normalize_documents"):
+        return vectorizer.normalize_documents(job_matrix)
+    return normalize(sp.csr_matrix(job_matrix, dtype=np.float32), norm="l2", copy=False)
+
+
+def _prepare_queries(vectorizer, texts: List[str]) -> sp.csr_matrix:
+    if hasattr(vectorizer, "transform_queries"):
+        return vectorizer.transform_queries(texts)
+    return normalize(vectorizer.transform(texts).astype(np.float32), norm="l2", copy=False)
+
+
+def build_and_save_artifacts(jobs_csv_path: str, artifacts_dir: Optional[str] = None) -> None:
+    """Build TF-IDF artifacts from jobs CSV and persist them under artifacts_dir (default backend/artifacts)."""
+    df = pd.read_csv(jobs_csv_path)
+    if "Job Title" not in df.columns:
+        raise FileNotFoundError("'jobs_processed.csv' must contain a 'Job Title' column")
+    field_texts = job_field_texts(df)
+    vectorizer = MultiFieldVectorizer().fit(field_texts)
+    job_matrix = vectorizer.transform_documents(field_texts)
+
+    if artifacts_dir is None:
+        backend_dir = os.path.dirname(os.path.abspath(__file__))
+        artifacts_dir = os.path.join(backend_dir, "artifacts")
+    os.makedirs(artifacts_dir, exist_ok=True)
+    # Write under temporary names and rename, so a concurrent load never sees half a pickle
+    for filename, value in (("vectorizer.pkl", vectorizer), ("job_matrix.pkl", job_matrix)):
+        tmp_path = os.path.join(artifacts_dir, f".{filename}.{os.getpid()}.tmp")
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, os.path.join(artifacts_dir, filename))
+
+
+def rebuild_pickles() -> str:
+    """Refit the TF-IDF pickles from jobs_processed.csv (manage_job_index.py build).
+
+    The pickles are replaced where they are found, or written next to the CSV.
+
+    Returns:
+        str: Directory the pickles were written to
+    """
+    jobs_csv_path = resolve_artifact_path("jobs_processed.csv")
+    if not jobs_csv_path:
+        raise FileNotFoundError("jobs_processed.csv not found; set JOB_ARTIFACTS_DIR or place it in backend/artifacts/")
+    vectorizer_path = resolve_artifact_path("vectorizer.pkl")
+    artifacts_dir = os.path.dirname(vectorizer_path or jobs_csv_path)
+    build_and_save_artifacts(jobs_csv_path, artifacts_dir=artifacts_dir)
+    return artifacts_dir
+
+
+# -----------------------------
+# Scoring Helpers
+# -----------------------------
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, in O(n + k log k)."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+JOB_ID_COLUMNS = ("Job Id", "Job ID", "job_id")
+
+
+def _job_keys(jobs_df: pd.DataFrame) -> np.ndarray:
+    """Stable per-posting keys used to remove jobs from the index later.
+
+    Uses the dataset's job id column when there is one, otherwise a short
+    hash of the title, location and salary.
+    """
+    for name in JOB_ID_COLUMNS:
+        if name in jobs_df.columns:
+            return jobs_df[name].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+    fields = [
+        jobs_df[name].fillna("").astype(str).str.strip() if name in jobs_df.columns else pd.Series([""] * len(jobs_df))
+        for name in ("Job Title", "City", "State", "Salary")
+    ]
+    return np.array([
+        hashlib.sha1("|".join(values).encode("utf-8")).hexdigest()[:16]
+        for values in zip(*(field.tolist() for field in fields))
+    ], dtype=object)
+
+
+_SALARY_NUMBER_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k|lpa|lakhs?|lacs?|l|cr|crores?)?\b", re.IGNORECASE)
+_SALARY_UNITS = {"k": 1e3, "l": 1e5, "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+                 "cr": 1e7, "crore": 1e7, "crores": 1e7}
+
+
+_SALARY_PER = r"(?:\bper\s+|\ba\s+|/\s*)"
+# Multiplier to a yearly amount by pay period; None means the period cannot be annualized reliably
+_SALARY_PERIODS = (
+    (re.compile(_SALARY_PER + r"(?:month|mon|mo)\b|\bmonthly\b|\bp\.\s?m\b|\bpm\b", re.IGNORECASE), 12.0),
+    (re.compile(_SALARY_PER + r"(?:week|wk)\b|\bweekly\b", re.IGNORECASE), 52.0),
+    (re.compile(_SALARY_PER + r"(?:day|hour|hr)\b|\b(?:daily|hourly)\b", re.IGNORECASE), None),
+)
+
+
+def salary_period_multiplier(text: str) -> Optional[float]:
+    """Factor that turns an amount quoted per month or week into a yearly one (1.0 when yearly or unstated)."""
+    for pattern, multiplier in _SALARY_PERIODS:
+        if pattern.search(text):
+            return multiplier
+    return 1.0
+
+
+def parse_salary(text: Optional[str]) -> Tuple[float, float]:
+    """Parse a free-text salary into (min, max) yearly amounts; NaN when there is no number.
+
+    Handles plain numbers with separators, ranges ("5 - 8 LPA") and k/LPA/lakh/crore
+    units. A unit on the upper bound of a range also applies to the lower bound.
+    Monthly and weekly amounts ("Rs 25000 per month", "30k/month") are
+    annualized; daily and hourly rates are left out (NaN) because the
+    number of paid days is unknown. Amounts without a period are yearly.
+    """
+    if not text:
+        return float("nan"), float("nan")
+    text = str(text)
+    period = salary_period_multiplier(text)
+    if period is None:
+        return float("nan"), float("nan")
+    amounts = []
+    units = []
+    for number, unit in _SALARY_NUMBER_RE.findall(text):
+        amounts.append(float(number.replace(",", "")))
+        units.append(_SALARY_UNITS.get(unit.lower(), 1.0) if unit else None)
+    if not amounts:
+        return float("nan"), float("nan")
+    last_unit = next((unit for unit in reversed(units) if unit is not None), 1.0)
+    values = [amount * (unit if unit is not None else last_unit) * period for amount, unit in zip(amounts, units)]
+    return min(values[:2]), max(values[:2])
+
+
+def _clean_display_columns(jobs_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Precompute the cleaned title/city/state/salary values shown in results, plus job keys
+    and the numeric salary range used by filters."""
+    n_rows = len(jobs_df)
+
+    def text_column(name: str) -> pd.Series:
+        if name not in jobs_df.columns:
+            return pd.Series([""] * n_rows, index=jobs_df.index)
+        return jobs_df[name].fillna("").astype(str).str.strip()
+
+    city = text_column("City")
+    state = text_column("State")
+
+    # Handle cases where both city and state are "India" or "Remote"
+    remote = (city == state) & city.isin(["India", "Remote"])
+    city = city.mask(remote, "Remote")
+    state = state.mask(remote, "India")
+
+    def to_optional(series: pd.Series) -> np.ndarray:
+        values = series.to_numpy(dtype=object)
+        values[(series == "") | (series == "nan")] = None
+        return values
+
+    salary = to_optional(text_column("Salary"))
+    salary_range = np.array([parse_salary(value) for value in salary], dtype=np.float32).reshape(-1, 2)
+    return {
+        "job_title": text_column("Job Title").to_numpy(dtype=object),
+        "city": to_optional(city),
+        "state": to_optional(state),
+        "salary": salary,
+        "job_key": _job_keys(jobs_df),
+        "salary_min": salary_range[:, 0],
+        "salary_max": salary_range[:, 1],
+    }
+
+
+# -----------------------------
+# Approximate Nearest Neighbours
+# -----------------------------
+ANN_FILENAME = "ann_ivf.npz"
+JOB_INDEX_BACKEND = os.environ.get("JOB_INDEX_BACKEND", "exact").lower()
+JOB_INDEX_NPROBE = int(os.environ.get("JOB_INDEX_NPROBE", "8"))
+JOB_BATCH_CHUNK_SIZE = int(os.environ.get("JOB_BATCH_CHUNK_SIZE", "256"))
+# Jobs sampled to train the IVF clusters; all jobs are assigned afterwards
+JOB_IVF_TRAIN_SAMPLE = int(os.environ.get("JOB_IVF_TRAIN_SAMPLE", "200000"))
+# Filters matching at most this share of a segment score only the matching rows
+JOB_FILTER_CANDIDATE_RATIO = float(os.environ.get("JOB_FILTER_CANDIDATE_RATIO", "0.25"))
+
+
+def _prune_rows(matrix: sp.csr_matrix, k: int) -> sp.csr_matrix:
+    """Keep the k largest entries of each row, then L2-normalize the rows."""
+    matrix = sp.csr_matrix(matrix, dtype=np.float32)
+    matrix.sum_duplicates()
+    lengths = np.diff(matrix.indptr)
+    if lengths.max(initial=0) > k:
+        keep = np.ones(matrix.nnz, dtype=bool)
+        for row in np.flatnonzero(lengths > k):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            smallest = np.argpartition(matrix.data[start:end], end - start - k)[:end - start - k]
+            keep[start + smallest] = False
+        matrix.data[~keep] = 0.0
+        matrix.eliminate_zeros()
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def _closest_rows(matrix: sp.csr_matrix, centroids: sp.csr_matrix, chunk_size: int = 4096) -> np.ndarray:
+    """Index of the most similar centroid for every row, scoring chunk_size rows at a time."""
+    centroids_t = centroids.T.tocsr()
+    labels = np.empty(matrix.shape[0], dtype=np.int64)
+    for start in range(0, matrix.shape[0], chunk_size):
+        scores = (matrix[start:start + chunk_size] @ centroids_t).toarray()
+        labels[start:start + chunk_size] = scores.argmax(axis=1)
+    return labels
+
+
+class IVFIndex:
+    """Inverted-file ANN index over L2-normalized TF-IDF job vectors.
+
+    Jobs are clustered with spherical k-means; each cluster keeps the ids of
+    its jobs. A query is compared to the centroids, and only jobs in the
+    ``nprobe`` closest clusters are scored exactly. Raising ``nprobe``
+    trades latency for recall; ``nprobe >= n_lists`` is exact search.
+    Centroids are pruned to their heaviest terms so they stay sparse.
+    """
+
+    def __init__(self, centroids: sp.csr_matrix, list_offsets: np.ndarray, list_ids: np.ndarray):
+        self.centroids = centroids
+        self._centroids_t = centroids.T.tocsr()
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    @property
+    def n_jobs(self) -> int:
+        return self.list_ids.shape[0]
+
+    @classmethod
+    def build(cls, job_matrix: sp.csr_matrix, n_lists: Optional[int] = None,
+              terms_per_centroid: int = 256, seed: int = 0, n_iter: int = 10,
+              sample_size: Optional[int] = None) -> "IVFIndex":
+        """Cluster a normalized job matrix into inverted lists with sparse spherical k-means.
+
+        Centroids stay sparse: after every update each one keeps only its
+        terms_per_centroid heaviest terms. Memory is then the centroids
+        (n_lists x terms_per_centroid), one chunk of dense scores and a
+        sample of the matrix, not dense n_lists x vocabulary centers. Training
+        uses at most sample_size random jobs (JOB_IVF_TRAIN_SAMPLE), then
+        every job is assigned to its closest pruned centroid, the same
+        comparison queries make.
+        """
+        rng = np.random.default_rng(seed)
+        job_matrix = sp.csr_matrix(job_matrix, dtype=np.float32)
+        n_jobs = job_matrix.shape[0]
+        n_lists = n_lists or max(1, int(np.sqrt(n_jobs)))
+        n_lists = min(n_lists, n_jobs)
+        sample_size = sample_size or JOB_IVF_TRAIN_SAMPLE
+        sample = job_matrix
+        if n_jobs > sample_size:
+            sample = job_matrix[np.sort(rng.choice(n_jobs, sample_size, replace=False))]
+
+        centroids = _prune_rows(sample[rng.choice(sample.shape[0], n_lists, replace=False)], terms_per_centroid)
+        labels = None
+        for _ in range(n_iter):
+            new_labels = _closest_rows(sample, centroids)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            members = sp.csr_matrix(
+                (np.ones(labels.shape[0], dtype=np.float32), (labels, np.arange(labels.shape[0]))),
+                shape=(n_lists, sample.shape[0]),
+            )
+            sums = (members @ sample).tocsr()
+            # A cluster that lost all its members keeps its previous centroid
+            empty = (np.bincount(labels, minlength=n_lists) == 0).astype(np.float32)
+            if empty.any():
+                sums = (sums + sp.diags(empty) @ centroids).tocsr()
+            centroids = _prune_rows(sums, terms_per_centroid)
+
+        labels = _closest_rows(job_matrix, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_lists)
+        list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(centroids, list_offsets, order.astype(np.int64))
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            centroid_data=self.centroids.data,
+            centroid_indices=self.centroids.indices,
+            centroid_indptr=self.centroids.indptr,
+            centroid_shape=np.array(self.centroids.shape),
+            list_offsets=self.list_offsets,
+            list_ids=self.list_ids,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            centroids = sp.csr_matrix(
+                (data["centroid_data"], data["centroid_indices"], data["centroid_indptr"]),
+                shape=tuple(data["centroid_shape"]),
+            )
+            return cls(centroids, data["list_offsets"], data["list_ids"])
+
+    def candidates(self, query_vec: sp.csr_matrix, nprobe: int) -> np.ndarray:
+        """Ids of jobs in the nprobe clusters closest to the query."""
+        centroid_scores = (query_vec @ self._centroids_t).toarray().ravel()
+        probes = top_k_indices(centroid_scores, nprobe)
+        return np.concatenate([self.list_ids[self.list_offsets[p]:self.list_offsets[p + 1]] for p in probes])
+
+
+def build_ann_index(n_lists: Optional[int] = None) -> str:
+    """Build the IVF index for the current artifacts and save it next to vectorizer.pkl."""
+    vectorizer_path = resolve_artifact_path("vectorizer.pkl")
+    if not vectorizer_path:
+        raise FileNotFoundError("Build vectorizer.pkl and job_matrix.pkl before the ANN index")
+    index = JobIndex.load()
+    if len(index.segments) != 1 or index.segments[0].deleted is not None:
+        raise ValueError("The job index has several segments or removals. Run 'manage_job_index.py compact' first.")
+    ann = IVFIndex.build(index.job_matrix, n_lists=n_lists)
+    path = os.path.join(os.path.dirname(vectorizer_path), ANN_FILENAME)
+    ann.save(path)
+    return path
+
+
+def _load_ann_index(n_jobs: int) -> Optional[IVFIndex]:
+    """Load the IVF index when the ANN backend is enabled, else None (exact search)."""
+    if JOB_INDEX_BACKEND != "ivf":
+        return None
+    path = resolve_artifact_path(ANN_FILENAME)
+    if not path:
+        print(f"⚠️ JOB_INDEX_BACKEND=ivf but {ANN_FILENAME} not found, using exact search")
+        return None
+    ann = IVFIndex.load(path)
+    if ann.n_jobs != n_jobs:
+        print(f"⚠️ {ANN_FILENAME} covers {ann.n_jobs} jobs but the matrix has {n_jobs}, using exact search")
+        return None
+    return ann
+
+
+# -----------------------------
+# Query Caches
+# -----------------------------
+# Users resubmit the same resume with a different top_n, so query vectors and
+# ranked results are cached per index instance and generation, keyed by a
+# hash of the whitespace-normalized text. Ranked results are kept to
+# JOB_RESULT_CACHE_DEPTH (the API's top_n limit), so any smaller top_n is a
+# slice of the cached list. A reload changes the key, so stale entries are
+# never served and simply age out of the LRU.
+JOB_QUERY_CACHE_SIZE = int(os.environ.get("JOB_QUERY_CACHE_SIZE", "2048"))
+JOB_RESULT_CACHE_SIZE = int(os.environ.get("JOB_RESULT_CACHE_SIZE", "4096"))
+JOB_RESULT_CACHE_DEPTH = int(os.environ.get("JOB_RESULT_CACHE_DEPTH", "20"))
+
+query_vector_cache = LRUCache(maxsize=JOB_QUERY_CACHE_SIZE)
+ranked_result_cache = LRUCache(maxsize=JOB_RESULT_CACHE_SIZE)
+_index_ids = itertools.count(1)
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def query_cache_stats() -> Dict[str, Any]:
+    return {"query_vectors": query_vector_cache.stats(), "ranked_results": ranked_result_cache.stats()}
+
+
+# -----------------------------
+# Job Index
+# -----------------------------
+class JobFilters:
+    """Attribute constraints applied inside the index during search.
+
+    Cities and states match case-insensitively against the cleaned display
+    values. remote=True keeps only remote roles, remote=False excludes them.
+    min_salary keeps jobs whose range reaches it, max_salary keeps jobs whose
+    range starts at or below it; jobs without a parseable salary never match
+    a salary constraint.
+    """
+
+    def __init__(self, cities: Optional[Iterable[str]] = None, states: Optional[Iterable[str]] = None,
+                 remote: Optional[bool] = None, min_salary: Optional[float] = None,
+                 max_salary: Optional[float] = None):
+        self.cities = {normalize_attribute(city) for city in cities} if cities else None
+        self.states = {normalize_attribute(state) for state in states} if states else None
+        self.remote = remote
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+
+    def is_empty(self) -> bool:
+        return (not self.cities and not self.states and self.remote is None
+                and self.min_salary is None and self.max_salary is None)
+
+    def cache_key(self) -> Optional[Tuple[Any, ...]]:
+        if self.is_empty():
+            return None
+        return (tuple(sorted(self.cities or ())), tuple(sorted(self.states or ())),
+                self.remote, self.min_salary, self.max_salary)
+
+
+class IndexSegment:
+    """One immutable slice of the corpus: normalized rows, postings, columns and tombstones."""
+
+    def __init__(self, job_matrix: sp.csr_matrix, columns: Dict[str, Any],
+                 postings: Optional[sp.csr_matrix] = None, deleted: Optional[np.ndarray] = None,
+                 name: Optional[str] = None, attributes: Optional[AttributeIndex] = None):
+        self.name = name
+        self.job_matrix = job_matrix
+        self.postings = postings if postings is not None else job_matrix.T.tocsr()
+        self.columns = columns
+        self.deleted = deleted if deleted is not None and deleted.any() else None
+        self.live_mask = ~self.deleted if self.deleted is not None else None
+        self.attributes = attributes
+
+    @property
+    def n_rows(self) -> int:
+        return self.job_matrix.shape[0]
+
+    @property
+    def n_live(self) -> int:
+        return self.n_rows - (int(self.deleted.sum()) if self.deleted is not None else 0)
+
+    def live_rows(self) -> np.ndarray:
+        if self.deleted is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(self.live_mask)
+
+    def attribute(self, name: str) -> np.ndarray:
+        """Normalized city/state values, or the numeric salary range, as an array (cached)."""
+        cache = self.__dict__.setdefault("_attributes", {})
+        if name not in cache:
+            if name in NUMERIC_COLUMNS and name not in self.columns:
+                # Segments written before numeric columns existed
+                parsed = np.array([parse_salary(value) for value in self.columns["salary"].tolist()],
+                                  dtype=np.float32).reshape(-1, 2)
+                cache["salary_min"], cache["salary_max"] = parsed[:, 0], parsed[:, 1]
+            elif name in NUMERIC_COLUMNS:
+                cache[name] = np.asarray(self.columns[name], dtype=np.float32)
+            else:
+                column = self.columns[name]
+                values = column.tolist() if hasattr(column, "tolist") else list(column)
+                cache[name] = np.array([normalize_attribute(value) for value in values], dtype=object)
+        return cache[name]
+
+    def attribute_index(self) -> AttributeIndex:
+        """The segment's pre-filter index, built in memory for segments stored without one."""
+        if self.attributes is None:
+            self.attributes = AttributeIndex.build(
+                {name: self.attribute(name) for name in CATEGORICAL_ATTRIBUTES + NUMERIC_COLUMNS}
+            )
+        return self.attributes
+
+    def candidate_rows(self, filters: Optional[JobFilters]) -> Optional[np.ndarray]:
+        """Sorted live row ids matching the filters, or None when there are no filters.
+
+        Each constraint is a lookup in the AttributeIndex; the resulting row
+        lists are intersected smallest first, so the work depends on how many
+        rows match rather than on the segment size.
+        """
+        if filters is None or filters.is_empty():
+            return None
+        index = self.attribute_index()
+        row_sets = []
+        if filters.cities:
+            row_sets.append(index.rows_with("city", filters.cities))
+        if filters.states:
+            row_sets.append(index.rows_with("state", filters.states))
+        if filters.remote:
+            row_sets.append(index.rows_with("city", ["remote"]))
+        if filters.min_salary is not None:
+            row_sets.append(index.rows_between("salary_max", low=filters.min_salary))
+        if filters.max_salary is not None:
+            row_sets.append(index.rows_between("salary_min", high=filters.max_salary))
+
+        row_sets.sort(key=len)
+        rows = row_sets[0] if row_sets else np.arange(self.n_rows)
+        for other in row_sets[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if filters.remote is False:
+            rows = np.setdiff1d(rows, index.rows_with("city", ["remote"]), assume_unique=True)
+        if self.deleted is not None:
+            rows = rows[self.live_mask[rows]]
+        return rows.astype(np.int64)
+
+
+class JobIndex:
+    """Read-only snapshot of the TF-IDF job recommendation artifacts.
+
+    An index is never mutated after construction. Reloads build a fresh
+    instance and swap it in, so a request holding a reference keeps a
+    consistent view of vectorizer, matrix and jobs for its whole lifetime.
+
+    Job vectors are normalized once at load (per text field, see
+    MultiFieldVectorizer), so similarity is a plain sparse dot product. Scoring multiplies the query by the
+    term -> jobs transpose of the matrix and only touches postings of terms
+    present in the query. With an ``ann`` index attached, search only scores
+    the jobs in the closest IVF clusters.
+
+    Indexes loaded from the versioned ``job_index/`` format (index_store.py)
+    are memory-mapped and pre-normalized; they carry no DataFrame and use a
+    VocabularyEncoder in place of the pickled vectorizer. They may consist of
+    several segments (see ingest_jobs); job ids are global row numbers across
+    segments, and removed jobs are skipped via each segment's tombstones.
+    """
+
+    def __init__(self, vectorizer, job_matrix=None, jobs_df: Optional[pd.DataFrame] = None, generation: int = 1,
+                 ann: Optional[IVFIndex] = None, segments: Optional[List[IndexSegment]] = None):
+        self.vectorizer = vectorizer
+        if segments is None:
+            matrix = _prepare_documents(vectorizer, job_matrix)
+            segments = [IndexSegment(matrix, _clean_display_columns(jobs_df))]
+        self.segments = segments
+        self.jobs_df = jobs_df
+        self.generation = generation
+        # Distinguishes instances that share a generation number in cache keys
+        self._cache_id = next(_index_ids)
+        self._offsets = np.cumsum([0] + [segment.n_rows for segment in segments])
+        self.size = sum(segment.n_live for segment in segments)
+
+        # ANN ids are row numbers of a single segment without removals
+        if ann is not None and (len(segments) != 1 or segments[0].deleted is not None):
+            print("⚠️ ANN index ignored: job index has several segments or removals, compact and rebuild it")
+            ann = None
+        self.ann = ann
+
+    @classmethod
+    def load(cls, generation: int = 1) -> "JobIndex":
+        """Load the job index, preferring the memory-mapped format over pickles."""
+        root = resolve_artifact_path(JOB_INDEX_DIRNAME)
+        if root and read_current(root):
+            return cls.load_from_store(root, generation=generation)
+        return cls.load_from_pickles(generation=generation)
+
+    @classmethod
+    def load_from_store(cls, root: str, generation: int = 1) -> "JobIndex":
+        """Memory-map the current generation of the versioned index format."""
+        parts = load_generation(root)
+        segments = [
+            IndexSegment(seg["job_matrix"], seg["columns"], postings=seg["postings"],
+                         deleted=seg["deleted"], name=seg["name"], attributes=seg["attributes"])
+            for seg in parts["segments"]
+        ]
+        n_rows = sum(segment.n_rows for segment in segments)
+        return cls(parts["encoder"], generation=generation, ann=_load_ann_index(n_rows), segments=segments)
+
+    @classmethod
+    def load_from_pickles(cls, generation: int = 1) -> "JobIndex":
+        """Load joblib artifacts and the CSV, building the pickles from the CSV if needed."""
+        vectorizer_path = resolve_artifact_path("vectorizer.pkl")
+        job_matrix_path = resolve_artifact_path("job_matrix.pkl")
+        jobs_csv_path = resolve_artifact_path("jobs_processed.csv")
+
+        # If CSV exists but pickles are missing, build artifacts automatically
+        if jobs_csv_path and (not vectorizer_path or not job_matrix_path):
+            build_and_save_artifacts(jobs_csv_path)
+            # Re-resolve after building
+            vectorizer_path = resolve_artifact_path("vectorizer.pkl")
+            job_matrix_path = resolve_artifact_path("job_matrix.pkl")
+
+        if not vectorizer_path or not job_matrix_path or not jobs_csv_path:
+            missing = []
+            if not vectorizer_path:
+                missing.append("vectorizer.pkl")
+            if not job_matrix_path:
+                missing.append("job_matrix.pkl")
+            if not jobs_csv_path:
+                missing.append("jobs_processed.csv")
+            hint = (
+                "Missing artifacts: " + ", ".join(missing) +
+                ". Place them in 'backend/artifacts/' or set JOB_ARTIFACTS_DIR to the directory containing them."
+            )
+            raise FileNotFoundError(hint)
+
+        vectorizer = joblib.load(vectorizer_path)
+        job_matrix = joblib.load(job_matrix_path)
+        jobs_df = pd.read_csv(jobs_csv_path)
+        return cls(vectorizer, job_matrix, jobs_df, generation=generation, ann=_load_ann_index(job_matrix.shape[0]))
+
+    @property
+    def job_matrix(self) -> sp.csr_matrix:
+        """All rows (including removed ones) as one matrix."""
+        if len(self.segments) == 1:
+            return self.segments[0].job_matrix
+        return sp.vstack([segment.job_matrix for segment in self.segments]).tocsr()
+
+    def job_titles(self) -> List[str]:
+        """Titles of all live jobs."""
+        titles: List[str] = []
+        for segment in self.segments:
+            column = segment.columns["job_title"]
+            titles.extend(column[i] for i in segment.live_rows().tolist())
+        return titles
+
+    def transform(self, texts: List[str]) -> sp.csr_matrix:
+        """Vectorize query texts into normalized TF-IDF query rows, reusing cached vectors."""
+        keys = [(self.generation, self._cache_id, text_digest(text)) for text in texts]
+        rows = [query_vector_cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            fresh = _prepare_queries(self.vectorizer, [texts[i] for i in missing]).tocsr()
+            for position, i in enumerate(missing):
+                rows[i] = fresh[position]
+                query_vector_cache.put(keys[i], rows[i])
+        return rows[0] if len(rows) == 1 else sp.vstack(rows, format="csr")
+
+    def _plans(self, filters: Optional[JobFilters]) -> List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]:
+        """Per segment (candidate rows, allowed mask) describing which rows may be returned.
+
+        With filters, a segment whose candidates are at most
+        JOB_FILTER_CANDIDATE_RATIO of its rows is scored on those rows only;
+        less selective filters score through the postings and mask the result.
+        Without filters only tombstones are masked.
+        """
+        plans = []
+        for segment in self.segments:
+            rows = segment.candidate_rows(filters)
+            if rows is None:
+                plans.append((None, segment.live_mask))
+            elif len(rows) <= JOB_FILTER_CANDIDATE_RATIO * segment.n_rows:
+                plans.append((rows, None))
+            else:
+                mask = np.zeros(segment.n_rows, dtype=bool)
+                mask[rows] = True
+                plans.append((None, mask))
+        return plans
+
+    def _count_allowed(self, plans: List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]) -> int:
+        total = 0
+        for segment, (rows, mask) in zip(self.segments, plans):
+            if rows is not None:
+                total += len(rows)
+            else:
+                total += segment.n_rows if mask is None else int(mask.sum())
+        return total
+
+    def search(self, query_vec: sp.csr_matrix, top_n: int, nprobe: Optional[int] = None,
+               filters: Optional[JobFilters] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-n cosine search for a single normalized query row.
+
+        Uses the ANN index when one is attached, probing ``nprobe`` clusters
+        (default JOB_INDEX_NPROBE). Falls back to exact search when there is
+        no ANN index, when nprobe covers every cluster, or when the probed
+        clusters hold too few matching jobs to fill top_n. Filters select
+        candidate rows before scoring (see _plans).
+        """
+        plans = self._plans(filters)
+        if self.ann is not None:
+            nprobe = nprobe or JOB_INDEX_NPROBE
+            if nprobe < self.ann.n_lists:
+                candidates = self.ann.candidates(query_vec, nprobe)
+                rows, mask = plans[0]
+                if rows is not None:
+                    candidates = candidates[np.isin(candidates, rows, assume_unique=True)]
+                elif mask is not None:
+                    candidates = candidates[mask[candidates]]
+                scores = (self.job_matrix[candidates] @ query_vec.T).toarray().ravel()
+                if np.count_nonzero(scores) >= top_n:
+                    best = top_k_indices(scores, top_n)
+                    return candidates[best], scores[best]
+        indices, scores = self._score_rows(query_vec, plans)[0]
+        return self._select_top(indices, scores, top_n, plans)
+
+    def exact_search(self, query_vec: sp.csr_matrix, top_n: int,
+                     filters: Optional[JobFilters] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-n cosine search for a single normalized query row.
+
+        Returns (job indices, scores), best first. When fewer than top_n jobs
+        share a term with the query, the result is padded with zero-score jobs
+        (that also match the filters).
+        """
+        plans = self._plans(filters)
+        indices, scores = self._score_rows(query_vec, plans)[0]
+        return self._select_top(indices, scores, top_n, plans)
+
+    def _score_rows(self, query_matrix: sp.csr_matrix,
+                    plans: List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Exact scores per query row, as (global job ids, scores) of allowed jobs sharing a term."""
+        per_segment = []
+        for offset, segment, (rows, mask) in zip(self._offsets.tolist(), self.segments, plans):
+            if rows is not None:
+                # Only the candidate rows are multiplied; column j of the product is rows[j]
+                scores = (query_matrix @ segment.job_matrix[rows].T).tocsr()
+            else:
+                scores = (query_matrix @ segment.postings).tocsr()
+            per_segment.append((offset, rows, mask, scores))
+
+        results = []
+        for row in range(query_matrix.shape[0]):
+            id_parts, score_parts = [], []
+            for offset, rows, mask, scores in per_segment:
+                start, end = scores.indptr[row], scores.indptr[row + 1]
+                ids, values = scores.indices[start:end], scores.data[start:end]
+                if rows is not None:
+                    ids = rows[ids]
+                elif mask is not None:
+                    keep = mask[ids]
+                    ids, values = ids[keep], values[keep]
+                id_parts.append(ids.astype(np.int64) + offset)
+                score_parts.append(values)
+            results.append((np.concatenate(id_parts), np.concatenate(score_parts)))
+        return results
+
+    def _select_top(self, indices: np.ndarray, scores: np.ndarray, top_n: int,
+                    plans: List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Pick the top_n of one sparse score row, padding with zero-score allowed jobs."""
+        top_n = min(top_n, self._count_allowed(plans))
+        best = top_k_indices(scores, top_n)
+        indices, scores = indices[best], scores[best]
+        if len(indices) < top_n:
+            pad = self._padding_ids(top_n - len(indices), indices, plans)
+            indices = np.concatenate([indices, pad])
+            scores = np.concatenate([scores, np.zeros(len(pad), dtype=scores.dtype)])
+        return indices, scores
+
+    def _padding_ids(self, count: int, exclude: np.ndarray,
+                     plans: List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]) -> np.ndarray:
+        """The first `count` allowed job ids not in `exclude`."""
+        found: List[np.ndarray] = []
+        needed = count
+        for offset, segment, (rows, mask) in zip(self._offsets.tolist(), self.segments, plans):
+            if rows is not None:
+                local = rows
+            elif mask is not None:
+                local = np.flatnonzero(mask)
+            else:
+                local = np.arange(min(segment.n_rows, needed + len(exclude)))
+            ids = np.setdiff1d(local + offset, exclude)[:needed]
+            found.append(ids)
+            needed -= len(ids)
+            if needed <= 0:
+                break
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _locate(self, idx: int) -> Tuple[IndexSegment, int]:
+        if len(self.segments) == 1:
+            return self.segments[0], idx
+        segment_no = int(np.searchsorted(self._offsets, idx, side="right")) - 1
+        return self.segments[segment_no], idx - int(self._offsets[segment_no])
+
+    def build_matches(self, indices: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        """Turn job indices and scores into result dicts from the precomputed columns."""
+        matches = []
+        for idx, score in zip(indices.tolist(), scores.tolist()):
+            segment, row = self._locate(idx)
+            columns = segment.columns
+            matches.append({
+                "job_title": columns["job_title"][row],
+                "city": columns["city"][row],
+                "state": columns["state"][row],
+                "salary": columns["salary"][row],
+                "match_score": float(score),
+            })
+        return matches
+
+    def recommend(self, text: str, top_n: int = 5, filters: Optional[JobFilters] = None) -> List[Dict[str, Any]]:
+        """Return the top_n jobs (matching the filters) by similarity to the candidate text."""
+        return self.recommend_many([text], top_n, filters=filters)[0]
+
+    def recommend_many(self, texts: List[str], top_n: int = 5,
+                       filters: Optional[JobFilters] = None) -> List[List[Dict[str, Any]]]:
+        """Top_n matches for each text, scored together in one sparse product.
+
+        Texts with a cached ranking for these filters are answered from the
+        cache. The rest are transformed into one query matrix and multiplied
+        by the postings once per segment. Memory grows with len(texts), so
+        callers should chunk large batches (see iter_recommend_batch).
+        """
+        depth = max(top_n, JOB_RESULT_CACHE_DEPTH)
+        filters_key = filters.cache_key() if filters is not None else None
+        keys = [(self.generation, self._cache_id, text_digest(text), filters_key) for text in texts]
+        ranked = [ranked_result_cache.get(key) for key in keys]
+        missing = [i for i, cached in enumerate(ranked) if cached is None or cached[0] < top_n]
+
+        if missing:
+            query_matrix = self.transform([texts[i] for i in missing])
+            if self.ann is not None:
+                fresh = [self.search(query_matrix[row], depth, filters=filters) for row in range(len(missing))]
+            else:
+                plans = self._plans(filters)
+                fresh = [
+                    self._select_top(indices, scores, depth, plans)
+                    for indices, scores in self._score_rows(query_matrix, plans)
+                ]
+            for i, (indices, scores) in zip(missing, fresh):
+                ranked[i] = (depth, indices, scores)
+                ranked_result_cache.put(keys[i], ranked[i])
+
+        return [self.build_matches(indices[:top_n], scores[:top_n]) for _, indices, scores in ranked]
+
+    def iter_recommend_batch(self, texts: List[str], top_n: int = 5, chunk_size: int = JOB_BATCH_CHUNK_SIZE,
+                             filters: Optional[JobFilters] = None) -> Iterator[List[List[Dict[str, Any]]]]:
+        """Yield recommend_many results chunk by chunk to cap peak memory."""
+        for start in range(0, len(texts), chunk_size):
+            yield self.recommend_many(texts[start:start + chunk_size], top_n, filters=filters)
+
+
+def export_job_index() -> str:
+    """Convert the pickle/CSV artifacts into a new memory-mapped index generation.
+
+    The generation is written next to vectorizer.pkl and published
+    atomically; running servers pick it up on their next (re)load.
+    """
+    index = JobIndex.load_from_pickles()
+    segment = index.segments[0]
+    vectorizer_path = resolve_artifact_path("vectorizer.pkl")
+    return write_generation(os.path.dirname(vectorizer_path), index.vectorizer, segment.job_matrix, segment.columns)
+
+
+# -----------------------------
+# Incremental Corpus Updates
+# -----------------------------
+# New postings are vectorized with the published (fixed) vocabulary and idf
+# and written as a new segment; expired postings are tombstoned by job_key.
+# Terms unseen at export time are ignored until the next full export. Once
+# the jobs added since the last refresh exceed JOB_INDEX_IDF_REFRESH_RATIO of
+# the corpus, the index is compacted into one segment with recomputed idf.
+JOB_INDEX_IDF_REFRESH_RATIO = float(os.environ.get("JOB_INDEX_IDF_REFRESH_RATIO", "0.25"))
+
+
+def _require_store() -> str:
+    root = resolve_artifact_path(JOB_INDEX_DIRNAME)
+    if not root or not read_current(root):
+        raise FileNotFoundError(
+            f"No published {JOB_INDEX_DIRNAME}/ generation. Run 'python manage_job_index.py export' first."
+        )
+    if read_manifest(root)["format_version"] < 2:
+        raise ValueError("Incremental updates need format 2. Re-run 'python manage_job_index.py export'.")
+    return root
+
+
+def _base_manifest(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    base = {key: manifest[key] for key in ("tokenizer", "vocab", "n_terms", "columns")}
+    base["numeric_columns"] = list(NUMERIC_COLUMNS)
+    return base
+
+
+def ingest_jobs(add_csv: Optional[str] = None, remove_keys: Optional[Iterable[str]] = None,
+                refresh_idf: bool = False) -> str:
+    """Append new postings and/or remove expired ones without refitting TF-IDF.
+
+    Args:
+        add_csv: CSV with the same columns as jobs_processed.csv
+        remove_keys: job_key values of postings to remove
+        refresh_idf: Force an idf refresh and compaction after the update
+
+    Returns:
+        str: Path of the published generation
+    """
+    root = _require_store()
+    parts = load_generation(root)
+    manifest = parts["manifest"]
+    segments_meta = [{"name": seg["name"], "n_jobs": seg["n_jobs"]} for seg in manifest["segments"]]
+    deleted = {seg["name"]: seg["deleted"] for seg in parts["segments"]}
+
+    if remove_keys:
+        keys = set(remove_keys)
+        for seg in parts["segments"]:
+            hits = np.fromiter((key in keys for key in seg["columns"]["job_key"].tolist()), dtype=bool)
+            previous = deleted[seg["name"]]
+            deleted[seg["name"]] = hits if previous is None else (hits | previous)
+
+    added = 0
+    if add_csv:
+        jobs_df = pd.read_csv(add_csv)
+        if "Job Title" not in jobs_df.columns:
+            raise ValueError(f"'{add_csv}' must contain a 'Job Title' column")
+        matrix = parts["encoder"].transform_documents(job_field_texts(jobs_df))
+        name = write_segment(root, matrix, _clean_display_columns(jobs_df))
+        segments_meta.append({"name": name, "n_jobs": len(jobs_df)})
+        added = len(jobs_df)
+
+    new_manifest = _base_manifest(manifest)
+    new_manifest["segments"] = segments_meta
+    new_manifest["docs_since_idf_refresh"] = manifest.get("docs_since_idf_refresh", 0) + added
+    path = publish_generation(root, new_manifest, deleted)
+
+    n_live = read_manifest(root)["n_jobs"]
+    if refresh_idf or new_manifest["docs_since_idf_refresh"] > JOB_INDEX_IDF_REFRESH_RATIO * max(n_live, 1):
+        path = compact_job_index(refresh_idf=True)
+    return path
+
+
+def compact_job_index(refresh_idf: bool = True) -> str:
+    """Merge all segments into one, dropping removed jobs and optionally recomputing idf.
+
+    Stored field blocks are weight * tf * idf / norm, so re-weighting each
+    column by new_idf / old_idf and re-normalizing each block yields the rows
+    a fresh fit on the same vocabulary would produce (honouring the stored
+    smooth_idf setting), without the original text. Indexes built without
+    use_idf have no idf to refresh.
+    """
+    root = _require_store()
+    parts = load_generation(root)
+    manifest = parts["manifest"]
+    encoder = parts["encoder"]
+
+    matrices, columns = [], {name: [] for name in manifest["columns"]}
+    numeric: Dict[str, List[np.ndarray]] = {name: [] for name in NUMERIC_COLUMNS}
+    for seg in parts["segments"]:
+        segment = IndexSegment(seg["job_matrix"], seg["columns"], postings=seg["postings"], deleted=seg["deleted"])
+        live = segment.live_rows()
+        matrices.append(seg["job_matrix"][live])
+        for name in columns:
+            column = seg["columns"][name]
+            columns[name].extend(column[i] for i in live.tolist())
+        for name in numeric:
+            numeric[name].append(segment.attribute(name)[live])
+    merged = sp.vstack(matrices).tocsr() if matrices else sp.csr_matrix((0, manifest["n_terms"]), dtype=np.float32)
+    for name, parts_of_column in numeric.items():
+        columns[name] = np.concatenate(parts_of_column) if parts_of_column else np.empty(0, dtype=np.float32)
+
+    new_manifest = _base_manifest(manifest)
+    if refresh_idf and merged.shape[0] and encoder.use_idf:
+        n_docs = merged.shape[0]
+        doc_freq = np.bincount(merged.indices, minlength=merged.shape[1])
+        if encoder.smooth_idf:
+            new_idf = (np.log((1 + n_docs) / (1 + doc_freq)) + 1.0).astype(np.float32)
+        else:
+            # Terms whose postings were all removed keep a finite weight
+            new_idf = (np.log(n_docs / np.maximum(doc_freq, 1)) + 1.0).astype(np.float32)
+        merged = encoder.normalize_documents(merged @ sp.diags(new_idf / np.asarray(encoder.idf)))
+        new_manifest["vocab"] = write_vocab(root, np.asarray(encoder.vocab), new_idf)
+
+    name = write_segment(root, merged.astype(np.float32), columns)
+    new_manifest["segments"] = [{"name": name, "n_jobs": int(merged.shape[0])}]
+    new_manifest["docs_since_idf_refresh"] = 0 if refresh_idf else manifest.get("docs_since_idf_refresh", 0)
+    return publish_generation(root, new_manifest)
+
+
+# -----------------------------
+# Process-wide Index Holder
+# -----------------------------
+_index_lock = threading.Lock()
+_current_index: Optional[JobIndex] = None
+
+
+def get_job_index() -> JobIndex:
+    """Return the shared job index, loading it on first use.
+
+    Callers should fetch the index once per request and use that reference
+    throughout, so a concurrent reload cannot mix two generations.
+    """
+    index = _current_index
+    if index is not None:
+        return index
+    with _index_lock:
+        if _current_index is None:
+            _swap_index(JobIndex.load())
+        return _current_index
+
+
+JOB_INDEX_WATCH_SECONDS = float(os.environ.get("JOB_INDEX_WATCH_SECONDS", "0"))
+
+# Files whose change means the index on disk has moved on. The CSV is not
+# among them: a new jobs_processed.csv only takes effect once it has been
+# turned into an index (manage_job_index.py build, or ingest/export when the
+# job_index/ store is in use), and that step rewrites the files watched here.
+_PICKLE_ARTIFACTS = ("vectorizer.pkl", "job_matrix.pkl")
+_STORE_ARTIFACTS = (os.path.join(JOB_INDEX_DIRNAME, "CURRENT"),)
+
+
+def _watched_artifacts() -> Tuple[str, ...]:
+    """Artifacts the next load would read: the store once one exists, else the pickles."""
+    root = resolve_artifact_path(JOB_INDEX_DIRNAME)
+    if root and read_current(root):
+        return _STORE_ARTIFACTS + (ANN_FILENAME,)
+    # CURRENT is watched too so the first export switches the server over to the store
+    return _PICKLE_ARTIFACTS + _STORE_ARTIFACTS + (ANN_FILENAME,)
+
+
+_reload_lock = threading.Lock()
+_reload_status: Dict[str, Any] = {
+    "state": "idle",
+    "trigger": None,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+    "generation": None,
+}
+
+
+def artifact_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) of every artifact the index is built from."""
+    signature = []
+    for filename in _watched_artifacts():
+        path = resolve_artifact_path(filename)
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+# Distinct titles tried when looking for a probe query
+VALIDATION_PROBE_CANDIDATES = 100
+
+
+def validate_job_index(index: JobIndex) -> None:
+    """Sanity-check a freshly loaded index before it is allowed to serve traffic.
+
+    Raises:
+        ValueError: If the index is empty, inconsistent, or cannot score a probe query
+    """
+    if index.size <= 0:
+        raise ValueError("Job index is empty")
+    for segment in index.segments:
+        n_columns = len(segment.columns["job_title"])
+        if n_columns != segment.n_rows:
+            raise ValueError(f"Job index has {segment.n_rows} rows but {n_columns} job titles")
+    titles = list(dict.fromkeys(title for title in index.job_titles() if title.strip()))
+    if not titles:
+        raise ValueError("Job index has no non-empty job titles")
+    # Titles made only of stop words or unknown tokens ("IT", "Other") have an
+    # empty query vector and score 0 against everything, so probe with the
+    # first title that has vocabulary terms, and skip the probe if none does.
+    candidates = titles[:VALIDATION_PROBE_CANDIDATES]
+    query_matrix = index.transform(candidates)
+    probe = next((title for title, nnz in zip(candidates, np.diff(query_matrix.indptr)) if nnz), None)
+    if probe is None:
+        print(f"⚠️ No job title among the first {len(candidates)} has indexed terms, skipping the probe query")
+        return
+    matches = index.recommend(probe, top_n=1)
+    if not matches or not np.isfinite(matches[0]["match_score"]) or matches[0]["match_score"] <= 0:
+        raise ValueError(f"Probe query {probe!r} did not match its own job")
+
+
+def reload_job_index(trigger: str = "manual") -> JobIndex:
+    """Load a fresh index from disk, validate it, and atomically replace the shared one.
+
+    The old index keeps serving until the new one is fully loaded and
+    validated; requests already holding it finish on the old generation.
+    If loading or validation fails, the current index is left in place and
+    the error is raised. Concurrent reloads are serialized.
+
+    Args:
+        trigger: Who asked for the reload ("manual", "admin", "watcher"), for status reporting
+
+    Returns:
+        JobIndex: The index now being served
+    """
+    with _reload_lock:
+        _reload_status.update(state="running", trigger=trigger, started_at=time.time(),
+                              finished_at=None, error=None)
+        try:
+            with _index_lock:
+                generation = _current_index.generation + 1 if _current_index is not None else 1
+            new_index = JobIndex.load(generation=generation)
+            validate_job_index(new_index)
+        except Exception as e:
+            _reload_status.update(state="failed", finished_at=time.time(), error=str(e))
+            raise
+        with _index_lock:
+            _swap_index(new_index)
+        _reload_status.update(state="ok", finished_at=time.time(), generation=new_index.generation)
+        print(f"✅ Job index reloaded ({new_index.size} jobs, generation {new_index.generation}, via {trigger})")
+        return new_index
+
+
+def is_reload_running() -> bool:
+    return _reload_lock.locked()
+
+
+def job_index_status() -> Dict[str, Any]:
+    """Serving generation and the outcome of the last reload."""
+    index = _current_index
+    return {
+        "loaded": index is not None,
+        "generation": index.generation if index is not None else None,
+        "jobs": index.size if index is not None else None,
+        "segments": len(index.segments) if index is not None else None,
+        "backend": "ivf" if index is not None and index.ann is not None else "exact",
+        "watching": _watcher is not None and _watcher.is_alive(),
+        "last_reload": dict(_reload_status),
+    }
+
+
+class JobIndexWatcher(threading.Thread):
+    """Polls artifact mtimes and reloads the shared index when they change.
+
+    A change is acted on only once the signature has been stable for a full
+    interval, so a reload never starts while a CSV or pickle is still being
+    copied into place.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="job-index-watcher", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._loaded_signature = artifact_signature()
+
+    def run(self) -> None:
+        pending = None
+        while not self._stop_event.wait(self.interval):
+            signature = artifact_signature()
+            if signature == self._loaded_signature:
+                pending = None
+                continue
+            if signature != pending:
+                pending = signature
+                continue
+            try:
+                reload_job_index(trigger="watcher")
+            except Exception as e:
+                print(f"⚠️ Job index reload failed, keeping generation in service: {e}")
+            # Even after a failed reload, wait for the next change instead of retrying every tick
+            self._loaded_signature = artifact_signature()
+            pending = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+_watcher: Optional[JobIndexWatcher] = None
+
+
+def start_job_index_watcher(interval: float = JOB_INDEX_WATCH_SECONDS) -> Optional[JobIndexWatcher]:
+    """Start the mtime watcher when interval > 0 (JOB_INDEX_WATCH_SECONDS)."""
+    global _watcher
+    if interval <= 0 or (_watcher is not None and _watcher.is_alive()):
+        return _watcher
+    _watcher = JobIndexWatcher(interval)
+    _watcher.start()
+    print(f"👀 Watching job artifacts every {interval:g}s for changes")
+    return _watcher
+
+
+def stop_job_index_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+
+def _swap_index(index: JobIndex) -> None:
+    global _current_index
+    _current_index = index
+
+
+def warm_job_index() -> Optional[JobIndex]:
+    """Load the shared index at startup, logging instead of failing when artifacts are missing."""
+    try:
+        index = get_job_index()
+        print(f"✅ Job index loaded ({index.size} jobs, generation {index.generation})")
+        return index
+    except Exception as e:
+        print(f"⚠️ Job index not loaded at startup: {e}")
+        return None
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_MAX_RETRIES = 2
+
+
+# -----------------------------
+# Client Registry
+# -----------------------------
+ClientKey = Tuple[str, float, Optional[int]]
+
+
+def _build_chat_vertex(model: str, temperature: float, max_tokens: Optional[int]):
+    from langchain_google_vertexai import ChatVertexAI
+
+    kwargs = {"model": model, "temperature": temperature, "max_retries": DEFAULT_MAX_RETRIES}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    return ChatVertexAI(**kwargs)
+
+
+class LLMClientRegistry:
+    """Builds each (model, temperature, max_tokens) chat client once and hands it out again.
+
+    ChatVertexAI clients are safe to share between requests, and reusing
+    one also reuses its underlying gRPC channel instead of opening a new
+    connection per call.
+    """
+
+    def __init__(self, factory: Callable[[str, float, Optional[int]], Any] = _build_chat_vertex):
+        self._factory = factory
+        self._clients: Dict[ClientKey, Any] = {}
+        self._reuses: Dict[ClientKey, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+            max_tokens: Optional[int] = None):
+        key = (model, float(temperature), max_tokens)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._factory(model, float(temperature), max_tokens)
+                    self._clients[key] = client
+                    self._reuses[key] = 0
+                    return client
+        with self._lock:
+            self._reuses[key] = self._reuses.get(key, 0) + 1
+        return client
+
+    def stats(self) -> Dict[str, Any]:
+        """Report how many clients exist and how often each was reused."""
+        with self._lock:
+            per_client = [
+                {"model": key[0], "temperature": key[1], "max_tokens": key[2], "reuses": self._reuses.get(key, 0)}
+                for key in self._clients
+            ]
+        return {
+            "clients": len(per_client),
+            "total_reuses": sum(c["reuses"] for c in per_client),
+            "per_client": per_client,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._reuses.clear()
+
+
+client_registry = LLMClientRegistry()
+
+
+def get_chat_model(model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+                   max_tokens: Optional[int] = None):
+    """Return the shared chat client for this configuration."""
+    return client_registry.get(model, temperature, max_tokens)
+
+
+# -----------------------------
+# Async LLM Execution Layer
+# -----------------------------
+# Every Gemini call in the API goes through this module so that a slow
+# generation never blocks the event loop. Calls use the client's native
+# async API when it has one and fall back to a bounded thread pool.
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "256"))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "90"))
+LLM_EXECUTOR_WORKERS = int(os.environ.get("LLM_EXECUTOR_WORKERS", "32"))
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=LLM_EXECUTOR_WORKERS, thread_name_prefix="llm")
+    return _executor
+
+
+async def run_blocking(func, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """Run a blocking LLM call on the bounded executor under the concurrency cap."""
+    loop = asyncio.get_running_loop()
+    async with _get_semaphore():
+        future = loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout or LLM_TIMEOUT_SECONDS)
+
+
+async def ainvoke(llm, prompt: str, timeout: Optional[float] = None) -> Any:
+    """Invoke a LangChain chat model without blocking the event loop.
+
+    Args:
+        llm: ChatVertexAI (or any LangChain runnable)
+        prompt: Prompt text
+        timeout: Per-call timeout in seconds (defaults to LLM_TIMEOUT_SECONDS)
+
+    Returns:
+        The model's message object, same as ``llm.invoke``
+    """
+    if not hasattr(llm, "ainvoke"):
+        return await run_blocking(llm.invoke, prompt, timeout=timeout)
+    async with _get_semaphore():
+        return await asyncio.wait_for(llm.ainvoke(prompt), timeout or LLM_TIMEOUT_SECONDS)
+
+
+async def agenerate_content(model, prompt: str, timeout: Optional[float] = None, **kwargs) -> Any:
+    """Call ``GenerativeModel.generate_content`` without blocking the event loop."""
+    if not hasattr(model, "generate_content_async"):
+        return await run_blocking(model.generate_content, prompt, timeout=timeout, **kwargs)
+    async with _get_semaphore():
+        return await asyncio.wait_for(
+            model.generate_content_async(prompt, **kwargs), timeout or LLM_TIMEOUT_SECONDS
+        )
+
+
+async def _iterate_with_deadline(iterator, timeout: Optional[float]) -> AsyncIterator[Any]:
+    """Yield items from an async iterator, failing once the whole stream exceeds the timeout."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+    iterator = iterator.__aiter__()
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("LLM stream exceeded its timeout")
+        try:
+            item = await asyncio.wait_for(iterator.__anext__(), remaining)
+        except StopAsyncIteration:
+            return
+        yield item
+
+
+async def astream(llm, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """Stream text chunks from a LangChain chat model as they are generated.
+
+    The concurrency slot is held for the lifetime of the stream and the
+    timeout applies to the whole generation, not to each chunk.
+    """
+    async with _get_semaphore():
+        async for chunk in _iterate_with_deadline(llm.astream(prompt), timeout):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if text:
+                yield text
+
+
+async def agenerate_content_stream(model, prompt: str, timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+    """Stream text chunks from ``GenerativeModel.generate_content(stream=True)``.
+
+    Models without an async API are called once on the executor and their
+    full text is yielded as a single chunk.
+    """
+    if not hasattr(model, "generate_content_async"):
+        response = await run_blocking(model.generate_content, prompt, timeout=timeout, **kwargs)
+        if getattr(response, "text", None):
+            yield response.text
+        return
+    async with _get_semaphore():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+        responses = await asyncio.wait_for(model.generate_content_async(prompt, stream=True, **kwargs),
+                                           deadline - loop.time())
+        async for response in _iterate_with_deadline(responses, deadline - loop.time()):
+            # Safety-blocked or empty chunks raise on .text; skip them rather than end the stream
+            try:
+                text = response.text
+            except (ValueError, AttributeError):
+                continue
+            if text:
+                yield text
+
+
+def shutdown_executor() -> None:
+    """Release executor threads on application shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
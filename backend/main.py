@@ -1,51 +1,64 @@
 import vertexai
-import io
+import asyncio
 import os
 import json
 import re
-from typing import List, Optional, Dict , Any
+from typing import List, Optional, Dict , Any, AsyncIterator, Awaitable
 import os
-from pydantic import BaseModel, Field
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from pydantic import BaseModel, Field, ValidationError
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 import uvicorn
-import joblib
-import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
 import google.generativeai as genai
-from langchain_google_vertexai import ChatVertexAI
 from vertexai.generative_models import GenerativeModel
-import PyPDF2
+from pdf_extract import (
+    CV_MAX_UPLOAD_BYTES,
+    PDFExtractionError,
+    PDFTooLargeError,
+    aextract_pdf_text,
+    extract_pdf_text,
+    read_upload_limited,
+    shutdown_pool as shutdown_pdf_pool,
+)
+from job_index import (
+    get_job_index,
+    warm_job_index,
+    reload_job_index,
+    is_reload_running,
+    job_index_status,
+    start_job_index_watcher,
+    stop_job_index_watcher,
+    JobFilters,
+    query_cache_stats,
+)
+from review_jobs import CV_BATCH_MAX_UPLOAD_BYTES, ReviewJobQueue, expand_uploads, is_quota_error
+from session_store import SESSION_MAX_TURNS, Session, get_session_store
+from conversation_context import chat_context, interview_context
+from question_bank import get_question_bank_store
+from caches import advice_cache, content_digest, cv_review_cache, get_job_details_store
+from llm_client import ainvoke, astream, agenerate_content, agenerate_content_stream, shutdown_executor, get_chat_model, client_registry
 
 vertexai.init(project="careerai-476016", location="us-central1")
 
 # Configuration
-gemini_model  = ChatVertexAI(
-                model="gemini-2.5-flash",
-                temperature=0.7,
-                max_retries=2
-            )
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 
 # Configuration for job details generation
 try:
-    gemini_model  = ChatVertexAI(
-        model="gemini-2.5-flash",
-        temperature=0.7,
-        max_retries=2
-    )
+    gemini_model = get_chat_model()
     print("✅ Gemini 2.5-flash model initialized for job details")
 except Exception as e:
     print(f"❌ Error initializing Gemini model: {e}")
     gemini_model = None
 
-# Simple in-memory chat history storage
-chat_history: List[Dict[str, str]] = []
+# Shared secret for /api/admin/* endpoints (admin endpoints are disabled when unset)
+ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN", "")
 
-# In-memory storage for interview sessions
-interview_sessions: Dict[str, Dict] = {}
+# Max job cards generated in parallel by /api/job-details/batch
+JOB_DETAILS_BATCH_CONCURRENCY = int(os.environ.get("JOB_DETAILS_BATCH_CONCURRENCY", "8"))
 
 # Pydantic Models for Student Career Advisory
 class CareerAdvisoryRequest(BaseModel):
@@ -93,10 +106,24 @@ class APIResponse(BaseModel):
 # -----------------------------
 # Job Recommendation Models
 # -----------------------------
+class JobSearchFilters(BaseModel):
+    """Attribute filters applied inside the job index before top-n selection"""
+    cities: Optional[List[str]] = Field(None, description="Only jobs in these cities (case-insensitive)")
+    states: Optional[List[str]] = Field(None, description="Only jobs in these states (case-insensitive)")
+    remote: Optional[bool] = Field(None, description="true: only remote roles, false: exclude remote roles")
+    min_salary: Optional[float] = Field(None, ge=0, description="Only jobs whose salary range reaches this yearly amount")
+    max_salary: Optional[float] = Field(None, ge=0, description="Only jobs whose salary range starts at or below this amount")
+
+    def to_index_filters(self) -> JobFilters:
+        return JobFilters(cities=self.cities, states=self.states, remote=self.remote,
+                          min_salary=self.min_salary, max_salary=self.max_salary)
+
+
 class JobRecommendationRequest(BaseModel):
     """Request body for job recommendation API"""
     text: str = Field(..., description="Resume text or skills text")
     top_n: int = Field(5, ge=1, le=20, description="Number of jobs to return")
+    filters: Optional[JobSearchFilters] = Field(None, description="Optional location/salary filters")
 
 
 class JobMatch(BaseModel):
@@ -113,13 +140,37 @@ class JobRecommendationResponse(BaseModel):
     matches: List[JobMatch]
     error: Optional[str] = None
 
+
+class JobBatchRecommendationRequest(BaseModel):
+    """Request body for batch job recommendation API"""
+    texts: List[str] = Field(..., min_length=1, max_length=10000, description="Resume or skills texts, one per candidate")
+    top_n: int = Field(5, ge=1, le=20, description="Number of jobs to return per candidate")
+    stream: bool = Field(False, description="Stream results as NDJSON, one line per candidate")
+    filters: Optional[JobSearchFilters] = Field(None, description="Optional location/salary filters, shared by all texts")
+
+
+class CandidateJobMatches(BaseModel):
+    index: int
+    matches: List[JobMatch]
+
+
+class JobBatchRecommendationResponse(BaseModel):
+    success: bool
+    message: str
+    results: List[CandidateJobMatches]
+    error: Optional[str] = None
+
 # Chat Models
 class ChatMessage(BaseModel):
     message: str
+    session_id: Optional[str] = Field(None, description="Chat session to continue; a new one is started when omitted or expired")
+    include_history: bool = Field(False, description="Also return the session's full history")
 
 class ChatResponse(BaseModel):
     response: str
-    history: List[Dict[str, str]]
+    session_id: str
+    turn: Dict[str, str]
+    history: Optional[List[Dict[str, str]]] = None
 
 # Job Details Models
 class JobTitleInput(BaseModel):
@@ -129,6 +180,17 @@ class JobDetailsResponse(BaseModel):
     job_description: str
     day_in_life: List[str]
 
+class JobDetailsBatchRequest(BaseModel):
+    job_titles: List[str] = Field(..., min_length=1, max_length=50, description="Job titles to generate cards for")
+
+class JobDetailsBatchItem(BaseModel):
+    job_title: str
+    job_description: str
+    day_in_life: List[str]
+
+class JobDetailsBatchResponse(BaseModel):
+    results: List[JobDetailsBatchItem]
+
 # Skill Gap Analysis Models
 class SkillAnalysisRequest(BaseModel):
     current_skills: str
@@ -159,13 +221,10 @@ class CareerAdvisoryService:
 
     def _setup_environment(self):
         """Setup environment variables"""
-        os.environ["GOOGLE_API_KEY"] = self.api_key
-        # Lazy holders for job reco artifacts
-        self._vectorizer = None
-        self._job_matrix = None
-        self._jobs_df = None
+        if self.api_key:
+            os.environ["GOOGLE_API_KEY"] = self.api_key
 
-    def get_student_career_advice(self, request: CareerAdvisoryRequest) -> CareerAdvisoryResponse:
+    async def get_student_career_advice(self, request: CareerAdvisoryRequest) -> CareerAdvisoryResponse:
         """
         Main service method to process student career advisory request
 
@@ -180,7 +239,7 @@ class CareerAdvisoryService:
             prompt = self._generate_student_career_prompt(request)
 
             # Execute LLM with the generated prompt
-            llm_response = self._execute_llm(prompt)
+            llm_response = await self._execute_llm(prompt, cache_kind="student", profile=request)
 
             return CareerAdvisoryResponse(
                 success=True,
@@ -196,7 +255,7 @@ class CareerAdvisoryService:
                 error=str(e)
             )
 
-    def get_professional_advice(self, request: ProfessionalAdvisoryRequest) -> CareerAdvisoryResponse:
+    async def get_professional_advice(self, request: ProfessionalAdvisoryRequest) -> CareerAdvisoryResponse:
         """
         Main service method to process professional career advisory request
 
@@ -211,7 +270,7 @@ class CareerAdvisoryService:
             prompt = self._generate_professional_prompt(request)
 
             # Execute LLM with the generated prompt
-            llm_response = self._execute_llm(prompt)
+            llm_response = await self._execute_llm(prompt, cache_kind="professional", profile=request)
 
             return CareerAdvisoryResponse(
                 success=True,
@@ -227,6 +286,14 @@ class CareerAdvisoryService:
                 error=str(e)
             )
 
+    def stream_student_career_advice(self, request: CareerAdvisoryRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Stream student career advice as chunk events followed by a final event"""
+        return self._stream_llm(self._generate_student_career_prompt(request), cache_kind="student", profile=request)
+
+    def stream_professional_advice(self, request: ProfessionalAdvisoryRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Stream professional career advice as chunk events followed by a final event"""
+        return self._stream_llm(self._generate_professional_prompt(request), cache_kind="professional", profile=request)
+
     def _generate_student_career_prompt(self, request: CareerAdvisoryRequest) -> str:
         """
         Generate a comprehensive prompt for the LLM based on student user parameters
@@ -389,28 +456,36 @@ Please provide detailed professional career advice covering:
 
         return prompt
 
-    def _execute_llm(self, prompt: str) -> str:
+    async def _execute_llm(self, prompt: str, cache_kind: Optional[str] = None,
+                           profile: Optional[BaseModel] = None) -> str:
         """
         Execute the LLM with the generated prompt using Google Gemini
 
         Args:
             prompt: The generated prompt for the LLM
+            cache_kind: Response cache namespace ("student"/"professional"); None disables caching
+            profile: Request the prompt was built from, used as the cache key
 
         Returns:
             str: Response from the LLM
         """
+        if cache_kind and profile is not None:
+            cached = advice_cache.get(cache_kind, profile)
+            if cached is not None:
+                return cached
+
         try:
-            # Initialize the LLM with proper error handling and timeout
-            llm = ChatVertexAI(
-                model="gemini-2.5-flash",
-                temperature=0.7,
-                max_tokens=5000,
-                max_retries=2
-            )
+            # Shared client, built once per configuration
+            llm = get_chat_model(max_tokens=5000)
 
             # Invoke the LLM with the prompt
-            response = llm.invoke(prompt)
-            return response.content.strip()
+            response = await ainvoke(llm, prompt)
+            advice = response.content.strip()
+
+            # Only real generations are cached, never the fallbacks below
+            if cache_kind and profile is not None and advice:
+                advice_cache.put(cache_kind, profile, advice)
+            return advice
 
         except Exception as e:
             # Log error and return mock response for testing
@@ -421,142 +496,78 @@ Please provide detailed professional career advice covering:
                 return self._generate_quota_exceeded_response()
             return self._generate_mock_response()
 
+    async def _stream_llm(self, prompt: str, cache_kind: Optional[str] = None,
+                          profile: Optional[BaseModel] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the LLM response for a prompt
+
+        Yields "chunk" events as Gemini produces text. If generation fails
+        before any text was sent, the same quota/mock fallback as _execute_llm
+        is sent as a "fallback" event; if it fails part way through, an "error"
+        event with truncated=True is sent instead. The stream always ends with
+        a "done" event. Cached advice is sent as a single chunk.
+
+        Args:
+            prompt: The generated prompt for the LLM
+            cache_kind: Response cache namespace; None disables caching
+            profile: Request the prompt was built from, used as the cache key
+
+        Yields:
+            dict: Event with an "event" name and its payload
+        """
+        if cache_kind and profile is not None:
+            cached = advice_cache.get(cache_kind, profile)
+            if cached is not None:
+                yield {"event": "chunk", "text": cached}
+                yield {"event": "done", "cached": True}
+                return
+
+        parts: List[str] = []
+        try:
+            llm = get_chat_model(max_tokens=5000)
+            async for text in astream(llm, prompt):
+                parts.append(text)
+                yield {"event": "chunk", "text": text}
+            advice = "".join(parts).strip()
+            if cache_kind and profile is not None and advice:
+                advice_cache.put(cache_kind, profile, advice)
+        except Exception as e:
+            print(f"LLM Streaming Error: {str(e)}")
+            reason = "quota" if "quota" in str(e).lower() or "429" in str(e) else "error"
+            if parts:
+                # Part of the real answer is already on screen, so don't append canned advice to it
+                yield {"event": "error", "reason": reason, "truncated": True,
+                       "detail": "The response was cut short before it finished"}
+            elif reason == "quota":
+                print("API quota exceeded, streaming fallback response...")
+                yield {"event": "fallback", "reason": "quota", "text": self._generate_quota_exceeded_response()}
+            else:
+                yield {"event": "fallback", "reason": "error", "text": self._generate_mock_response()}
+        yield {"event": "done"}
+
     # -----------------------------
     # Job Recommendation Service
     # -----------------------------
-    def _resolve_artifact_path(self, filename: str) -> Optional[str]:
-        """Try common locations for artifacts and return first existing path.
-
-        Order of precedence:
-        - JOB_ARTIFACTS_DIR env var (if set)
-        - backend/artifacts/
-        - project_root/artifacts/ (parent of backend)
-        - backend/
-        - project_root/
-        """
-        backend_dir = os.path.dirname(__file__)
-        project_root = os.path.abspath(os.path.join(backend_dir, os.pardir))
-        env_dir = os.environ.get("JOB_ARTIFACTS_DIR")
-
-        candidates = []
-        if env_dir:
-            candidates.append(os.path.join(env_dir, filename))
-        candidates.extend([
-            os.path.join(backend_dir, "artifacts", filename),
-            os.path.join(project_root, "artifacts", filename),
-            os.path.join(backend_dir, filename),
-            os.path.join(project_root, filename),
-            os.path.join(os.getcwd(), "artifacts", filename),
-            os.path.join(os.getcwd(), filename),
-        ])
-        for path in candidates:
-            if os.path.exists(path):
-                return path
-        return None
+    def get_job_recommendations(self, text: str, top_n: int = 5,
+                                filters: Optional[JobFilters] = None) -> List[JobMatch]:
+        """Score candidate text against the shared job index and return top matches."""
+        index = get_job_index()
+        return [JobMatch(**match) for match in index.recommend(text, top_n, filters=filters)]
 
-    def _ensure_artifacts_loaded(self) -> None:
-        """Load TF-IDF artifacts and jobs DataFrame if not already loaded."""
-        if self._vectorizer is not None and self._job_matrix is not None and self._jobs_df is not None:
-            return
-
-        vectorizer_path = self._resolve_artifact_path("vectorizer.pkl")
-        job_matrix_path = self._resolve_artifact_path("job_matrix.pkl")
-        jobs_csv_path = self._resolve_artifact_path("jobs_processed.csv")
-
-        # If CSV exists but pickles are missing, build artifacts automatically
-        if jobs_csv_path and (not vectorizer_path or not job_matrix_path):
-            self._build_and_save_artifacts(jobs_csv_path)
-            # Re-resolve after building
-            vectorizer_path = self._resolve_artifact_path("vectorizer.pkl")
-            job_matrix_path = self._resolve_artifact_path("job_matrix.pkl")
-
-        if not vectorizer_path or not job_matrix_path or not jobs_csv_path:
-            missing = []
-            if not vectorizer_path:
-                missing.append("vectorizer.pkl")
-            if not job_matrix_path:
-                missing.append("job_matrix.pkl")
-            if not jobs_csv_path:
-                missing.append("jobs_processed.csv")
-            hint = (
-                "Missing artifacts: " + ", ".join(missing) +
-                ". Place them in 'backend/artifacts/' or set JOB_ARTIFACTS_DIR to the directory containing them."
-            )
-            raise FileNotFoundError(hint)
-
-        self._vectorizer = joblib.load(vectorizer_path)
-        self._job_matrix = joblib.load(job_matrix_path)
-        self._jobs_df = pd.read_csv(jobs_csv_path)
-
-    def _build_and_save_artifacts(self, jobs_csv_path: str) -> None:
-        """Build TF-IDF artifacts from jobs CSV and persist them under backend/artifacts."""
-        df = pd.read_csv(jobs_csv_path)
-        if "Job Title" not in df.columns:
-            raise FileNotFoundError("'jobs_processed.csv' must contain a 'Job Title' column")
-        texts = df["Job Title"].astype(str).fillna("")
-        vectorizer = TfidfVectorizer(stop_words="english")
-        vectorizer.fit(texts)
-        job_matrix = vectorizer.transform(texts)
-
-        backend_dir = os.path.dirname(__file__)
-        artifacts_dir = os.path.join(backend_dir, "artifacts")
-        os.makedirs(artifacts_dir, exist_ok=True)
-        joblib.dump(vectorizer, os.path.join(artifacts_dir, "vectorizer.pkl"))
-        joblib.dump(job_matrix, os.path.join(artifacts_dir, "job_matrix.pkl"))
-
-    def get_job_recommendations(self, text: str, top_n: int = 5) -> List[JobMatch]:
-        """Compute cosine similarity between candidate text and job matrix and return top matches."""
-        self._ensure_artifacts_loaded()
-        cand_vec = self._vectorizer.transform([text])
-        scores = cosine_similarity(cand_vec, self._job_matrix).flatten()
-        top_indices = scores.argsort()[-top_n:][::-1]
-        recs = self._jobs_df.iloc[top_indices][["Job Title", "City", "State", "Salary"]].copy()
-        recs = recs.fillna("")
-        matches: List[JobMatch] = []
-        for idx, score in zip(top_indices, scores[top_indices]):
-            row = self._jobs_df.iloc[idx]
-
-            # Clean up location data
-            city = str(row.get("City", "")).strip()
-            state = str(row.get("State", "")).strip()
-
-            # Handle cases where both city and state are "India" or similar
-            if city == "India" and state == "India":
-                city = "Remote"
-                state = "India"
-            elif city == state and city in ["India", "Remote"]:
-                city = "Remote"
-                state = "India"
-
-            # Clean up empty or None values
-            city = city if city and city != "nan" else None
-            state = state if state and state != "nan" else None
-
-            matches.append(
-                JobMatch(
-                    job_title=str(row.get("Job Title", "")),
-                    city=city,
-                    state=state,
-                    salary=str(row.get("Salary", "")) or None,
-                    match_score=float(score),
-                )
-            )
-        return matches
+    async def get_gemini_chat_response(self, user_message: str, context: str) -> str:
+        """Get response from Gemini AI with career guidance system prompt.
 
-    def get_gemini_chat_response(self, user_message: str, history: List[Dict[str, str]]) -> str:
-        """Get response from Gemini AI with career guidance system prompt."""
+        Args:
+            user_message: The user's new message
+            context: Conversation history rendered by chat_context (summary plus recent turns)
+        """
         try:
             # Try to use Gemini if API key is available
             if not self.api_key:
                 return "I'm a career guidance chatbot! I'm here to help with career advice, job search tips, skill development, and professional growth. However, I need a Gemini API key to provide personalized responses. For now, I can suggest exploring career resources online!"
 
-            # Create the model
-            llm = ChatVertexAI(
-                model="gemini-2.5-flash",
-                temperature=0.7,
-                max_tokens=5000,
-                max_retries=2
-            )
+            # Get the shared model
+            llm = get_chat_model(max_tokens=5000)
 
             # Build the conversation context
             system_prompt = """You are a helpful career guidance chatbot. Your role is to:
@@ -571,13 +582,13 @@ Be supportive, professional, and encouraging. Keep responses concise but helpful
 
             # Build conversation history for context
             conversation = system_prompt + "\n\nConversation history:\n"
-            for msg in history[-10:]:  # Keep last 10 messages for context
-                conversation += f"User: {msg['user']}\nBot: {msg['bot']}\n"
+            if context:
+                conversation += context + "\n"
 
             conversation += f"\nUser: {user_message}\nBot:"
 
             # Generate response
-            response = llm.invoke(conversation)
+            response = await ainvoke(llm, conversation)
             return response.content.strip()
 
         except Exception as e:
@@ -585,62 +596,69 @@ Be supportive, professional, and encouraging. Keep responses concise but helpful
             # Fallback response
             return f"I'm a career guidance chatbot here to help! I can assist with career advice, job search tips, skill development, and professional growth. How can I help you today? (Note: Gemini API error - using fallback response)"
 
-    def generate_job_description(self, job_title: str) -> str:
+    @staticmethod
+    def _job_description_fallback(job_title: str) -> str:
+        return f"Entry-level {job_title} role involving coding, testing, and learning new technologies under mentorship."
+
+    @staticmethod
+    def _day_in_life_fallback(job_title: str) -> List[str]:
+        # Create job-specific fallback content instead of generic
+        job_specific_fallbacks = {
+            "java": ["Morning code review", "Java development tasks", "Unit testing", "Documentation updates"],
+            "python": ["Data analysis work", "Python scripting", "Code optimization", "Team collaboration"],
+            "coding": ["Morning standup", "Feature development", "Code testing", "Bug fixes"],
+            "fresher": ["Learning new technologies", "Code review sessions", "Mentor meetings", "Project assignments"],
+            "developer": ["Code development", "Testing and debugging", "Team meetings", "Code reviews"],
+            "software": ["System design", "Code implementation", "Testing phases", "Deployment tasks"]
+        }
+
+        for keyword, points in job_specific_fallbacks.items():
+            if keyword.lower() in job_title.lower():
+                return points
+
+        return [
+            "Morning standup meetings",
+            "Code development and review",
+            "Team collaboration sessions",
+            "Problem-solving and debugging"
+        ]
+
+    async def generate_job_description(self, job_title: str) -> str:
         """Generate concise job description using Gemini directly"""
+        fallback = self._job_description_fallback(job_title)
         if not gemini_model:
-            return f"Entry-level {job_title} role involving coding, testing, and learning new technologies under mentorship."
+            return fallback
 
         try:
             prompt = f"Write a brief 1 line sentence job description for a {job_title} role. Focus on main responsibilities and keep it concise for a UI card. It should not exceed 25 words and should be meaningful."
-            response = gemini_model.invoke(prompt)
+            response = await ainvoke(gemini_model, prompt)
 
             text = response.text() if callable(response.text) else response.text
 
             if not text:
-                content = f"Entry-level {job_title} role involving coding, testing, and learning new technologies under mentorship."
+                content = fallback
             else:
                 content = text.strip()
 
             # Limit to approximately 150 characters for UI
             if len(content) > 150:
                 content = content[:147] + "..."
-            return content if content else f"Entry-level {job_title} role involving coding, testing, and learning new technologies under mentorship."
+            return content if content else fallback
 
         except Exception as e:
             print(f"❌ Error generating job description with Gemini: {e}")
-            return f"Entry-level {job_title} role involving coding, testing, and learning new technologies under mentorship."
+            return fallback
 
-    def generate_day_in_life_points(self, job_title: str) -> List[str]:
+    async def generate_day_in_life_points(self, job_title: str) -> List[str]:
         """Generate concise day in life points using Gemini directly"""
-        # Create job-specific fallback content instead of generic
-        job_specific_fallbacks = {
-            "java": ["Morning code review", "Java development tasks", "Unit testing", "Documentation updates"],
-            "python": ["Data analysis work", "Python scripting", "Code optimization", "Team collaboration"],
-            "coding": ["Morning standup", "Feature development", "Code testing", "Bug fixes"],
-            "fresher": ["Learning new technologies", "Code review sessions", "Mentor meetings", "Project assignments"],
-            "developer": ["Code development", "Testing and debugging", "Team meetings", "Code reviews"],
-            "software": ["System design", "Code implementation", "Testing phases", "Deployment tasks"]
-        }
-
-        # Find matching fallback based on job title
-        fallback_points = [
-            "Morning standup meetings",
-            "Code development and review",
-            "Team collaboration sessions",
-            "Problem-solving and debugging"
-        ]
-
-        for keyword, points in job_specific_fallbacks.items():
-            if keyword.lower() in job_title.lower():
-                fallback_points = points
-                break
+        fallback_points = self._day_in_life_fallback(job_title)
 
         if not gemini_model:
             return fallback_points
 
         try:
             prompt = f"List 4 short daily activities for a {job_title} role. Each activity should be 3-6 words maximum. Format as simple bullet points."
-            response = gemini_model.invoke(prompt)
+            response = await ainvoke(gemini_model, prompt)
 
             text = response.text() if callable(response.text) else response.text
             if not text:
@@ -679,6 +697,53 @@ Be supportive, professional, and encouraging. Keep responses concise but helpful
             print(f"❌ Error generating day in life with Gemini: {e}")
             return fallback_points
 
+    async def generate_job_details(self, job_title: str) -> JobDetailsResponse:
+        """
+        Return the job card for a title, from the persistent cache when possible
+
+        On a miss, the description and day-in-life points are generated
+        concurrently and stored unless either one fell back to canned text.
+        """
+        store = get_job_details_store()
+        cached = await run_in_threadpool(store.get, job_title)
+        if cached is not None:
+            return JobDetailsResponse(**cached)
+
+        job_description, day_in_life = await asyncio.gather(
+            self.generate_job_description(job_title),
+            self.generate_day_in_life_points(job_title),
+        )
+        if (job_description != self._job_description_fallback(job_title)
+                and day_in_life != self._day_in_life_fallback(job_title)):
+            await run_in_threadpool(store.put, job_title, job_description, day_in_life)
+        return JobDetailsResponse(job_description=job_description, day_in_life=day_in_life)
+
+    async def generate_job_details_batch(self, job_titles: List[str]) -> List[JobDetailsBatchItem]:
+        """
+        Generate job cards for many titles with bounded parallelism
+
+        Duplicate titles are generated once. Results keep the request order.
+
+        Args:
+            job_titles: Job titles to generate cards for
+
+        Returns:
+            List[JobDetailsBatchItem]: One card per requested title
+        """
+        semaphore = asyncio.Semaphore(JOB_DETAILS_BATCH_CONCURRENCY)
+
+        async def build(title: str) -> JobDetailsResponse:
+            async with semaphore:
+                return await self.generate_job_details(title)
+
+        unique_titles = list(dict.fromkeys(job_titles))
+        details = await asyncio.gather(*(build(title) for title in unique_titles))
+        by_title = dict(zip(unique_titles, details))
+        return [
+            JobDetailsBatchItem(job_title=title, **by_title[title].model_dump())
+            for title in job_titles
+        ]
+
     def _generate_quota_exceeded_response(self) -> str:
         """Generate a response when API quota is exceeded"""
         return """## CAREER PATH RECOMMENDATIONS
@@ -818,19 +883,14 @@ Note: This is a mock response. Please fix the API connection to get personalized
         """
 
 # Skill Gap Analysis Methods
-def analyze_skill_gap(current_skills: str, target_skills: str) -> Dict[str, Any]:
+async def analyze_skill_gap(current_skills: str, target_skills: str) -> Dict[str, Any]:
     """Analyze skill gap using Gemini AI"""
     try:
         current_skills = current_skills.replace("\\", "\\\\").replace("\n", "\\n")
         target_skills = target_skills.replace("\\", "\\\\").replace("\n", "\\n")
 
-        # Create a fresh model instance with proper configuration
-        llm = ChatVertexAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-            max_tokens=2000,
-            max_retries=2
-        )
+        # Shared model instance for this configuration
+        llm = get_chat_model(max_tokens=2000)
 
         prompt = f"""
 You are an expert career counselor and skill gap analyst. Analyze the gap between current skills and target requirements.
@@ -866,7 +926,7 @@ Do not include any commentary, explanation, or markdown formatting.
 If you are unsure, still produce syntactically valid JSON.
 """
 
-        response = llm.invoke(prompt)
+        response = await ainvoke(llm, prompt)
 
         if not response.content:
             return create_fallback_skill_analysis()
@@ -954,7 +1014,7 @@ def get_default_skill_value(field: str):
     }
     return defaults.get(field, "")
 
-def generate_skill_chat_response(message: str, context: Optional[Dict] = None) -> str:
+async def generate_skill_chat_response(message: str, context: Optional[Dict] = None) -> str:
     """Generate a chat response about skill analysis"""
     if not gemini_model:
         return "I'm here to help with your skill gap analysis! I can provide career advice and learning recommendations. How can I assist you today?"
@@ -988,7 +1048,7 @@ Guidelines:
 - Be realistic about timelines and expectations
 """
 
-        response = gemini_model.invoke(prompt)
+        response = await ainvoke(gemini_model, prompt)
         return response.content.strip() if response.content else "I'm here to help with your skill gap analysis! How can I assist you today?"
 
     except Exception as e:
@@ -1036,58 +1096,185 @@ def _get_interview_system_prompt(role: str, num_questions: int, difficulty: str)
         f"Be professional, supportive, and constructive throughout the interview."
     )
 
-def _generate_interviewer_response(user_message: str, session: Dict) -> str:
-    try:
-        # Use Vertex AI chat model for consistency with the rest of the API
-        llm = ChatVertexAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-            max_retries=2,
-        )
+INTERVIEW_FEEDBACK_SECTIONS = [
+    "Overall Performance Assessment",
+    "Key Strengths",
+    "Areas for Improvement",
+    "Answer-by-Answer Suggestions",
+    "Closing Remarks",
+]
+
+INTERVIEW_COMPLETION_KEYWORDS = [
+    "feedback",
+    "conclude",
+    "final thoughts",
+    "summary of your performance",
+    "overall assessment",
+    "closing remarks",
+]
+
+
+def _is_final_interview_turn(session: Session) -> bool:
+    """True when the answer being submitted is the last one, so the reply is the final feedback."""
+    # The opening turn asks question 1 and every later turn follows one answer
+    return session.total_turns >= session.meta["num_questions"]
+
+
+def _next_question(session: Session) -> Optional[str]:
+    """The question to ask once the pending one is answered, if already known (from the bank or a prefetch)."""
+    number = session.total_turns + 1
+    planned = session.meta.get("questions") or []
+    if len(planned) >= number:
+        return planned[number - 1]
+    prefetched = session.meta.get("prefetched") or {}
+    if prefetched.get("number") == number:
+        return prefetched.get("question")
+    return None
+
+
+def _opening_message(session: Session) -> Optional[str]:
+    """Templated greeting plus question 1 for sessions planned from a question bank (no Gemini call)."""
+    planned = session.meta.get("questions")
+    if not planned:
+        return None
+    meta = session.meta
+    return (
+        f"Hello, and welcome to your mock interview for the {meta['role']} position! I'll ask you "
+        f"{meta['num_questions']} questions at {meta['difficulty']} difficulty, one at a time. "
+        f"Take your time with each answer.\n\n"
+        f"Question 1 of {meta['num_questions']}: {planned[0]}"
+    )
 
-        system_prompt = session["system_prompt"]
 
-        # Build conversation with alternating roles
-        conversation = system_prompt + "\n\nConversation:\n"
-        for msg in session.get("chat_history", [])[-20:]:
-            conversation += f"Interviewer: {msg.get('interviewer', '')}\n"
-            conversation += f"Candidate: {msg.get('candidate', '')}\n"
-        conversation += f"Candidate: {user_message}\nInterviewer:"
+def _build_interviewer_prompt(user_message: str, session: Session, final: bool = False) -> str:
+    # Rebuilt from the session settings rather than stored with every session
+    meta = session.meta
+    system_prompt = _get_interview_system_prompt(meta["role"], meta["num_questions"], meta["difficulty"])
+
+    # Summary of earlier questions plus the recent exchanges that fit the token budget
+    conversation = system_prompt + "\n\nConversation:\n"
+    context = interview_context.render(session)
+    if context:
+        conversation += context + "\n"
+    if final:
+        # Numbered headings let the feedback be streamed section by section
+        headings = "\n".join(f"## {i}. {title}" for i, title in enumerate(INTERVIEW_FEEDBACK_SECTIONS, 1))
+        conversation += (
+            "(All questions have now been answered. After the candidate's last answer below, give the final "
+            f"feedback using exactly these markdown headings:\n{headings})\n"
+        )
+    elif user_message:
+        next_question = _next_question(session)
+        if next_question:
+            # The question is already prepared, so the model only writes the acknowledgement
+            conversation += (
+                "(After the candidate's answer below, acknowledge it in one or two sentences, with a brief "
+                f"follow-up remark if useful, then ask this as Question {session.total_turns + 1} of "
+                f"{meta['num_questions']}, word for word: {next_question})\n"
+            )
+    conversation += f"Candidate: {user_message}\nInterviewer:"
+    return conversation
 
-        response = llm.invoke(conversation)
+
+async def _generate_interviewer_response(user_message: str, session: Session) -> str:
+    try:
+        # Use Vertex AI chat model for consistency with the rest of the API
+        llm = get_chat_model()
+        final = bool(user_message) and _is_final_interview_turn(session)
+        response = await ainvoke(llm, _build_interviewer_prompt(user_message, session, final=final))
         text = response.content.strip() if hasattr(response, "content") else str(response).strip()
         return text or "Let's continue. Could you elaborate more on your previous answer?"
     except Exception as e:
         print(f"Interview response error: {e}")
         return "I apologize, I'm having trouble generating the next question right now. Please try again."
 
+
+async def _record_interview_turn(store, session: Session, user_message: str, bot_response: str) -> Dict[str, str]:
+    """Store the candidate's answer and the interviewer's reply; updates session in place and returns the new turn."""
+    if user_message and session.turns and session.turns[-1].get("candidate", "") == "":
+        session.turns[-1]["candidate"] = user_message
+        await run_in_threadpool(store.update_last_turn, "interview", session.id, {"candidate": user_message})
+
+    new_turn = {
+        "interviewer": bot_response,
+        "candidate": "",
+    }
+    session.turns.append(new_turn)
+    total_turns = await run_in_threadpool(store.append_turn, "interview", session.id, new_turn)
+    session.total_turns = total_turns or session.total_turns + 1
+    interview_context.schedule_summary(store, session)
+
+    is_complete = any(k in bot_response.lower() for k in INTERVIEW_COMPLETION_KEYWORDS)
+    if is_complete and not session.meta["is_complete"]:
+        session.meta["is_complete"] = True
+        await run_in_threadpool(store.update_meta, "interview", session.id, {"is_complete": True})
+    _schedule_question_prefetch(store, session)
+    return new_turn
+
+
+# Next-question generations running while candidates type, by session id
+_prefetch_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _schedule_question_prefetch(store, session: Session) -> None:
+    """Speculatively write the question after the pending one, so answering only waits for the acknowledgement."""
+    number = session.total_turns + 1
+    if (session.meta["is_complete"] or number > session.meta["num_questions"]
+            or _next_question(session) or session.id in _prefetch_tasks):
+        return
+    task = asyncio.ensure_future(_prefetch_question(store, session, number))
+    _prefetch_tasks[session.id] = task
+    task.add_done_callback(lambda _: _prefetch_tasks.pop(session.id, None))
+
+
+async def _prefetch_question(store, session: Session, number: int) -> None:
+    meta = session.meta
+    prompt = (
+        f"You are interviewing a candidate for a {meta['role']} position at {meta['difficulty']} difficulty.\n"
+        f"Interview so far:\n{interview_context.render(session)}\n\n"
+        f"Write question {number} of {meta['num_questions']}: a new question that has not been asked yet, "
+        f"keeping a mix of technical, behavioral and situational questions. Reply with the question text only."
+    )
+    try:
+        response = await ainvoke(get_chat_model(), prompt)
+        question = (response.content if hasattr(response, "content") else str(response)).strip()
+    except Exception as e:
+        # The answer is then handled with a full generation, as without prefetch
+        print(f"⚠️ Question prefetch failed for interview {session.id[:8]}: {e}")
+        return
+    if question:
+        await run_in_threadpool(
+            store.update_meta, "interview", session.id, {"prefetched": {"number": number, "question": question}}
+        )
+
+
 # Controller/Handler Functions (for FastAPI endpoints)
 def create_career_advisory_service():
     """Factory function to create career advisory service"""
     return CareerAdvisoryService()
 
-def handle_student_career_advice_request(request: CareerAdvisoryRequest) -> CareerAdvisoryResponse:
+async def handle_student_career_advice_request(request: CareerAdvisoryRequest) -> CareerAdvisoryResponse:
     """
     Handler function for student career advice endpoint
     This will be called by your FastAPI route
     """
     service = create_career_advisory_service()
-    return service.get_student_career_advice(request)
+    return await service.get_student_career_advice(request)
 
-def handle_professional_advice_request(request: ProfessionalAdvisoryRequest) -> CareerAdvisoryResponse:
+async def handle_professional_advice_request(request: ProfessionalAdvisoryRequest) -> CareerAdvisoryResponse:
     """
     Handler function for professional advice endpoint
     This will be called by your FastAPI route
     """
     service = create_career_advisory_service()
-    return service.get_professional_advice(request)
+    return await service.get_professional_advice(request)
 
 def health_check() -> APIResponse:
     """Health check endpoint handler"""
     return APIResponse(
         success=True,
         message="Career Advisory API is running",
-        data={"status": "healthy", "service": "career_advisory"}
+        data={"status": "healthy", "service": "career_advisory", "llm_clients": client_registry.stats()}
     )
 
 # FastAPI Application Setup
@@ -1129,7 +1316,7 @@ async def get_student_career_advice_endpoint(request: CareerAdvisoryRequest):
         CareerAdvisoryResponse: AI-generated career advice
     """
     try:
-        response = handle_student_career_advice_request(request)
+        response = await handle_student_career_advice_request(request)
 
         if not response.success:
             raise HTTPException(status_code=400, detail=response.error)
@@ -1151,7 +1338,7 @@ async def get_professional_advice_endpoint(request: ProfessionalAdvisoryRequest)
         CareerAdvisoryResponse: AI-generated professional career advice
     """
     try:
-        response = handle_professional_advice_request(request)
+        response = await handle_professional_advice_request(request)
 
         if not response.success:
             raise HTTPException(status_code=400, detail=response.error)
@@ -1161,6 +1348,48 @@ async def get_professional_advice_endpoint(request: ProfessionalAdvisoryRequest)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Wrap an event iterator as a text/event-stream response"""
+    async def body():
+        async for event in events:
+            name = event.pop("event")
+            yield _format_sse(name, event)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/student/career-advice/stream")
+async def stream_student_career_advice_endpoint(request: CareerAdvisoryRequest):
+    """
+    Stream career advice for a student profile as server-sent events
+
+    Events: "chunk" ({"text": ...}) while Gemini generates, an optional
+    "fallback" ({"reason": ..., "text": ...}) on failure, then "done".
+    """
+    service = create_career_advisory_service()
+    return _sse_response(service.stream_student_career_advice(request))
+
+
+@app.post("/api/professional/career-advice/stream")
+async def stream_professional_advice_endpoint(request: ProfessionalAdvisoryRequest):
+    """
+    Stream professional career advice as server-sent events
+
+    Uses the same event format as /api/student/career-advice/stream.
+    """
+    service = create_career_advisory_service()
+    return _sse_response(service.stream_professional_advice(request))
+
+
 @app.get("/api/student/career-advice/sample")
 async def get_student_sample_request():
     """Get a sample request format for student testing"""
@@ -1204,14 +1433,107 @@ async def get_professional_sample_request():
     return {"sample_request": sample}
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Report hit/miss counters and sizes of the response caches"""
+    return {
+        "career_advice": advice_cache.stats(),
+        "job_details": get_job_details_store().stats(),
+        "job_queries": query_cache_stats(),
+        "cv_reviews": cv_review_cache.stats(),
+        "cv_review_batches": _review_queue.stats(),
+        "sessions": await run_in_threadpool(get_session_store().stats),
+        "chat_context": chat_context.stats(),
+        "interview_context": interview_context.stats(),
+        "question_banks": get_question_bank_store().stats(),
+    }
+
+
+@app.get("/api/llm/clients")
+async def llm_client_stats():
+    """Report pooled Gemini clients and how often each has been reused"""
+    return client_registry.stats()
+
+
 # -----------------------------
 # Job Recommendation Endpoints
 # -----------------------------
+@app.on_event("startup")
+async def _warm_job_index():
+    # Load once per process so requests only pay for transform + top-k
+    await run_in_threadpool(warm_job_index)
+    # Optional mtime polling (JOB_INDEX_WATCH_SECONDS > 0) reloads when artifacts change
+    start_job_index_watcher()
+
+
+@app.on_event("shutdown")
+async def _stop_job_index_watcher():
+    stop_job_index_watcher()
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled. Set ADMIN_API_TOKEN to enable them.")
+    if token != ADMIN_API_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+# Keeps a reference so background reloads are not garbage-collected mid-run
+_reload_tasks: set = set()
+
+
+async def _background_reload():
+    try:
+        await run_in_threadpool(reload_job_index, "admin")
+    except Exception as e:
+        print(f"⚠️ Job index reload failed, keeping generation in service: {e}")
+
+
+@app.post("/api/admin/job-index/reload")
+async def reload_job_index_endpoint(wait: bool = False, x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Rebuild the job index from the current artifacts and swap it in
+
+    The new generation is loaded and validated off the event loop while the
+    old one keeps serving. By default this returns 202 immediately; poll
+    /api/admin/job-index/status for the outcome, or pass wait=true to block
+    until the swap (or failure).
+    """
+    _require_admin(x_admin_token)
+    if is_reload_running():
+        raise HTTPException(status_code=409, detail="A job index reload is already running")
+
+    if wait:
+        try:
+            await run_in_threadpool(reload_job_index, "admin")
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"New job index failed validation: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to reload job index: {str(e)}")
+        return job_index_status()
+
+    task = asyncio.create_task(_background_reload())
+    _reload_tasks.add(task)
+    task.add_done_callback(_reload_tasks.discard)
+    return JSONResponse(status_code=202, content={"status": "reload started", **job_index_status()})
+
+
+@app.get("/api/admin/job-index/status")
+async def job_index_status_endpoint(x_admin_token: Optional[str] = Header(default=None)):
+    """Serving generation, backend and the result of the last reload"""
+    _require_admin(x_admin_token)
+    return job_index_status()
+
+
 @app.post("/api/jobs/recommend", response_model=JobRecommendationResponse)
 async def recommend_jobs_endpoint(req: JobRecommendationRequest):
     try:
-        service = create_career_advisory_service()
-        matches = service.get_job_recommendations(req.text, req.top_n)
+        # Shared, preloaded index; scoring runs off the event loop
+        filters = req.filters.to_index_filters() if req.filters else None
+        results = await run_in_threadpool(lambda: get_job_index().recommend(req.text, req.top_n, filters=filters))
+        matches = [JobMatch(**match) for match in results]
         return JobRecommendationResponse(
             success=True,
             message="Job recommendations generated successfully",
@@ -1222,46 +1544,124 @@ async def recommend_jobs_endpoint(req: JobRecommendationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
 
+@app.post("/api/jobs/recommend/batch", response_model=JobBatchRecommendationResponse)
+async def recommend_jobs_batch_endpoint(req: JobBatchRecommendationRequest):
+    """
+    Recommend jobs for many candidates in one call
+
+    Texts are scored in chunks of JOB_BATCH_CHUNK_SIZE, one sparse matrix
+    product per chunk (JobIndex.iter_recommend_batch), each chunk off the
+    event loop. With stream=true, each candidate's result is sent as
+    an NDJSON line ({"index": ..., "matches": [...]}) as its chunk finishes;
+    if scoring fails mid-stream, a final {"error": ..., "completed": n} line
+    says how many candidates were sent before the failure.
+    """
+    try:
+        index = await run_in_threadpool(get_job_index)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = req.filters.to_index_filters() if req.filters else None
+
+    def chunk_results():
+        return iterate_in_threadpool(index.iter_recommend_batch(req.texts, req.top_n, filters=filters))
+
+    if req.stream:
+        async def ndjson():
+            offset = 0
+            try:
+                async for results in chunk_results():
+                    for matches in results:
+                        yield json.dumps({"index": offset, "matches": matches}) + "\n"
+                        offset += 1
+            except Exception as e:
+                # The 200 header is already sent, so report the failure in-band as the last line
+                print(f"Batch recommendation stream error: {e}")
+                yield json.dumps({"error": f"Failed to generate recommendations: {str(e)}", "completed": offset}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    try:
+        results: List[CandidateJobMatches] = []
+        async for chunk in chunk_results():
+            for matches in chunk:
+                results.append(CandidateJobMatches(index=len(results), matches=[JobMatch(**m) for m in matches]))
+        return JobBatchRecommendationResponse(
+            success=True,
+            message="Job recommendations generated successfully",
+            results=results,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
+
 # -----------------------------
 # Chat Endpoints
 # -----------------------------
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(chat_message: ChatMessage):
-    """Handle chat messages and return AI responses."""
+    """
+    Handle chat messages and return AI responses.
+
+    History is kept per session_id. Only the new turn is returned unless
+    include_history is set, so the payload does not grow with the conversation.
+    """
     try:
         user_message = chat_message.message.strip()
         if not user_message:
             raise HTTPException(status_code=400, detail="Message cannot be empty")
 
+        store = get_session_store()
+        session = await run_in_threadpool(store.load, "chat", chat_message.session_id)
+        if session is None:
+            session = await run_in_threadpool(store.create, "chat", session_id=chat_message.session_id)
+
         # Get AI response
         service = create_career_advisory_service()
-        bot_response = service.get_gemini_chat_response(user_message, chat_history)
-
-        # Add to chat history
-        chat_entry = {
-            "user": user_message,
-            "bot": bot_response
-        }
-        chat_history.append(chat_entry)
-
-        # Keep only last 50 messages to prevent memory issues
-        if len(chat_history) > 50:
-            chat_history.pop(0)
+        bot_response = await service.get_gemini_chat_response(user_message, chat_context.render(session))
+
+        # Add to the session's bounded history (oldest turns drop off automatically)
+        chat_entry = {"user": user_message, "bot": bot_response}
+        total_turns = await run_in_threadpool(store.append_turn, "chat", session.id, chat_entry)
+        if not total_turns:
+            # Expired while the reply was being generated; the user is clearly active again
+            session = await run_in_threadpool(store.create, "chat", session_id=session.id)
+            total_turns = await run_in_threadpool(store.append_turn, "chat", session.id, chat_entry)
+        session.turns.append(chat_entry)
+        session.total_turns = total_turns
+        chat_context.schedule_summary(store, session)
+
+        history = None
+        if chat_message.include_history:
+            history = (await run_in_threadpool(store.load, "chat", session.id)).turns
 
         return ChatResponse(
             response=bot_response,
-            history=chat_history
+            session_id=session.id,
+            turn=chat_entry,
+            history=history,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Chat endpoint error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.get("/chat/history/{session_id}")
+async def get_chat_history(session_id: str):
+    """Return the stored turns of a chat session."""
+    session = await run_in_threadpool(get_session_store().load, "chat", session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return {"session_id": session.id, "history": session.turns}
+
 @app.delete("/chat/history")
-async def clear_chat_history():
-    """Clear chat history."""
-    global chat_history
-    chat_history.clear()
+async def clear_chat_history(session_id: Optional[str] = None):
+    """Clear chat history for a session."""
+    if not session_id:
+        # History is kept per session, so there is nothing to clear without one
+        raise HTTPException(status_code=400, detail="session_id is required")
+    await run_in_threadpool(get_session_store().delete, "chat", session_id)
     return {"message": "Chat history cleared"}
 
 # -----------------------------
@@ -1278,16 +1678,32 @@ async def generate_job_details(job_input: JobTitleInput):
         if not job_title:
             raise HTTPException(status_code=400, detail="Job title cannot be empty")
 
-        # Generate job details using the service
+        # Description and day-in-life are generated concurrently
         service = create_career_advisory_service()
-        job_description = service.generate_job_description(job_title)
-        day_in_life = service.generate_day_in_life_points(job_title)
+        return await service.generate_job_details(job_title)
 
-        return JobDetailsResponse(
-            job_description=job_description,
-            day_in_life=day_in_life
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating job details: {str(e)}")
+
+@app.post("/api/job-details/batch", response_model=JobDetailsBatchResponse)
+async def generate_job_details_batch(batch: JobDetailsBatchRequest):
+    """
+    Generate job cards for several titles in one request
+    """
+    try:
+        job_titles = [title.strip() for title in batch.job_titles]
 
+        if any(not title for title in job_titles):
+            raise HTTPException(status_code=400, detail="Job titles cannot be empty")
+
+        service = create_career_advisory_service()
+        results = await service.generate_job_details_batch(job_titles)
+        return JobDetailsBatchResponse(results=results)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating job details: {str(e)}")
 
@@ -1307,7 +1723,7 @@ async def analyze_skills(request: SkillAnalysisRequest):
             raise HTTPException(status_code=400, detail="Both current skills and target skills are required")
 
         # Perform the skill gap analysis
-        analysis_result = analyze_skill_gap(
+        analysis_result = await analyze_skill_gap(
             current_skills=current_skills,
             target_skills=target_skills
         )
@@ -1330,7 +1746,7 @@ async def skill_chat(request: SkillChatRequest):
             raise HTTPException(status_code=400, detail="Message is required")
 
         # Generate response based on the analysis context and user message
-        response = generate_skill_chat_response(
+        response = await generate_skill_chat_response(
             message=message,
             context=context
         )
@@ -1343,40 +1759,42 @@ async def skill_chat(request: SkillChatRequest):
 # -----------------------------
 # Interview Endpoints
 # -----------------------------
+async def _create_interview_session(store, setup: InterviewSetup) -> Session:
+    if setup.num_questions < 1 or setup.num_questions > 20:
+        raise HTTPException(status_code=400, detail="Number of questions must be between 1 and 20")
+    if not setup.role or len(setup.role.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Role must be specified")
+    meta = {
+        "role": setup.role.strip(),
+        "num_questions": setup.num_questions,
+        "difficulty": setup.difficulty.strip().lower(),
+        "is_complete": False,
+    }
+    # Plan the whole interview from the question bank when one exists; otherwise build the bank for next time
+    bank = get_question_bank_store()
+    questions = await run_in_threadpool(bank.sample, meta["role"], meta["difficulty"], setup.num_questions)
+    if questions:
+        meta["questions"] = questions
+    else:
+        bank.ensure_in_background(meta["role"], meta["difficulty"])
+    return await run_in_threadpool(store.create, "interview", meta)
+
 @app.post("/api/interview/start")
 async def start_interview_endpoint(setup: InterviewSetup):
     try:
-        if setup.num_questions < 1 or setup.num_questions > 20:
-            raise HTTPException(status_code=400, detail="Number of questions must be between 1 and 20")
-        if not setup.role or len(setup.role.strip()) < 2:
-            raise HTTPException(status_code=400, detail="Role must be specified")
-
-        import uuid
-        session_id = str(uuid.uuid4())
-
-        system_prompt = _get_interview_system_prompt(setup.role, setup.num_questions, setup.difficulty)
-
-        interview_sessions[session_id] = {
-            "role": setup.role.strip(),
-            "num_questions": setup.num_questions,
-            "difficulty": setup.difficulty.strip().lower(),
-            "system_prompt": system_prompt,
-            "chat_history": [],
-            "is_complete": False,
-        }
+        store = get_session_store()
+        session = await _create_interview_session(store, setup)
 
-        initial_response = _generate_interviewer_response("", interview_sessions[session_id])
-        interview_sessions[session_id]["chat_history"].append({
-            "interviewer": initial_response,
-            "candidate": "",
-        })
+        # Banked sessions open with a templated greeting, without waiting for Gemini
+        initial_response = _opening_message(session) or await _generate_interviewer_response("", session)
+        await _record_interview_turn(store, session, "", initial_response)
 
         return {
-            "session_id": session_id,
+            "session_id": session.id,
             "message": initial_response,
-            "role": interview_sessions[session_id]["role"],
-            "num_questions": interview_sessions[session_id]["num_questions"],
-            "difficulty": interview_sessions[session_id]["difficulty"],
+            "role": session.meta["role"],
+            "num_questions": session.meta["num_questions"],
+            "difficulty": session.meta["difficulty"],
         }
     except HTTPException:
         raise
@@ -1388,44 +1806,25 @@ async def start_interview_endpoint(setup: InterviewSetup):
 async def interview_chat_endpoint(message: InterviewChatMessage):
     try:
         session_id = message.session_id
-        if session_id not in interview_sessions:
+        store = get_session_store()
+        # Any worker can continue the session when SESSION_STORE is shared
+        session = await run_in_threadpool(store.load, "interview", session_id)
+        if session is None:
             raise HTTPException(status_code=404, detail="Interview session not found")
 
-        session = interview_sessions[session_id]
         user_message = message.message.strip()
         if not user_message:
             raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-        bot_response = _generate_interviewer_response(user_message, session)
-
-        if session["chat_history"] and session["chat_history"][-1].get("candidate", "") == "":
-            session["chat_history"][-1]["candidate"] = user_message
+        bot_response = await _generate_interviewer_response(user_message, session)
 
-        session["chat_history"].append({
-            "interviewer": bot_response,
-            "candidate": "",
-        })
-
-        completion_keywords = [
-            "feedback",
-            "conclude",
-            "final thoughts",
-            "summary of your performance",
-            "overall assessment",
-            "closing remarks",
-        ]
-        is_complete = any(k in bot_response.lower() for k in completion_keywords)
-        if is_complete:
-            session["is_complete"] = True
-
-        if len(session["chat_history"]) > 50:
-            session["chat_history"].pop(0)
+        await _record_interview_turn(store, session, user_message, bot_response)
 
         return InterviewChatResponse(
             response=bot_response,
             session_id=session_id,
-            is_complete=session["is_complete"],
-            history=session["chat_history"],
+            is_complete=session.meta["is_complete"],
+            history=session.turns[-SESSION_MAX_TURNS:],
         )
     except HTTPException:
         raise
@@ -1435,29 +1834,209 @@ async def interview_chat_endpoint(message: InterviewChatMessage):
 
 @app.get("/api/interview/history/{session_id}")
 async def get_interview_history(session_id: str):
-    if session_id not in interview_sessions:
+    session = await run_in_threadpool(get_session_store().load, "interview", session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Interview session not found")
-    session = interview_sessions[session_id]
     return {
         "session_id": session_id,
-        "role": session["role"],
-        "num_questions": session["num_questions"],
-        "difficulty": session["difficulty"],
-        "chat_history": session["chat_history"],
-        "is_complete": session["is_complete"],
+        "role": session.meta["role"],
+        "num_questions": session.meta["num_questions"],
+        "difficulty": session.meta["difficulty"],
+        "chat_history": session.turns,
+        "is_complete": session.meta["is_complete"],
     }
 
 @app.delete("/api/interview/session/{session_id}")
 async def delete_interview_session(session_id: str):
-    if session_id in interview_sessions:
-        del interview_sessions[session_id]
+    if await run_in_threadpool(get_session_store().delete, "interview", session_id):
         return {"message": "Session deleted successfully"}
     raise HTTPException(status_code=404, detail="Session not found")
 
+async def _stream_interviewer_reply(websocket: WebSocket, session: Session, user_message: str) -> str:
+    """Send the interviewer's reply as "token" messages (final feedback as "section" messages) and return it."""
+    if not user_message:
+        opening = _opening_message(session)
+        if opening:
+            await websocket.send_json({"type": "token", "text": opening})
+            return opening
+    final = bool(user_message) and _is_final_interview_turn(session)
+    prompt = _build_interviewer_prompt(user_message, session, final=final)
+    splitter = ReviewSectionSplitter() if final else None
+    parts: List[str] = []
+    try:
+        async for text in astream(get_chat_model(), prompt):
+            parts.append(text)
+            await websocket.send_json({"type": "token", "text": text})
+            if splitter is not None:
+                for section in splitter.feed(text):
+                    await websocket.send_json({"type": "section", **section})
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        print(f"Interview stream error: {e}")
+        fallback = "I apologize, I'm having trouble generating the next question right now. Please try again."
+        await websocket.send_json({"type": "error", "reason": "quota" if is_quota_error(e) else "error", "detail": fallback})
+        return ""
+    if splitter is not None:
+        for section in splitter.close():
+            await websocket.send_json({"type": "section", **section})
+    return "".join(parts).strip() or "Let's continue. Could you elaborate more on your previous answer?"
+
+
+@app.websocket("/api/interview/ws")
+async def interview_websocket(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Mock interview over a WebSocket, streaming the interviewer as it is generated
+
+    Connect with ?session_id=... to resume a session, or send
+    {"type": "start", "role", "num_questions", "difficulty"} to begin one.
+    Then send {"type": "answer", "message": ...} for each answer.
+
+    Server messages: "session" (session settings, plus the pending question
+    when resuming), "token" ({"text"}) while the interviewer replies,
+    "section" ({"number", "title", "text"}) for each part of the final
+    feedback, "turn" ({"turn", "is_complete"}) with only the new turn once
+    a reply is stored, and "error" ({"detail"}). If the opening message
+    fails, the new session is discarded and "start" can be sent again.
+    Session state stays in the session store, so any worker can serve the
+    next connection.
+    """
+    await websocket.accept()
+    store = get_session_store()
+    session = await run_in_threadpool(store.load, "interview", session_id) if session_id else None
+    if session_id and session is None:
+        await websocket.send_json({"type": "error", "detail": "Interview session not found"})
+        await websocket.close(code=4404)
+        return
+
+    def session_message(pending_question: Optional[str] = None) -> Dict[str, Any]:
+        settings = {key: session.meta[key] for key in ("role", "num_questions", "difficulty", "is_complete")}
+        return {"type": "session", "session_id": session.id, **settings, "pending_question": pending_question}
+
+    try:
+        if session is not None:
+            pending = session.turns[-1]["interviewer"] if session.turns and not session.turns[-1].get("candidate") else None
+            await websocket.send_json(session_message(pending))
+
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            kind = message.get("type") if isinstance(message, dict) else None
+
+            if kind == "start":
+                try:
+                    setup = InterviewSetup(
+                        role=message.get("role", ""),
+                        num_questions=message.get("num_questions", 5),
+                        difficulty=message.get("difficulty", "medium"),
+                    )
+                    session = await _create_interview_session(store, setup)
+                except ValidationError as e:
+                    detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                    await websocket.send_json({"type": "error", "detail": detail})
+                    continue
+                except HTTPException as e:
+                    await websocket.send_json({"type": "error", "detail": e.detail})
+                    continue
+                await websocket.send_json(session_message())
+                user_message = ""
+            elif kind == "answer":
+                user_message = str(message.get("message", "")).strip()
+                if session is None:
+                    await websocket.send_json({"type": "error", "detail": "Start or resume an interview first"})
+                    continue
+                if not user_message:
+                    await websocket.send_json({"type": "error", "detail": "Message cannot be empty"})
+                    continue
+                # Reload so turns recorded through another connection or worker are included
+                session = await run_in_threadpool(store.load, "interview", session.id)
+                if session is None:
+                    await websocket.send_json({"type": "error", "detail": "Interview session expired"})
+                    await websocket.close(code=4404)
+                    return
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+                continue
+
+            try:
+                reply = await _stream_interviewer_reply(websocket, session, user_message)
+            except WebSocketDisconnect:
+                if kind == "start":
+                    await run_in_threadpool(store.delete, "interview", session.id)
+                raise
+            if not reply:
+                if kind == "start":
+                    # Don't keep a session whose opening question was never asked
+                    await run_in_threadpool(store.delete, "interview", session.id)
+                    session = None
+                continue
+            turn = await _record_interview_turn(store, session, user_message, reply)
+            await websocket.send_json({"type": "turn", "turn": turn, "is_complete": session.meta["is_complete"]})
+    except WebSocketDisconnect:
+        pass
+
 # ==================================
 # CV Reviewer (Resume Review) API
 # ==================================
 
+CV_REVIEW_SECTION_COUNT = 9
+
+# "## 3. Areas for Improvement" (also tolerates "#", "###" and "**" around the title)
+_REVIEW_HEADING = re.compile(r"^\s*#{1,3}\s*\**\s*(\d+)\.\s*(.*?)\s*$", re.MULTILINE)
+
+
+class ReviewSectionSplitter:
+    """Split streamed review markdown into its numbered "## N. Title" sections.
+
+    A section is complete once the next heading starts, so feed() returns
+    sections as soon as they are known to be whole and close() flushes the
+    last one. Text before the first heading is returned as section 0.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    @staticmethod
+    def _split(text: str, final: bool) -> tuple:
+        """Return (complete sections, text still waiting for more input)."""
+        headings = list(_REVIEW_HEADING.finditer(text))
+        if not final and not headings:
+            return [], text
+        sections: List[Dict[str, Any]] = []
+        preamble = text[:headings[0].start()] if headings else text
+        if preamble.strip():
+            sections.append({"number": 0, "title": "", "text": preamble.strip()})
+        # The last heading's section may still be growing unless the stream is finished
+        complete = headings if final else headings[:-1]
+        for i, match in enumerate(complete):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            sections.append({"number": int(match.group(1)), "title": match.group(2).strip(" *"),
+                             "text": text[match.start():end].strip()})
+        return sections, ("" if final else text[headings[-1].start():])
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._buffer += chunk
+        # Only whole lines can be matched as headings
+        cut = self._buffer.rfind("\n") + 1
+        if cut == 0:
+            return []
+        sections, pending = self._split(self._buffer[:cut], final=False)
+        self._buffer = pending + self._buffer[cut:]
+        return sections
+
+    def close(self) -> List[Dict[str, Any]]:
+        sections, self._buffer = self._split(self._buffer, final=True)
+        return sections
+
+
+def split_review_sections(review: str) -> List[Dict[str, Any]]:
+    """Split a complete review into its sections"""
+    return ReviewSectionSplitter._split(review, final=True)[0]
+
+
 class CVReviewer:
     def __init__(self):
         """Initialize the CV reviewer using Vertex AI (auto-auth)."""
@@ -1465,22 +2044,24 @@ class CVReviewer:
         self.model = GenerativeModel("gemini-2.5-flash")
 
     def extract_text_from_pdf(self, pdf_file) -> str:
-        """Extract text from uploaded PDF file."""
+        """Extract text from uploaded PDF file (blocking; prefer aextract_text_from_pdf)."""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text() or ""
-                text += page_text + "\n"
-            if not text.strip():
-                raise ValueError("No readable text found in PDF.")
-            return text.strip()
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
+            return extract_pdf_text(pdf_file.read())
+        except PDFExtractionError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def generate_cv_review(self, cv_text: str) -> dict:
-        """Generate comprehensive CV review using Gemini model."""
-        prompt = f"""
+    async def aextract_text_from_pdf(self, data: bytes) -> str:
+        """Extract text from PDF bytes in a PDF worker process, within page and size limits."""
+        try:
+            return await aextract_pdf_text(data)
+        except PDFTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except PDFExtractionError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    def _review_prompt(cv_text: str) -> str:
+        return f"""
 You are an expert HR professional and career coach. Review the following CV and provide structured feedback.
 
 ## 1. Overall Impression
@@ -1496,13 +2077,42 @@ You are an expert HR professional and career coach. Review the following CV and
 CV Content:
 {cv_text}
 """
+
+    async def generate_cv_review(self, cv_text: str) -> dict:
+        """Generate comprehensive CV review using Gemini model."""
         try:
-            response = self.model.generate_content(prompt)
+            response = await agenerate_content(self.model, self._review_prompt(cv_text))
             if not getattr(response, "text", None):
                 raise HTTPException(status_code=500, detail="Empty response from AI model.")
             return {"review": response.text, "status": "success"}
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error generating review: {str(e)}")
+
+    async def stream_cv_review(self, cv_text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the review as "section" events, one per "## N." heading
+
+        Yields:
+            dict: Section with "number", "title" and "text"; the full review
+            text is returned to the caller via the final "complete" event
+        """
+        splitter = ReviewSectionSplitter()
+        parts: List[str] = []
+        try:
+            async for text in agenerate_content_stream(self.model, self._review_prompt(cv_text)):
+                parts.append(text)
+                for section in splitter.feed(text):
+                    yield {"event": "section", **section}
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error generating review: {str(e)}")
+        for section in splitter.close():
+            yield {"event": "section", **section}
+        review = "".join(parts)
+        if not review.strip():
+            raise HTTPException(status_code=500, detail="Empty response from AI model.")
+        yield {"event": "complete", "review": review}
 
 
 _cv_reviewer: CVReviewer | None = None
@@ -1523,15 +2133,90 @@ def _get_sample_pdf_path() -> str | None:
     return None
 
 
+# Fallback sample (filename, bytes), read once at startup
+_sample_pdf: Optional[tuple] = None
+_sample_review_task: Optional[asyncio.Task] = None
+
+# Reviews being generated, by text digest, so concurrent identical uploads share one Gemini call
+_inflight_reviews: Dict[str, asyncio.Task] = {}
+
+CV_PRECOMPUTE_SAMPLE_REVIEW = os.environ.get("CV_PRECOMPUTE_SAMPLE_REVIEW", "true").lower() in ("1", "true", "yes")
+
+
+async def _extract_cv_text_cached(content: bytes) -> tuple:
+    """Return (cv_text, cached), skipping PDF parsing for bytes seen before."""
+    pdf_digest = content_digest(content)
+    cv_text = cv_review_cache.get_text(pdf_digest)
+    if cv_text is not None:
+        return cv_text, True
+    cv_text = await _cv_reviewer.aextract_text_from_pdf(content)
+    cv_review_cache.put_text(pdf_digest, cv_text)
+    return cv_text, False
+
+
+def _register_inflight_review(text_digest: str, generation: Awaitable[Dict[str, Any]]) -> asyncio.Task:
+    """Run a review generation as its own task that later requests for the same text can join."""
+    task = asyncio.ensure_future(generation)
+    _inflight_reviews[text_digest] = task
+    task.add_done_callback(lambda _: _inflight_reviews.pop(text_digest, None))
+    return task
+
+
+async def _review_cv_text_cached(cv_text: str) -> tuple:
+    """Return (review_result, cached) for the CV text, calling Gemini at most once per distinct text."""
+    text_digest = content_digest(cv_text)
+    review_result = cv_review_cache.get_review(text_digest)
+    if review_result is not None:
+        return review_result, True
+
+    task = _inflight_reviews.get(text_digest)
+    if task is None:
+        task = _register_inflight_review(text_digest, _cv_reviewer.generate_cv_review(cv_text))
+    # Shielded so one client disconnecting does not cancel the review for the others
+    review_result = await asyncio.shield(task)
+    cv_review_cache.put_review(text_digest, review_result)
+    return review_result, False
+
+
+async def _precompute_sample_review():
+    try:
+        cv_text, _ = await _extract_cv_text_cached(_sample_pdf[1])
+        await _review_cv_text_cached(cv_text)
+        print(f"✅ Sample CV review precomputed ({_sample_pdf[0]})")
+    except Exception as e:
+        print(f"⚠️ Sample CV review not precomputed: {e}")
+
+
 @app.on_event("startup")
 async def _init_cv_reviewer():
-    global _cv_reviewer
+    global _cv_reviewer, _sample_pdf, _sample_review_task
     try:
         _cv_reviewer = CVReviewer()
     except Exception as e:
         print(f"CV Reviewer init failed: {e}")
         _cv_reviewer = None
 
+    sample_path = _get_sample_pdf_path()
+    if sample_path:
+        with open(sample_path, "rb") as f:
+            _sample_pdf = (os.path.basename(sample_path), f.read())
+        # Review the fallback sample in the background so empty requests are served from cache
+        if _cv_reviewer is not None and CV_PRECOMPUTE_SAMPLE_REVIEW:
+            _sample_review_task = asyncio.create_task(_precompute_sample_review())
+
+
+async def _read_cv_upload(file: Optional[UploadFile]) -> tuple:
+    """Return (filename, pdf bytes) for the upload, or the fallback sample when there is none."""
+    if file is not None:
+        # Bounded read: oversized uploads are rejected without buffering them fully
+        try:
+            return file.filename, await read_upload_limited(file)
+        except PDFTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    if _sample_pdf is None:
+        raise HTTPException(status_code=400, detail="No file uploaded and fallback 'sample.pdf' not found.")
+    return _sample_pdf
+
 
 @app.post("/api/review-cv")
 async def review_cv(file: UploadFile | None = File(default=None)):
@@ -1539,35 +2224,181 @@ async def review_cv(file: UploadFile | None = File(default=None)):
     if _cv_reviewer is None:
         raise HTTPException(status_code=500, detail="Vertex AI model not initialized.")
 
-    pdf_file = None
-    filename = None
-
     try:
-        if file is not None:
-            filename = file.filename
-            content = await file.read()
-            pdf_file = io.BytesIO(content)
-        else:
-            sample_path = _get_sample_pdf_path()
-            if not sample_path:
-                raise HTTPException(status_code=400, detail="No file uploaded and fallback 'sample.pdf' not found.")
-            with open(sample_path, "rb") as f:
-                pdf_file = io.BytesIO(f.read())
-            filename = os.path.basename(sample_path)
-
-        cv_text = _cv_reviewer.extract_text_from_pdf(pdf_file)
-        review_result = _cv_reviewer.generate_cv_review(cv_text)
+        filename, content = await _read_cv_upload(file)
+
+        # Identical uploads (retries, refreshes, the sample) skip parsing and Gemini
+        cv_text, _ = await _extract_cv_text_cached(content)
+        review_result, cached = await _review_cv_text_cached(cv_text)
         return JSONResponse(content={
             "review": review_result["review"],
             "filename": filename,
             "status": "success",
             "text_length": len(cv_text),
+            "cached": cached,
         })
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+
+async def _stream_cv_review_events(filename: str, cv_text: str) -> AsyncIterator[Dict[str, Any]]:
+    text_digest = content_digest(cv_text)
+    review_result = cv_review_cache.get_review(text_digest)
+    cached = review_result is not None
+    yield {"event": "start", "filename": filename, "text_length": len(cv_text),
+           "expected_sections": CV_REVIEW_SECTION_COUNT, "cached": cached}
+
+    emitted = 0
+    review_length = 0
+    try:
+        if review_result is None and text_digest in _inflight_reviews:
+            # Another request is already generating this review; wait for it instead of calling Gemini twice
+            review_result = await asyncio.shield(_inflight_reviews[text_digest])
+        if review_result is not None:
+            events = _replay_review_sections(review_result["review"])
+        else:
+            sections: asyncio.Queue = asyncio.Queue()
+            task = _register_inflight_review(text_digest, _generate_streamed_review(cv_text, text_digest, sections))
+            events = _drain_streamed_review(task, sections)
+        async for event in events:
+            review_length += len(event["text"])
+            yield {**event, "index": emitted, "review_length": review_length}
+            emitted += 1
+    except Exception as e:
+        detail = str(getattr(e, "detail", "") or e)
+        print(f"CV review stream error: {detail}")
+        yield {"event": "error", "reason": "quota" if is_quota_error(e) else "error", "detail": detail}
+    yield {"event": "done", "sections": emitted, "review_length": review_length, "cached": cached}
+
+
+async def _generate_streamed_review(cv_text: str, text_digest: str, sections: asyncio.Queue) -> Dict[str, Any]:
+    """Stream a review from Gemini, putting each section event on sections (then None), and return the result.
+
+    Runs as a task in _inflight_reviews, so uploads of the same CV join it
+    instead of calling Gemini again, and it finishes (and is cached) even if
+    the client that started it disconnects.
+    """
+    try:
+        async for event in _cv_reviewer.stream_cv_review(cv_text):
+            if event["event"] == "complete":
+                review_result = {"review": event["review"], "status": "success"}
+                cv_review_cache.put_review(text_digest, review_result)
+                return review_result
+            sections.put_nowait(event)
+        raise HTTPException(status_code=500, detail="Review stream ended without a complete review.")
+    finally:
+        sections.put_nowait(None)
+
+
+async def _drain_streamed_review(task: asyncio.Task, sections: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+    """Section events of a generation started by this request, then its error (if any)"""
+    while True:
+        event = await sections.get()
+        if event is None:
+            break
+        yield event
+    await asyncio.shield(task)
+
+
+async def _replay_review_sections(review: str) -> AsyncIterator[Dict[str, Any]]:
+    """Section events for a review that is already complete (cached or generated by another request)"""
+    for section in split_review_sections(review):
+        yield {"event": "section", **section}
+
+
+@app.post("/api/review-cv/stream")
+async def stream_review_cv(file: UploadFile | None = File(default=None)):
+    """
+    Review a CV/Resume PDF and stream the review section by section as server-sent events
+
+    Events: "start" ({filename, text_length, expected_sections, cached}),
+    one "section" per "## N." heading as soon as Gemini finishes it
+    ({index, number, title, text, review_length}), an optional "error"
+    ({reason, detail}), then "done". Upload and PDF errors are returned as
+    normal HTTP errors before the stream opens.
+    """
+    if _cv_reviewer is None:
+        raise HTTPException(status_code=500, detail="Vertex AI model not initialized.")
+
+    filename, content = await _read_cv_upload(file)
+    cv_text, _ = await _extract_cv_text_cached(content)
+    return _sse_response(_stream_cv_review_events(filename, cv_text))
+
+
+# -----------------------------
+# Bulk CV Review Endpoints
+# -----------------------------
+# Batch items go through the same cached extract/review helpers as single
+# uploads, so duplicate CVs in a batch (or across batches) hit Gemini once.
+_review_queue = ReviewJobQueue(_extract_cv_text_cached, _review_cv_text_cached)
+
+
+@app.post("/api/review-cv/batch", status_code=202)
+async def review_cv_batch(files: List[UploadFile] = File(...)):
+    """
+    Queue a batch of CVs for review and return its id immediately
+
+    Accepts any mix of PDF files and zip archives of PDFs. Poll
+    GET /api/review-cv/batch/{batch_id} or stream its /stream endpoint for results.
+    """
+    if _cv_reviewer is None:
+        raise HTTPException(status_code=500, detail="Vertex AI model not initialized.")
+
+    try:
+        uploads = []
+        for upload in files:
+            is_zip = (upload.filename or "").lower().endswith(".zip")
+            max_bytes = CV_BATCH_MAX_UPLOAD_BYTES if is_zip else CV_MAX_UPLOAD_BYTES
+            uploads.append((upload.filename, await read_upload_limited(upload, max_bytes)))
+        pdfs = expand_uploads(uploads)
+    except PDFTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    batch = _review_queue.submit(pdfs)
+    print(f"📥 Queued CV review batch {batch.id[:8]} with {len(pdfs)} file(s)")
+    return batch.snapshot(include_results=False)
+
+
+@app.get("/api/review-cv/batch/{batch_id}")
+async def get_review_cv_batch(batch_id: str, include_results: bool = True):
+    """Progress of a review batch, with the reviews finished so far"""
+    batch = _review_queue.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Review batch not found or expired")
+    return batch.snapshot(include_results=include_results)
+
+
+@app.get("/api/review-cv/batch/{batch_id}/stream")
+async def stream_review_cv_batch(batch_id: str):
+    """
+    Stream a review batch as server-sent events
+
+    Events: "item" for each CV as it finishes (done or failed, including
+    ones finished before the stream was opened), then "done" with the counts.
+    """
+    batch = _review_queue.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Review batch not found or expired")
+
+    async def events():
+        async for item in batch.events():
+            yield {"event": "item", **item}
+        yield {"event": "done", "batch_id": batch.id, "counts": batch.counts()}
+
+    return _sse_response(events())
+
+
+@app.on_event("shutdown")
+async def _shutdown_llm_executor():
+    await _review_queue.shutdown()
+    shutdown_executor()
+    shutdown_pdf_pool()
+    get_session_store().close()
+
 if __name__ == "__main__":
     # For testing locally
     print("Starting AI Career Counsellor API server...")
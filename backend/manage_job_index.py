@@ -0,0 +1,58 @@
+"""Offline maintenance commands for the job recommendation index.
+
+Usage (from backend/):
+    python manage_job_index.py build
+    python manage_job_index.py export
+    python manage_job_index.py build-ann [--lists N]
+    python manage_job_index.py ingest [--add new_jobs.csv] [--remove expired_keys.txt] [--refresh-idf]
+    python manage_job_index.py compact [--keep-idf]
+"""
+import argparse
+
+from job_index import build_ann_index, compact_job_index, export_job_index, ingest_jobs, rebuild_pickles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Job index maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("build", help="Refit vectorizer.pkl and job_matrix.pkl from jobs_processed.csv")
+    commands.add_parser("export", help="Write the memory-mapped job_index/ format from the pickles and CSV")
+
+    ann = commands.add_parser("build-ann", help="Build the IVF ANN index next to vectorizer.pkl")
+    ann.add_argument("--lists", type=int, default=None, help="Number of clusters (default sqrt(jobs))")
+
+    ingest = commands.add_parser("ingest", help="Add and/or remove postings without refitting TF-IDF")
+    ingest.add_argument("--add", default=None, help="CSV of new postings (same columns as jobs_processed.csv)")
+    ingest.add_argument("--remove", default=None, help="Text file with one job_key per line to remove")
+    ingest.add_argument("--refresh-idf", action="store_true", help="Recompute idf and compact after the update")
+
+    compact = commands.add_parser("compact", help="Merge segments, drop removed jobs and recompute idf")
+    compact.add_argument("--keep-idf", action="store_true", help="Merge segments without recomputing idf")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        path = rebuild_pickles()
+        print(f"✅ TF-IDF pickles rebuilt in {path}")
+    elif args.command == "export":
+        path = export_job_index()
+        print(f"✅ Job index generation written to {path}")
+    elif args.command == "build-ann":
+        path = build_ann_index(n_lists=args.lists)
+        print(f"✅ ANN index written to {path} (enable with JOB_INDEX_BACKEND=ivf)")
+    elif args.command == "ingest":
+        if not args.add and not args.remove and not args.refresh_idf:
+            parser.error("ingest needs --add, --remove or --refresh-idf")
+        remove_keys = None
+        if args.remove:
+            with open(args.remove, encoding="utf-8") as f:
+                remove_keys = [line.strip() for line in f if line.strip()]
+        path = ingest_jobs(add_csv=args.add, remove_keys=remove_keys, refresh_idf=args.refresh_idf)
+        print(f"✅ Job index generation written to {path}")
+    elif args.command == "compact":
+        path = compact_job_index(refresh_idf=not args.keep_idf)
+        print(f"✅ Job index compacted into {path}")
+
+
+if __name__ == "__main__":
+    main()
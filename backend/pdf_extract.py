@@ -0,0 +1,194 @@
+import asyncio
+import io
+import os
+import socket
+import subprocess
+import sys
+from multiprocessing.connection import Connection
+from typing import List, Optional
+
+import PyPDF2
+
+
+# -----------------------------
+# Limits
+# -----------------------------
+CV_MAX_UPLOAD_BYTES = int(os.environ.get("CV_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CV_MAX_PAGES = int(os.environ.get("CV_MAX_PAGES", "20"))
+# A CV review prompt never needs more text than this; extraction stops once it has it
+CV_MAX_TEXT_CHARS = int(os.environ.get("CV_MAX_TEXT_CHARS", "40000"))
+CV_EXTRACT_WORKERS = int(os.environ.get("CV_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+CV_EXTRACT_TIMEOUT_SECONDS = float(os.environ.get("CV_EXTRACT_TIMEOUT_SECONDS", "30"))
+
+UPLOAD_READ_CHUNK = 1024 * 1024
+
+
+class PDFTooLargeError(ValueError):
+    """Upload exceeds CV_MAX_UPLOAD_BYTES."""
+
+
+class PDFExtractionError(ValueError):
+    """PDF could not be parsed, had no readable text, or took too long."""
+
+
+# -----------------------------
+# Text Extraction
+# -----------------------------
+def extract_pdf_text(data: bytes, max_pages: int = CV_MAX_PAGES, max_chars: int = CV_MAX_TEXT_CHARS) -> str:
+    """Extract text from PDF bytes, page by page.
+
+    Only the first max_pages pages are parsed, and parsing stops as soon as
+    max_chars characters have been collected. Page texts are collected in a
+    list and joined once, so building the text is linear in its length.
+
+    Raises:
+        PDFExtractionError: If the PDF cannot be read or contains no text
+    """
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        parts: List[str] = []
+        total = 0
+        for page_number, page in enumerate(reader.pages):
+            if page_number >= max_pages or total >= max_chars:
+                break
+            page_text = page.extract_text() or ""
+            parts.append(page_text)
+            total += len(page_text) + 1
+    except Exception as e:
+        raise PDFExtractionError(f"Error reading PDF: {str(e)}") from e
+
+    text = "\n".join(parts).strip()[:max_chars]
+    if not text:
+        raise PDFExtractionError("No readable text found in PDF.")
+    return text
+
+
+# -----------------------------
+# Worker Pool
+# -----------------------------
+# PyPDF2 is pure Python and CPU-bound, so it runs in CV_EXTRACT_WORKERS
+# long-lived worker processes to keep both the event loop and the GIL free
+# for other requests. Each worker is a fresh interpreter that imports only
+# this module (never main.py, so no Vertex AI or FastAPI setup, and no gRPC
+# or thread state inherited from the API process). PDFs are sent to an idle
+# worker over a socket; the timeout covers only that worker's parse, and a
+# worker that exceeds it is killed and restarted on its next job, so no
+# other upload is affected.
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class _ExtractWorker:
+    """One persistent parser process, started on first use and restarted after a kill or crash."""
+
+    def __init__(self):
+        self._process: Optional[subprocess.Popen] = None
+        self._conn: Optional[Connection] = None
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            return
+        self.stop()
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            self._process = subprocess.Popen(
+                [sys.executable, "-c", f"import pdf_extract; pdf_extract._serve({child_sock.fileno()})"],
+                cwd=_BACKEND_DIR,
+                pass_fds=(child_sock.fileno(),),
+                # Own session, so Ctrl+C on the server is not delivered to parsers mid-job
+                start_new_session=True,
+            )
+        finally:
+            child_sock.close()
+        self._conn = Connection(parent_sock.detach())
+
+    def extract(self, data: bytes, timeout: float) -> str:
+        """Parse data in this worker, waiting at most timeout seconds for the result (blocking)."""
+        self._ensure_started()
+        try:
+            self._conn.send_bytes(data)
+            if not self._conn.poll(timeout):
+                self.stop()
+                raise PDFExtractionError("PDF took too long to parse")
+            status, payload = self._conn.recv()
+        except (EOFError, OSError):
+            # The worker died without answering (e.g. out of memory on a hostile PDF)
+            self.stop()
+            raise PDFExtractionError("PDF parser crashed on this file")
+        if status == "error":
+            raise PDFExtractionError(payload)
+        return payload
+
+    def stop(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process = None
+
+
+def _serve(fd: int) -> None:
+    """Worker process loop: parse each PDF received on fd and send back ("ok", text) or ("error", message)."""
+    conn = Connection(fd)
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except EOFError:
+            # The API process closed the socket or exited
+            return
+        try:
+            conn.send(("ok", extract_pdf_text(data)))
+        except PDFExtractionError as e:
+            conn.send(("error", str(e)))
+
+
+_workers: List[_ExtractWorker] = []
+_idle_workers: Optional[asyncio.Queue] = None
+
+
+async def aextract_pdf_text(data: bytes, timeout: Optional[float] = None) -> str:
+    """Extract PDF text in the worker pool without blocking the event loop.
+
+    Raises:
+        PDFTooLargeError: If data exceeds CV_MAX_UPLOAD_BYTES
+        PDFExtractionError: If parsing fails or exceeds the timeout
+    """
+    global _idle_workers
+    if len(data) > CV_MAX_UPLOAD_BYTES:
+        raise PDFTooLargeError(f"PDF exceeds the {CV_MAX_UPLOAD_BYTES / (1024 * 1024):.1f} MB upload limit")
+    if _idle_workers is None:
+        _idle_workers = asyncio.Queue()
+        _workers.extend(_ExtractWorker() for _ in range(CV_EXTRACT_WORKERS))
+        for worker in _workers:
+            _idle_workers.put_nowait(worker)
+
+    idle = _idle_workers
+    worker = await idle.get()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, worker.extract, data, timeout or CV_EXTRACT_TIMEOUT_SECONDS)
+    # The worker goes back to the pool only once its job has finished, even if this caller is cancelled
+    future.add_done_callback(lambda _: idle.put_nowait(worker))
+    return await asyncio.shield(future)
+
+
+async def read_upload_limited(upload, max_bytes: int = CV_MAX_UPLOAD_BYTES) -> bytes:
+    """Read an UploadFile in chunks, failing as soon as it exceeds max_bytes."""
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        chunk = await upload.read(UPLOAD_READ_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise PDFTooLargeError(f"PDF exceeds the {max_bytes / (1024 * 1024):.1f} MB upload limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def shutdown_pool() -> None:
+    """Stop extraction workers on application shutdown."""
+    for worker in _workers:
+        worker.stop()
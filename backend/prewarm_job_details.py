@@ -0,0 +1,47 @@
+"""Pre-generate job-detail cards for every title in the job corpus.
+
+Fills the persistent job details cache so Dashboard loads are served with
+zero LLM calls. Titles already cached are skipped, so the command can be
+re-run after the corpus changes.
+
+Usage (from backend/):
+    python prewarm_job_details.py [--limit N] [--concurrency N]
+"""
+import argparse
+import asyncio
+
+from caches import get_job_details_store
+from job_index import get_job_index
+from main import create_career_advisory_service
+
+
+async def prewarm(limit: int = 0, concurrency: int = 8) -> None:
+    store = get_job_details_store()
+    titles = [title for title in get_job_index().job_titles() if title]
+    pending = store.missing(titles)
+    if limit:
+        pending = pending[:limit]
+    print(f"📦 {len(store)} titles cached, {len(pending)} to generate")
+
+    service = create_career_advisory_service()
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def warm(title: str) -> None:
+        nonlocal done
+        async with semaphore:
+            await service.generate_job_details(title)
+        done += 1
+        if done % 50 == 0 or done == len(pending):
+            print(f"   {done}/{len(pending)} generated")
+
+    await asyncio.gather(*(warm(title) for title in pending))
+    print(f"✅ Job details cache now holds {len(store)} titles")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-warm the job details cache")
+    parser.add_argument("--limit", type=int, default=0, help="Generate at most N titles (0 = all)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel Gemini generations")
+    args = parser.parse_args()
+    asyncio.run(prewarm(limit=args.limit, concurrency=args.concurrency))
@@ -0,0 +1,65 @@
+"""Pre-generate interview question banks for common roles.
+
+Fills the question bank store so /api/interview/start (and the interview
+WebSocket) can open an interview for these roles without calling Gemini.
+Banks that already exist are skipped unless --refresh is given.
+
+Usage (from backend/):
+    python prewarm_question_banks.py --roles "Data Scientist" "Backend Developer" [--difficulties easy medium hard]
+    python prewarm_question_banks.py --from-jobs 50    # the 50 most common titles in the job corpus
+"""
+import argparse
+import asyncio
+from collections import Counter
+from typing import List
+
+from question_bank import INTERVIEW_BANK_SIZE, get_question_bank_store
+
+
+def common_job_titles(limit: int) -> List[str]:
+    from job_index import get_job_index
+
+    counts = Counter(title.strip() for title in get_job_index().job_titles() if title and title.strip())
+    return [title for title, _ in counts.most_common(limit)]
+
+
+async def prewarm(roles: List[str], difficulties: List[str], size: int, concurrency: int, refresh: bool) -> None:
+    store = get_question_bank_store()
+    pending = [
+        (role, difficulty) for role in roles for difficulty in difficulties
+        if refresh or store.get(role, difficulty) is None
+    ]
+    print(f"📦 {len(store)} banks stored, {len(pending)} to generate")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def warm(role: str, difficulty: str) -> None:
+        nonlocal failed
+        async with semaphore:
+            try:
+                await store.generate(role, difficulty, size)
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ {role} ({difficulty}): {e}")
+
+    await asyncio.gather(*(warm(role, difficulty) for role, difficulty in pending))
+    print(f"✅ Question bank store now holds {len(store)} banks ({failed} failed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate interview question banks")
+    parser.add_argument("--roles", nargs="*", default=[], help="Roles to generate banks for")
+    parser.add_argument("--from-jobs", type=int, default=0, help="Also use the N most common job titles")
+    parser.add_argument("--difficulties", nargs="*", default=["easy", "medium", "hard"])
+    parser.add_argument("--size", type=int, default=INTERVIEW_BANK_SIZE, help="Questions per bank")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel Gemini generations")
+    parser.add_argument("--refresh", action="store_true", help="Regenerate banks that already exist")
+    args = parser.parse_args()
+
+    roles = list(args.roles)
+    if args.from_jobs:
+        roles += [title for title in common_job_titles(args.from_jobs) if title not in roles]
+    if not roles:
+        parser.error("give --roles and/or --from-jobs")
+    asyncio.run(prewarm(roles, args.difficulties, args.size, args.concurrency, args.refresh))
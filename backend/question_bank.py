@@ -0,0 +1,180 @@
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from caches import normalize_job_title
+from llm_client import ainvoke, get_chat_model
+
+
+# -----------------------------
+# Interview Question Banks
+# -----------------------------
+# A bank is a pool of interview questions for one (role, difficulty). Banks
+# are generated once (by prewarm_question_banks.py, or in the background the
+# first time a role is seen) and kept in SQLite, so starting an interview for
+# a known role needs no Gemini call: questions are sampled from the bank and
+# the greeting is templated.
+INTERVIEW_BANK_SIZE = int(os.environ.get("INTERVIEW_BANK_SIZE", "25"))
+INTERVIEW_BANK_TTL_SECONDS = float(os.environ.get("INTERVIEW_BANK_TTL_SECONDS", str(30 * 24 * 3600)))
+INTERVIEW_BANK_AUTOGENERATE = os.environ.get("INTERVIEW_BANK_AUTOGENERATE", "true").lower() in ("1", "true", "yes")
+
+
+def _default_question_bank_path() -> str:
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(backend_dir, "artifacts", "question_banks.sqlite3")
+
+
+INTERVIEW_BANK_PATH = os.environ.get("INTERVIEW_BANK_PATH") or _default_question_bank_path()
+
+_DIFFICULTY_DESC = {
+    "easy": "beginner-level, focusing on fundamental concepts and basic knowledge",
+    "medium": "intermediate-level, focusing on practical scenarios and real-world application",
+    "hard": "advanced-level, focusing on complex problem-solving, system design, and deep expertise",
+}
+
+
+def bank_key(role: str, difficulty: str) -> Tuple[str, str]:
+    return normalize_job_title(role), difficulty.strip().lower()
+
+
+def parse_questions(content: str) -> List[str]:
+    """Read a JSON list of questions from a model reply, tolerating code fences and stray text."""
+    match = re.search(r"\[[\s\S]*\]", content)
+    try:
+        items = json.loads(match.group(0) if match else content)
+    except json.JSONDecodeError:
+        # Fall back to one question per numbered or bulleted line
+        items = [re.sub(r"^\s*(?:\d+[.)]|[-*])\s*", "", line) for line in content.splitlines()]
+    questions: List[str] = []
+    seen = set()
+    for item in items:
+        text = str(item).strip().strip('"').strip()
+        if len(text) >= 10 and text.lower() not in seen:
+            seen.add(text.lower())
+            questions.append(text)
+    return questions
+
+
+class QuestionBankStore:
+    """SQLite-backed (role, difficulty) -> questions, shared across workers and restarts."""
+
+    def __init__(self, path: str = INTERVIEW_BANK_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS question_banks (
+                role_key TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                role TEXT NOT NULL,
+                questions TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (role_key, difficulty)
+            )"""
+        )
+        self._conn.commit()
+        self._generating: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, role: str, difficulty: str) -> Optional[List[str]]:
+        role_key, difficulty = bank_key(role, difficulty)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT questions FROM question_banks WHERE role_key = ? AND difficulty = ? AND created_at >= ?",
+                (role_key, difficulty, time.time() - INTERVIEW_BANK_TTL_SECONDS),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, role: str, difficulty: str, questions: List[str]) -> None:
+        role_key, difficulty = bank_key(role, difficulty)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_banks VALUES (?, ?, ?, ?, ?)",
+                (role_key, difficulty, role.strip(), json.dumps(questions), time.time()),
+            )
+            self._conn.commit()
+
+    def sample(self, role: str, difficulty: str, n: int) -> Optional[List[str]]:
+        """n distinct questions from the bank, or None if there is no bank with enough questions."""
+        questions = self.get(role, difficulty)
+        if not questions or len(questions) < n:
+            return None
+        return random.sample(questions, n)
+
+    async def generate(self, role: str, difficulty: str, size: int = INTERVIEW_BANK_SIZE) -> List[str]:
+        """Ask Gemini for a bank of questions and store it."""
+        difficulty = difficulty.strip().lower()
+        prompt = (
+            f"Write {size} distinct mock interview questions for a {role} position. The interview is "
+            f"{_DIFFICULTY_DESC.get(difficulty, 'intermediate-level')}. Mix technical, behavioral and "
+            f"situational questions, each answerable in a few minutes and understandable on its own.\n"
+            f"Return only a JSON array of strings, with no numbering or commentary."
+        )
+        llm = get_chat_model(temperature=0.9, max_tokens=4000)
+        response = await ainvoke(llm, prompt)
+        questions = parse_questions(response.content if hasattr(response, "content") else str(response))
+        if not questions:
+            raise ValueError(f"No questions parsed for '{role}' ({difficulty})")
+        self.put(role, difficulty, questions)
+        print(f"✅ Question bank ready for '{role}' ({difficulty}): {len(questions)} questions")
+        return questions
+
+    def ensure_in_background(self, role: str, difficulty: str) -> None:
+        """Start generating a missing bank without waiting for it (one generation per key at a time)."""
+        key = bank_key(role, difficulty)
+        if not INTERVIEW_BANK_AUTOGENERATE or key in self._generating:
+            return
+
+        async def run():
+            try:
+                await self.generate(role, difficulty)
+            except Exception as e:
+                print(f"⚠️ Question bank generation failed for '{role}' ({difficulty}): {e}")
+
+        task = asyncio.ensure_future(run())
+        self._generating[key] = task
+        task.add_done_callback(lambda _: self._generating.pop(key, None))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM question_banks").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "banks": len(self),
+            "generating": len(self._generating),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_question_bank_store: Optional[QuestionBankStore] = None
+_question_bank_store_lock = threading.Lock()
+
+
+def get_question_bank_store() -> QuestionBankStore:
+    """Open the shared question bank store on first use."""
+    global _question_bank_store
+    if _question_bank_store is None:
+        with _question_bank_store_lock:
+            if _question_bank_store is None:
+                _question_bank_store = QuestionBankStore()
+    return _question_bank_store
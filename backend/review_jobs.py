@@ -0,0 +1,266 @@
+import asyncio
+import io
+import os
+import random
+import time
+import uuid
+import zipfile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pdf_extract import CV_EXTRACT_WORKERS, CV_MAX_UPLOAD_BYTES, PDFTooLargeError
+
+
+# -----------------------------
+# Bulk CV Review Queue
+# -----------------------------
+# A batch is accepted immediately and reviewed in the background. At most
+# CV_EXTRACT_WORKERS items are handed to the PDF extractor at a time (so the
+# extraction timeout only ever counts parse time, never time spent waiting
+# behind the rest of the batch), and Gemini calls are capped by
+# CV_BATCH_LLM_CONCURRENCY across all batches. When Gemini reports a quota/rate-limit error, every
+# worker pauses until a shared cooldown expires and the item is retried with
+# exponential backoff, so throughput settles at what the quota allows.
+CV_BATCH_MAX_FILES = int(os.environ.get("CV_BATCH_MAX_FILES", "500"))
+CV_BATCH_MAX_UPLOAD_BYTES = int(os.environ.get("CV_BATCH_MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# Uncompressed size of all PDFs in a batch (they are held in memory until reviewed)
+CV_BATCH_MAX_TOTAL_BYTES = int(os.environ.get("CV_BATCH_MAX_TOTAL_BYTES", str(500 * 1024 * 1024)))
+CV_BATCH_LLM_CONCURRENCY = int(os.environ.get("CV_BATCH_LLM_CONCURRENCY", "4"))
+CV_BATCH_MAX_RETRIES = int(os.environ.get("CV_BATCH_MAX_RETRIES", "5"))
+CV_BATCH_BACKOFF_SECONDS = float(os.environ.get("CV_BATCH_BACKOFF_SECONDS", "2"))
+CV_BATCH_RESULT_TTL_SECONDS = float(os.environ.get("CV_BATCH_RESULT_TTL_SECONDS", str(24 * 3600)))
+CV_BATCH_MAX_KEPT = int(os.environ.get("CV_BATCH_MAX_KEPT", "100"))
+
+ExtractFn = Callable[[bytes], Awaitable[Tuple[str, bool]]]
+ReviewFn = Callable[[str], Awaitable[Tuple[Dict[str, Any], bool]]]
+
+
+def is_quota_error(error: Exception) -> bool:
+    """True for Gemini quota / rate-limit failures (also when wrapped in an HTTPException)."""
+    message = f"{error} {getattr(error, 'detail', '')}".lower()
+    return "quota" in message or "429" in message or "resource exhausted" in message or "rate limit" in message
+
+
+def expand_uploads(files: List[Tuple[str, bytes]], max_files: int = CV_BATCH_MAX_FILES,
+                   max_total_bytes: int = CV_BATCH_MAX_TOTAL_BYTES) -> List[Tuple[str, bytes]]:
+    """Flatten uploaded PDFs and zip archives into (filename, pdf bytes) pairs.
+
+    Raises:
+        ValueError: If the upload holds no PDFs, too many, or a corrupt zip
+        PDFTooLargeError: If a PDF exceeds CV_MAX_UPLOAD_BYTES or all of them together exceed max_total_bytes
+    """
+    pdfs: List[Tuple[str, bytes]] = []
+    total = 0
+
+    def check_total(size: int, name: str) -> None:
+        if total + size > max_total_bytes:
+            raise PDFTooLargeError(
+                f"'{name}' takes the batch past its {max_total_bytes / (1024 * 1024):.1f} MB uncompressed limit"
+            )
+
+    for filename, content in files:
+        name = filename or f"upload-{len(pdfs) + 1}.pdf"
+        if name.lower().endswith(".zip") or zipfile.is_zipfile(io.BytesIO(content)):
+            try:
+                with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                    entries = [
+                        info for info in archive.infolist()
+                        if not info.is_dir() and os.path.basename(info.filename).lower().endswith(".pdf")
+                        and not os.path.basename(info.filename).startswith(".")
+                    ]
+                    if len(pdfs) + len(entries) > max_files:
+                        raise ValueError(f"A batch can hold at most {max_files} PDFs")
+                    # Check the declared sizes of every entry before inflating any, so a zip bomb is never decompressed
+                    for info in entries:
+                        if info.file_size > CV_MAX_UPLOAD_BYTES:
+                            raise PDFTooLargeError(
+                                f"'{os.path.basename(info.filename)}' in '{name}' exceeds the "
+                                f"{CV_MAX_UPLOAD_BYTES / (1024 * 1024):.1f} MB limit"
+                            )
+                    check_total(sum(info.file_size for info in entries), name)
+                    # zipfile never inflates an entry past its declared size, so these reads stay within budget
+                    for info in entries:
+                        pdfs.append((os.path.basename(info.filename), archive.read(info)))
+                        total += info.file_size
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"'{name}' is not a valid zip archive: {e}")
+        else:
+            check_total(len(content), name)
+            pdfs.append((name, content))
+            total += len(content)
+        if len(pdfs) > max_files:
+            raise ValueError(f"A batch can hold at most {max_files} PDFs")
+    if not pdfs:
+        raise ValueError("No PDF files found in the upload")
+    return pdfs
+
+
+class ReviewBatch:
+    """State of one submitted batch; items are updated in place as workers finish them."""
+
+    def __init__(self, files: List[Tuple[str, bytes]]):
+        self.id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.items: List[Dict[str, Any]] = [
+            {"index": i, "filename": filename, "status": "queued", "review": None,
+             "error": None, "text_length": None, "cached": False, "attempts": 0}
+            for i, (filename, _) in enumerate(files)
+        ]
+        self._files: List[Optional[bytes]] = [content for _, content in files]
+        # Subscribers receive every item update, then None once the batch is finished
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"queued": 0, "extracting": 0, "reviewing": 0, "done": 0, "failed": 0}
+        for item in self.items:
+            counts[item["status"]] += 1
+        return counts
+
+    def snapshot(self, include_results: bool = True) -> Dict[str, Any]:
+        items = self.items if include_results else [
+            {key: value for key, value in item.items() if key != "review"} for item in self.items
+        ]
+        return {
+            "batch_id": self.id,
+            "status": "done" if self.done else "running",
+            "total": len(self.items),
+            "counts": self.counts(),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "items": items,
+        }
+
+    def _update(self, index: int, **changes: Any) -> None:
+        self.items[index].update(changes)
+        if self.items[index]["status"] in ("done", "failed"):
+            # Free the PDF bytes as soon as the item is settled
+            self._files[index] = None
+            for queue in self._subscribers:
+                queue.put_nowait(dict(self.items[index]))
+
+    def _finish(self) -> None:
+        self.finished_at = time.time()
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield already-settled items, then each item as it settles, until the batch is done."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in self.items:
+            if item["status"] in ("done", "failed"):
+                queue.put_nowait(dict(item))
+        if self.done:
+            queue.put_nowait(None)
+        else:
+            self._subscribers.append(queue)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+
+class ReviewJobQueue:
+    """Runs review batches in the background and keeps their results for polling."""
+
+    def __init__(self, extract: ExtractFn, review: ReviewFn, llm_concurrency: int = CV_BATCH_LLM_CONCURRENCY,
+                 max_retries: int = CV_BATCH_MAX_RETRIES, backoff_seconds: float = CV_BATCH_BACKOFF_SECONDS,
+                 extract_concurrency: int = CV_EXTRACT_WORKERS):
+        self._extract = extract
+        self._review = review
+        self._extract_concurrency = extract_concurrency
+        self._extract_semaphore: Optional[asyncio.Semaphore] = None
+        self._llm_concurrency = llm_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._cooldown_until = 0.0
+        self._batches: Dict[str, ReviewBatch] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, files: List[Tuple[str, bytes]]) -> ReviewBatch:
+        """Queue (filename, pdf bytes) pairs for review and return the new batch."""
+        self._evict()
+        batch = ReviewBatch(files)
+        self._batches[batch.id] = batch
+        task = asyncio.create_task(self._run(batch))
+        self._tasks[batch.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch.id, None))
+        return batch
+
+    def get(self, batch_id: str) -> Optional[ReviewBatch]:
+        return self._batches.get(batch_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": len(self._batches),
+            "running": len(self._tasks),
+            "extract_concurrency": self._extract_concurrency,
+            "llm_concurrency": self._llm_concurrency,
+            "cooling_down_seconds": max(0.0, round(self._cooldown_until - time.time(), 1)),
+        }
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    def _evict(self) -> None:
+        """Drop finished batches past their TTL, then the oldest finished ones beyond CV_BATCH_MAX_KEPT."""
+        now = time.time()
+        finished = sorted((b for b in self._batches.values() if b.done), key=lambda b: b.finished_at)
+        for batch in finished:
+            if now - batch.finished_at > CV_BATCH_RESULT_TTL_SECONDS or len(self._batches) >= CV_BATCH_MAX_KEPT:
+                self._batches.pop(batch.id, None)
+
+    async def _run(self, batch: ReviewBatch) -> None:
+        try:
+            await asyncio.gather(*(self._process(batch, i) for i in range(len(batch.items))))
+        finally:
+            batch._finish()
+
+    async def _process(self, batch: ReviewBatch, index: int) -> None:
+        if self._extract_semaphore is None:
+            self._extract_semaphore = asyncio.Semaphore(self._extract_concurrency)
+        try:
+            # Items stay "queued" until an extraction slot is free
+            async with self._extract_semaphore:
+                batch.items[index]["status"] = "extracting"
+                cv_text, _ = await self._extract(batch._files[index])
+            batch.items[index]["text_length"] = len(cv_text)
+            review_result, cached = await self._review_with_backoff(batch, index, cv_text)
+            batch._update(index, status="done", review=review_result["review"], cached=cached)
+        except asyncio.CancelledError:
+            batch._update(index, status="failed", error="cancelled")
+            raise
+        except Exception as e:
+            batch._update(index, status="failed", error=str(getattr(e, "detail", "") or e))
+
+    async def _review_with_backoff(self, batch: ReviewBatch, index: int, cv_text: str) -> Tuple[Dict[str, Any], bool]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._llm_concurrency)
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                # Honour a cooldown another worker started after hitting the quota
+                delay = self._cooldown_until - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                batch.items[index]["status"] = "reviewing"
+                batch.items[index]["attempts"] = attempt + 1
+                try:
+                    return await self._review(cv_text)
+                except Exception as e:
+                    if not is_quota_error(e) or attempt >= self._max_retries:
+                        raise
+                    backoff = self._backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.25)
+                    self._cooldown_until = max(self._cooldown_until, time.time() + backoff)
+                    print(f"⚠️ Gemini quota hit in CV batch {batch.id[:8]}, backing off {backoff:.1f}s")
+            attempt += 1
@@ -0,0 +1,468 @@
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+# -----------------------------
+# Session Store Settings
+# -----------------------------
+# Chat and interview state lives behind one SessionStore interface. The
+# memory backend is the fastest but only works with a single worker; the
+# sqlite backend (a WAL-mode database file every worker opens) lets any
+# worker continue any session, e.g. under `uvicorn --workers N`.
+SESSION_STORE = os.environ.get("SESSION_STORE", "memory").lower()
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL_SECONDS", "7200"))
+SESSION_MAX_TURNS = int(os.environ.get("SESSION_MAX_TURNS", "50"))
+SESSION_MAX_SESSIONS = int(os.environ.get("SESSION_MAX_SESSIONS", "10000"))
+SESSION_MEMORY_BUDGET_BYTES = int(os.environ.get("SESSION_MEMORY_BUDGET_BYTES", str(64 * 1024 * 1024)))
+
+
+def _default_session_store_path() -> str:
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(backend_dir, "artifacts", "sessions.sqlite3")
+
+
+SESSION_STORE_PATH = os.environ.get("SESSION_STORE_PATH") or _default_session_store_path()
+
+# Expired sessions are swept at most this often, on the next store access
+_SWEEP_INTERVAL_SECONDS = 60.0
+# Serialized turns larger than this are zlib-compressed
+_COMPRESS_MIN_BYTES = 512
+
+
+def turn_size(turn: Dict[str, Any]) -> int:
+    """Approximate memory held by one turn (the text it stores)."""
+    return sum(len(value) for value in turn.values() if isinstance(value, str))
+
+
+def encode_turn(turn: Dict[str, Any]) -> bytes:
+    """Serialize a turn as compact JSON, compressing long ones (e.g. interview feedback)."""
+    data = json.dumps(turn, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(data)
+    return b"j" + data
+
+
+def decode_turn(blob: bytes) -> Dict[str, Any]:
+    data = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    return json.loads(data)
+
+
+class Session:
+    """A session as read from the store: metadata plus its most recent turns (oldest first).
+
+    total_turns counts every turn ever appended, including ones already
+    dropped, so turns[i] is turn number total_turns - len(turns) + i.
+    """
+
+    def __init__(self, session_id: str, kind: str, meta: Dict[str, Any], turns: List[Dict[str, Any]],
+                 total_turns: int = 0):
+        self.id = session_id
+        self.kind = kind
+        self.meta = meta
+        self.turns = turns
+        self.total_turns = total_turns
+
+    @property
+    def first_turn_index(self) -> int:
+        return self.total_turns - len(self.turns)
+
+
+class SessionStore(abc.ABC):
+    """Interface shared by the session backends.
+
+    Sessions are namespaced by kind ("chat", "interview"). Every read or
+    write refreshes a session's TTL; sessions untouched for longer than
+    SESSION_TTL_SECONDS are treated as gone. Each session keeps at most
+    SESSION_MAX_TURNS turns, dropping the oldest first.
+    """
+
+    @abc.abstractmethod
+    def create(self, kind: str, meta: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> Session:
+        """Start a session (optionally under a caller-chosen id) and return it empty."""
+
+    @abc.abstractmethod
+    def load(self, kind: str, session_id: Optional[str], last_turns: Optional[int] = None) -> Optional[Session]:
+        """Return the session with at most last_turns of its newest turns, or None if missing/expired."""
+
+    @abc.abstractmethod
+    def append_turn(self, kind: str, session_id: str, turn: Dict[str, Any]) -> int:
+        """Append a turn and return the session's total turn count; 0 if the session no longer exists."""
+
+    @abc.abstractmethod
+    def update_last_turn(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        """Merge changes into the newest turn; False if the session has no turns."""
+
+    @abc.abstractmethod
+    def update_meta(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        """Merge changes into the session metadata; False if the session no longer exists."""
+
+    @abc.abstractmethod
+    def delete(self, kind: str, session_id: str) -> bool:
+        """Remove the session; False if it did not exist."""
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Counts and sizes for /api/cache/stats."""
+
+    def close(self) -> None:
+        pass
+
+
+# -----------------------------
+# In-Memory Backend
+# -----------------------------
+class _MemorySession:
+    def __init__(self, meta: Dict[str, Any], max_turns: int):
+        self.meta = meta
+        self.turns: Deque[Dict[str, Any]] = deque(maxlen=max_turns)
+        self.size = 0
+        self.total_turns = 0
+        self.last_active = time.time()
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store; turns are kept in bounded deques so trimming is O(1).
+
+    Sessions are ordered by last activity. Expired sessions are swept
+    periodically, and once the stored text exceeds the memory budget (or
+    there are more than max_sessions) the least recently active go first.
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL_SECONDS, max_turns: int = SESSION_MAX_TURNS,
+                 max_sessions: int = SESSION_MAX_SESSIONS, memory_budget: int = SESSION_MEMORY_BUDGET_BYTES):
+        self._sessions: "OrderedDict[Tuple[str, str], _MemorySession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._max_turns = max_turns
+        self._max_sessions = max_sessions
+        self._memory_budget = memory_budget
+        self._total_size = 0
+        self._last_sweep = time.time()
+        self.evicted_expired = 0
+        self.evicted_budget = 0
+
+    def create(self, kind: str, meta: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> Session:
+        session_id = session_id or uuid.uuid4().hex
+        with self._lock:
+            old = self._sessions.pop((kind, session_id), None)
+            if old is not None:
+                self._total_size -= old.size
+            self._sessions[(kind, session_id)] = _MemorySession(dict(meta or {}), self._max_turns)
+            self._enforce_budget()
+        return Session(session_id, kind, dict(meta or {}), [])
+
+    def _touch(self, kind: str, session_id: Optional[str]) -> Optional[_MemorySession]:
+        self._sweep_expired()
+        session = self._sessions.get((kind, session_id)) if session_id else None
+        if session is None:
+            return None
+        if time.time() - session.last_active > self._ttl:
+            self._remove((kind, session_id))
+            self.evicted_expired += 1
+            return None
+        session.last_active = time.time()
+        self._sessions.move_to_end((kind, session_id))
+        return session
+
+    def load(self, kind: str, session_id: Optional[str], last_turns: Optional[int] = None) -> Optional[Session]:
+        with self._lock:
+            session = self._touch(kind, session_id)
+            if session is None:
+                return None
+            n = len(session.turns) if last_turns is None else min(last_turns, len(session.turns))
+            turns = [dict(session.turns[i]) for i in range(len(session.turns) - n, len(session.turns))]
+            return Session(session_id, kind, dict(session.meta), turns, session.total_turns)
+
+    def append_turn(self, kind: str, session_id: str, turn: Dict[str, Any]) -> int:
+        with self._lock:
+            session = self._touch(kind, session_id)
+            if session is None:
+                return 0
+            dropped = turn_size(session.turns[0]) if len(session.turns) == session.turns.maxlen else 0
+            session.turns.append(dict(turn))
+            session.total_turns += 1
+            delta = turn_size(turn) - dropped
+            session.size += delta
+            self._total_size += delta
+            self._enforce_budget()
+            return session.total_turns
+
+    def update_last_turn(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock:
+            session = self._touch(kind, session_id)
+            if session is None or not session.turns:
+                return False
+            last = session.turns[-1]
+            delta = -turn_size(last)
+            last.update(changes)
+            delta += turn_size(last)
+            session.size += delta
+            self._total_size += delta
+            return True
+
+    def update_meta(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock:
+            session = self._touch(kind, session_id)
+            if session is None:
+                return False
+            session.meta.update(changes)
+            return True
+
+    def delete(self, kind: str, session_id: str) -> bool:
+        with self._lock:
+            return self._remove((kind, session_id))
+
+    def _remove(self, key: Tuple[str, str]) -> bool:
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return False
+        self._total_size -= session.size
+        return True
+
+    def _sweep_expired(self) -> None:
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+        # Ordered by last activity, so expired sessions are all at the front
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if now - session.last_active <= self._ttl:
+                break
+            self._remove(key)
+            self.evicted_expired += 1
+
+    def _enforce_budget(self) -> None:
+        # Never evict the session that was just used (it is last in order)
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self._max_sessions or self._total_size > self._memory_budget
+        ):
+            self._remove(next(iter(self._sessions)))
+            self.evicted_budget += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            kinds: Dict[str, int] = {}
+            for kind, _ in self._sessions:
+                kinds[kind] = kinds.get(kind, 0) + 1
+            return {
+                "backend": "memory",
+                "sessions": kinds,
+                "stored_bytes": self._total_size,
+                "memory_budget_bytes": self._memory_budget,
+                "max_turns": self._max_turns,
+                "ttl_seconds": self._ttl,
+                "evicted_expired": self.evicted_expired,
+                "evicted_budget": self.evicted_budget,
+            }
+
+
+# -----------------------------
+# SQLite Backend
+# -----------------------------
+class SQLiteSessionStore(SessionStore):
+    """Shared store in a WAL-mode SQLite file, safe for several worker processes on one host.
+
+    Each turn is its own row (compact JSON, zlib above _COMPRESS_MIN_BYTES),
+    so appending never rewrites the history. Writes run in BEGIN IMMEDIATE
+    transactions so concurrent workers cannot interleave turn numbers.
+    """
+
+    def __init__(self, path: str = SESSION_STORE_PATH, ttl: float = SESSION_TTL_SECONDS,
+                 max_turns: int = SESSION_MAX_TURNS):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._ttl = ttl
+        self._max_turns = max_turns
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sessions (
+                kind TEXT NOT NULL,
+                id TEXT NOT NULL,
+                meta TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, id)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS turns (
+                kind TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (kind, session_id, seq)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at)")
+        self._last_sweep = 0.0
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _touch(self, conn: sqlite3.Connection, kind: str, session_id: str) -> Optional[str]:
+        """Refresh the TTL of a live session and return its meta JSON (None if missing or expired)."""
+        now = time.time()
+        row = conn.execute(
+            "SELECT meta FROM sessions WHERE kind = ? AND id = ? AND updated_at >= ?",
+            (kind, session_id, now - self._ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE sessions SET updated_at = ? WHERE kind = ? AND id = ?", (now, kind, session_id))
+        return row[0]
+
+    def create(self, kind: str, meta: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> Session:
+        session_id = session_id or uuid.uuid4().hex
+        meta = dict(meta or {})
+        with self._lock:
+            self._sweep_expired()
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM turns WHERE kind = ? AND session_id = ?", (kind, session_id))
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                    (kind, session_id, json.dumps(meta, separators=(",", ":")), time.time()),
+                )
+        return Session(session_id, kind, meta, [])
+
+    def load(self, kind: str, session_id: Optional[str], last_turns: Optional[int] = None) -> Optional[Session]:
+        if not session_id:
+            return None
+        with self._lock:
+            self._sweep_expired()
+            with self._transaction() as conn:
+                meta = self._touch(conn, kind, session_id)
+                if meta is None:
+                    return None
+                rows = conn.execute(
+                    "SELECT seq, data FROM turns WHERE kind = ? AND session_id = ? ORDER BY seq DESC LIMIT ?",
+                    (kind, session_id, self._max_turns if last_turns is None else last_turns),
+                ).fetchall()
+                if rows:
+                    total_turns = rows[0][0]
+                else:
+                    total_turns = conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM turns WHERE kind = ? AND session_id = ?", (kind, session_id)
+                    ).fetchone()[0]
+        turns = [decode_turn(row[1]) for row in reversed(rows)]
+        return Session(session_id, kind, json.loads(meta), turns, total_turns)
+
+    def append_turn(self, kind: str, session_id: str, turn: Dict[str, Any]) -> int:
+        with self._lock, self._transaction() as conn:
+            if self._touch(conn, kind, session_id) is None:
+                return 0
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM turns WHERE kind = ? AND session_id = ?", (kind, session_id)
+            ).fetchone()[0]
+            conn.execute("INSERT INTO turns VALUES (?, ?, ?, ?)", (kind, session_id, seq, encode_turn(turn)))
+            conn.execute(
+                "DELETE FROM turns WHERE kind = ? AND session_id = ? AND seq <= ?",
+                (kind, session_id, seq - self._max_turns),
+            )
+            return seq
+
+    def update_last_turn(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock, self._transaction() as conn:
+            if self._touch(conn, kind, session_id) is None:
+                return False
+            row = conn.execute(
+                "SELECT seq, data FROM turns WHERE kind = ? AND session_id = ? ORDER BY seq DESC LIMIT 1",
+                (kind, session_id),
+            ).fetchone()
+            if row is None:
+                return False
+            turn = decode_turn(row[1])
+            turn.update(changes)
+            conn.execute(
+                "UPDATE turns SET data = ? WHERE kind = ? AND session_id = ? AND seq = ?",
+                (encode_turn(turn), kind, session_id, row[0]),
+            )
+            return True
+
+    def update_meta(self, kind: str, session_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock, self._transaction() as conn:
+            meta = self._touch(conn, kind, session_id)
+            if meta is None:
+                return False
+            meta = {**json.loads(meta), **changes}
+            conn.execute(
+                "UPDATE sessions SET meta = ? WHERE kind = ? AND id = ?",
+                (json.dumps(meta, separators=(",", ":")), kind, session_id),
+            )
+            return True
+
+    def delete(self, kind: str, session_id: str) -> bool:
+        with self._lock, self._transaction() as conn:
+            conn.execute("DELETE FROM turns WHERE kind = ? AND session_id = ?", (kind, session_id))
+            return conn.execute("DELETE FROM sessions WHERE kind = ? AND id = ?", (kind, session_id)).rowcount > 0
+
+    def _sweep_expired(self) -> None:
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self._ttl,))
+            conn.execute(
+                "DELETE FROM turns WHERE NOT EXISTS "
+                "(SELECT 1 FROM sessions s WHERE s.kind = turns.kind AND s.id = turns.session_id)"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            kinds = dict(self._conn.execute(
+                "SELECT kind, COUNT(*) FROM sessions WHERE updated_at >= ? GROUP BY kind", (time.time() - self._ttl,)
+            ).fetchall())
+            stored = self._conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM turns").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "sessions": kinds,
+            "stored_bytes": stored,
+            "max_turns": self._max_turns,
+            "ttl_seconds": self._ttl,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Open the configured session store (SESSION_STORE=memory|sqlite) on first use."""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                if SESSION_STORE == "sqlite":
+                    _session_store = SQLiteSessionStore()
+                elif SESSION_STORE == "memory":
+                    _session_store = MemorySessionStore()
+                else:
+                    raise ValueError(f"Unknown SESSION_STORE '{SESSION_STORE}' (expected 'memory' or 'sqlite')")
+    return _session_store
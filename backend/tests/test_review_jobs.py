@@ -0,0 +1,94 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from pdf_extract import PDFTooLargeError
+from review_jobs import ReviewJobQueue, expand_uploads
+
+
+def test_slow_extraction_is_bounded_and_never_times_out_in_the_queue():
+    # 20 PDFs that take 0.5 s each, 2 extraction slots and a 2 s per-item
+    # timeout: every item must succeed because time spent waiting for a slot
+    # does not count against the timeout.
+    active = 0
+    peak = 0
+
+    async def slow_extract(data: bytes):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.wait_for(asyncio.sleep(0.5), timeout=2)
+        finally:
+            active -= 1
+        return data.decode(), False
+
+    async def review(cv_text: str):
+        return {"review": f"review of {cv_text}"}, False
+
+    async def run():
+        queue = ReviewJobQueue(slow_extract, review, extract_concurrency=2)
+        batch = queue.submit([(f"cv-{i}.pdf", f"cv {i}".encode()) for i in range(20)])
+        statuses = {item["status"] for item in batch.items}
+        async for _ in batch.events():
+            pass
+        return statuses, batch
+
+    statuses, batch = asyncio.run(run())
+    assert statuses == {"queued"}
+    assert peak == 2
+    assert batch.counts()["done"] == 20
+    assert [item["review"] for item in batch.items] == [f"review of cv {i}" for i in range(20)]
+
+
+def test_failed_extraction_only_fails_its_item():
+    async def extract(data: bytes):
+        if data == b"bad":
+            raise ValueError("No readable text found in PDF.")
+        return data.decode(), False
+
+    async def review(cv_text: str):
+        return {"review": cv_text}, False
+
+    async def run():
+        queue = ReviewJobQueue(extract, review, extract_concurrency=1)
+        batch = queue.submit([("a.pdf", b"good"), ("b.pdf", b"bad")])
+        async for _ in batch.events():
+            pass
+        return batch
+
+    batch = asyncio.run(run())
+    assert [item["status"] for item in batch.items] == ["done", "failed"]
+    assert batch.items[1]["error"] == "No readable text found in PDF."
+
+
+def _zip_of_zeros(entries: int, entry_bytes: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for i in range(entries):
+            archive.writestr(f"cv-{i}.pdf", b"\0" * entry_bytes)
+    return buffer.getvalue()
+
+
+def test_zip_over_the_total_budget_is_rejected_before_inflating(monkeypatch):
+    # 20 highly compressible 1 MB entries: each is under the per-file limit,
+    # but together they exceed a 10 MB batch budget
+    bomb = _zip_of_zeros(20, 1024 * 1024)
+    assert len(bomb) < 100 * 1024
+
+    def fail_read(self, *args, **kwargs):
+        raise AssertionError("an entry was inflated")
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", fail_read)
+    monkeypatch.setattr(zipfile.ZipFile, "open", fail_read)
+    with pytest.raises(PDFTooLargeError):
+        expand_uploads([("bomb.zip", bomb)], max_total_bytes=10 * 1024 * 1024)
+
+
+def test_total_budget_spans_zips_and_plain_pdfs():
+    archive = _zip_of_zeros(4, 1024)
+    assert len(expand_uploads([("a.zip", archive), ("b.pdf", b"x" * 1024)], max_total_bytes=5 * 1024)) == 5
+    with pytest.raises(PDFTooLargeError):
+        expand_uploads([("a.zip", archive), ("b.pdf", b"x" * 1025)], max_total_bytes=5 * 1024)
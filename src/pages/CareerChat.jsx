@@ -65,6 +65,8 @@ const CareerChat = () => {
   const [messages, setMessages] = useState([])
   const [currentMessage, setCurrentMessage] = useState('')
   const [isLoading, setIsLoading] = useState(false)
+  // Server-side chat session; assigned by the backend on the first message
+  const [sessionId, setSessionId] = useState(null)
   const messagesEndRef = useRef(null)
 
   // Auto-scroll to bottom when new messages are added
@@ -111,7 +113,7 @@ const CareerChat = () => {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ message: userMessage }),
+        body: JSON.stringify({ message: userMessage, session_id: sessionId }),
       })
 
       if (!response.ok) {
@@ -119,6 +121,7 @@ const CareerChat = () => {
       }
 
       const data = await response.json()
+      setSessionId(data.session_id)
 
       // Update messages with bot response
       setMessages(prev => {
@@ -157,7 +160,10 @@ const CareerChat = () => {
 
   const clearChat = async () => {
     try {
-      await fetch('http://localhost:8000/chat/history', { method: 'DELETE' })
+      if (sessionId) {
+        await fetch(`http://localhost:8000/chat/history?session_id=${encodeURIComponent(sessionId)}`, { method: 'DELETE' })
+      }
+      setSessionId(null)
       setMessages([
         {
           user: '',
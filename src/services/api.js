@@ -32,6 +32,44 @@ class ApiService {
     }
   }
 
+  // Streaming API call: POSTs JSON and invokes onEvent(event, data) for each server-sent event
+  async streamRequest(endpoint, body, onEvent) {
+    const response = await fetch(`${this.baseURL}${endpoint}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(body),
+    });
+    return this.readEventStream(response, onEvent);
+  }
+
+  // Invoke onEvent(event, data) for each server-sent event in a fetch response
+  async readEventStream(response, onEvent) {
+    if (!response.ok || !response.body) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const raw = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of raw.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        onEvent(event, data ? JSON.parse(data) : {});
+      }
+    }
+  }
+
   // Health check
   async healthCheck() {
     return this.makeRequest('/health');
@@ -53,11 +91,30 @@ class ApiService {
     });
   }
 
+  // Streaming career advice: onEvent receives 'chunk', optional 'fallback' (nothing was generated)
+  // or 'error' with truncated: true (generation stopped part way), then 'done'
+  async streamStudentCareerAdvice(formData, onEvent) {
+    return this.streamRequest('/api/student/career-advice/stream', formData, onEvent);
+  }
+
+  async streamProfessionalCareerAdvice(formData, onEvent) {
+    return this.streamRequest('/api/professional/career-advice/stream', formData, onEvent);
+  }
+
   // Job recommendations from TF-IDF artifacts
-  async getJobRecommendations({ text, topN = 5 }) {
+  // filters: { cities, states, remote, min_salary, max_salary } (all optional)
+  async getJobRecommendations({ text, topN = 5, filters = null }) {
     return this.makeRequest('/api/jobs/recommend', {
       method: 'POST',
-      body: JSON.stringify({ text, top_n: topN }),
+      body: JSON.stringify({ text, top_n: topN, filters }),
+    });
+  }
+
+  // Job cards (description + day in life) for several titles in one request
+  async getJobDetailsBatch(jobTitles) {
+    return this.makeRequest('/api/job-details/batch', {
+      method: 'POST',
+      body: JSON.stringify({ job_titles: jobTitles }),
     });
   }
 
@@ -87,6 +144,42 @@ class ApiService {
     return response.json();
   }
 
+  // CV Review: stream the review section by section ("start", "section", "error", "done" events)
+  async streamReviewCV(file, onEvent) {
+    const formData = new FormData();
+    if (file) {
+      formData.append('file', file);
+    }
+    const response = await fetch(`${this.baseURL}/api/review-cv/stream`, {
+      method: 'POST',
+      headers: { Accept: 'text/event-stream' },
+      body: formData,
+    });
+    return this.readEventStream(response, onEvent);
+  }
+
+  // CV Review: queue a batch of PDFs and/or zip archives
+  async reviewCVBatch(files) {
+    const formData = new FormData();
+    for (const file of files) {
+      formData.append('files', file);
+    }
+    const url = `${this.baseURL}/api/review-cv/batch`;
+    const response = await fetch(url, {
+      method: 'POST',
+      body: formData,
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
+  // CV Review: poll a batch for progress and finished reviews
+  async getCVReviewBatch(batchId) {
+    return this.makeRequest(`/api/review-cv/batch/${batchId}`);
+  }
+
   // Interview: start session
   async startInterview({ role, num_questions, difficulty }) {
     return this.makeRequest('/api/interview/start', {
@@ -103,6 +196,15 @@ class ApiService {
     });
   }
 
+  // Interview: WebSocket that streams the interviewer ("session", "token", "section", "turn", "error" messages).
+  // Pass a sessionId to resume; otherwise send { type: 'start', role, num_questions, difficulty } once open,
+  // then { type: 'answer', message } for each answer.
+  openInterviewSocket(sessionId = null) {
+    const wsBase = this.baseURL.replace(/^http/, 'ws');
+    const query = sessionId ? `?session_id=${encodeURIComponent(sessionId)}` : '';
+    return new WebSocket(`${wsBase}/api/interview/ws${query}`);
+  }
+
   // Interview: history
   async getInterviewHistory(sessionId) {
     return this.makeRequest(`/api/interview/history/${sessionId}`);